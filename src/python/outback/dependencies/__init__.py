@@ -1,20 +1,55 @@
 """Outback - Python utilities for .NET package dependency analysis and management."""
 
-from .print import (
-    print_package_diffs,
-    print_project_summary,
-    print_projects,
-)
+from importlib import import_module
+from typing import Any
 
-from .utils import capture_before_deps, remove_before_deps
+# Public name -> defining module. Submodules (and rich, which only the print functions need)
+# are imported on first attribute access, so `import outback.dependencies` stays cheap.
+_EXPORTS = {
+    "print_package_diffs": ".print",
+    "print_project_summary": ".print",
+    "print_projects": ".print",
+    "print_version_drift": ".print",
+    "print_why": ".print",
+    "print_dependents": ".print",
+    "watch_package_diffs": ".watch",
+    "compute_package_diffs": ".diff",
+    "write_package_diffs": ".diff",
+    "analyze_projects": ".pipeline",
+    "ProjectAnalysis": ".pipeline",
+    "PackageDiff": ".diff",
+    "DiffKind": ".diff",
+    "DiffStats": ".diff",
+    "compute_version_drift": ".drift",
+    "write_version_drift": ".drift",
+    "PackageDrift": ".drift",
+    "PackageFilter": ".query",
+    "PlainRenderer": ".render",
+    "RichRenderer": ".render",
+    "capture_before_deps": ".utils",
+    "remove_before_deps": ".utils",
+    "SummaryCache": ".cache",
+    "Workspace": ".workspace",
+    "SolutionGraph": ".graph",
+    "DependencyPath": ".graph",
+    "Profiler": ".instrumentation",
+    "profiling": ".instrumentation",
+    "print_profile": ".instrumentation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if (module := _EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
 
 
 __version__ = "0.1.0"
 
-__all__ = [
-    "print_package_diffs",
-    "print_project_summary",
-    "print_projects",
-    "capture_before_deps",
-    "remove_before_deps",
-]
+__all__ = list(_EXPORTS)
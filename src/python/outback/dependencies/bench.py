@@ -0,0 +1,262 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+import rich
+from rich.table import Table
+
+from .diff import diff_summaries
+from .print import print_package_diffs, print_project_summary, print_projects
+from .synthetic import SyntheticRepoSpec, generate_repo
+from .types import PackageStore
+from .utils import _package_summary, find_project_paths, load_global_deps
+from .workspace import Workspace
+
+PHASES = ("startup", "discovery", "parse", "diff", "render_projects", "render_diffs", "end_to_end")
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory of one benchmark phase.
+
+    `seconds` is the best of `repeat` runs; `peak_bytes` is the peak of Python allocations
+    traced during one additional run (tracing is kept out of the timed runs), or 0 when the
+    phase runs in a subprocess.
+    """
+
+    name: str
+    seconds: float
+    mean_seconds: float
+    peak_bytes: int
+    repeat: int
+
+
+def _measure(
+    name: str, prepare: Callable[[], Callable[[], object]], repeat: int, trace_memory: bool = True
+) -> BenchmarkResult:
+    """Time `prepare()()` `repeat` times; `prepare` does the untimed setup for each run."""
+    times = []
+    for _ in range(repeat):
+        run = prepare()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    if not trace_memory:
+        return BenchmarkResult(name, min(times), sum(times) / len(times), 0, repeat)
+    run = prepare()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(name, min(times), sum(times) / len(times), peak, repeat)
+
+
+def _quiet(fn: Callable[[], object]) -> Callable[[], object]:
+    """Run a print function with its output rendered into a discarded buffer."""
+
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+
+    return run
+
+
+def _startup() -> Callable[[], object]:
+    """Run `python -m outback.dependencies --help` in a fresh interpreter (imports included)."""
+    package_root = str(Path(__file__).resolve().parents[2])
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])),
+    }
+    command = [sys.executable, "-m", "outback.dependencies", "--help"]
+    return lambda: subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True)
+
+
+def run_benchmarks(
+    root: Path | str, repeat: int = 3, phases: tuple[str, ...] = PHASES
+) -> list[BenchmarkResult]:
+    """Benchmark each phase of the dependency tools against the repo at `root`.
+
+    Phases:
+        startup: CLI start-up (interpreter and imports) in a subprocess, `--help`
+        discovery: find_project_paths
+        parse: _package_summary of every packages.lock.json (with transitive dependencies)
+        diff: diff_summaries over already-parsed before/after pairs
+        render_projects: print_projects (nested trees) from already-parsed summaries
+        render_diffs: print_package_diffs (only changes) from already-parsed summaries
+        end_to_end: print_project_summary (only changes) on a fresh workspace
+    """
+    root = Path(root)
+    props = root / "Directory.Packages.props"
+    global_version_path = props if props.exists() else None
+    project_paths = find_project_paths(root)
+    after_paths = [
+        p / "packages.lock.json" for p in project_paths if (p / "packages.lock.json").exists()
+    ]
+    pairs = [(p.parent / "packages.before.lock.json", p) for p in after_paths]
+    pairs = [(before, after) for before, after in pairs if before.exists()]
+
+    def parse() -> Callable[[], object]:
+        store = PackageStore()
+        return lambda: [
+            _package_summary(p, include_transitive=True, store=store) for p in after_paths
+        ]
+
+    def diff() -> Callable[[], object]:
+        store = PackageStore()
+        global_versions = load_global_deps(global_version_path)
+        parsed = [
+            (
+                after.parent,
+                _package_summary(before, include_transitive=True, store=store),
+                _package_summary(after, include_transitive=True, store=store),
+            )
+            for before, after in pairs
+        ]
+        return lambda: sum(1 for args in parsed for _ in diff_summaries(*args, global_versions))
+
+    def render_projects() -> Callable[[], object]:
+        workspace = Workspace(root)
+        list(workspace.iter_summaries(after_paths, include_transitive=False))
+        return _quiet(lambda: print_projects(root, workspace=workspace))
+
+    def render_diffs() -> Callable[[], object]:
+        workspace = Workspace(root)
+        list(workspace.iter_summaries([p for pair in pairs for p in pair], include_transitive=True))
+        return _quiet(
+            lambda: print_package_diffs(
+                root,
+                global_version_path=global_version_path,
+                only_changes=True,
+                workspace=workspace,
+            )
+        )
+
+    prepare: dict[str, Callable[[], Callable[[], object]]] = {
+        "startup": _startup,
+        "discovery": lambda: lambda: find_project_paths(root),
+        "parse": parse,
+        "diff": diff,
+        "render_projects": render_projects,
+        "render_diffs": render_diffs,
+        "end_to_end": lambda: _quiet(
+            lambda: print_project_summary(
+                root, global_version_path=global_version_path, only_changes=True
+            )
+        ),
+    }
+    return [
+        _measure(name, prepare[name], repeat, trace_memory=name != "startup") for name in phases
+    ]
+
+
+def benchmark_synthetic(
+    spec: SyntheticRepoSpec | None = None, repeat: int = 3, root: Path | str | None = None
+) -> list[BenchmarkResult]:
+    """Generate a synthetic repo (in a temporary directory unless `root` is given); benchmark it."""
+    spec = spec or SyntheticRepoSpec()
+    if root is not None:
+        generate_repo(root, spec)
+        return run_benchmarks(root, repeat)
+    with tempfile.TemporaryDirectory(prefix="outback-bench-") as tmp:
+        generate_repo(tmp, spec)
+        return run_benchmarks(tmp, repeat)
+
+
+def _spec_dict(spec: SyntheticRepoSpec) -> dict:
+    # Round-trip through JSON so tuples compare equal to a loaded baseline's lists
+    spec_dict: dict = json.loads(json.dumps(asdict(spec)))
+    return spec_dict
+
+
+def save_baseline(
+    path: Path | str, results: list[BenchmarkResult], spec: SyntheticRepoSpec
+) -> None:
+    baseline = {
+        "spec": _spec_dict(spec),
+        "python": platform.python_version(),
+        "results": {r.name: {"seconds": r.seconds, "peak_bytes": r.peak_bytes} for r in results},
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def load_baseline(path: Path | str) -> dict:
+    with open(path) as f:
+        baseline: dict = json.load(f)
+    return baseline
+
+
+def find_regressions(
+    results: list[BenchmarkResult],
+    baseline: dict,
+    spec: SyntheticRepoSpec | None = None,
+    threshold: float = 0.25,
+) -> list[str]:
+    """Describe each phase over `threshold` slower, or using more memory, than the baseline."""
+    regressions = []
+    if spec is not None and baseline.get("spec") != _spec_dict(spec):
+        regressions.append("baseline was recorded with a different synthetic repo spec")
+    for result in results:
+        if (base := baseline.get("results", {}).get(result.name)) is None:
+            continue
+        if result.seconds > base["seconds"] * (1 + threshold):
+            change = result.seconds / base["seconds"] - 1
+            regressions.append(
+                f"{result.name}: {result.seconds:.3f}s vs {base['seconds']:.3f}s (+{change:.0%})"
+            )
+        if result.peak_bytes > base["peak_bytes"] * (1 + threshold):
+            change = result.peak_bytes / base["peak_bytes"] - 1
+            regressions.append(
+                f"{result.name}: peak {_format_bytes(result.peak_bytes)}"
+                f" vs {_format_bytes(base['peak_bytes'])} (+{change:.0%})"
+            )
+    return regressions
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_benchmarks(results: list[BenchmarkResult], baseline: dict | None = None) -> None:
+    table = Table(title="Benchmarks", title_justify="left")
+    table.add_column("Phase")
+    table.add_column("Best", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("Peak memory", justify="right")
+    if baseline:
+        table.add_column("Baseline", justify="right")
+        table.add_column("Change", justify="right")
+
+    for result in results:
+        row = [
+            result.name,
+            f"{result.seconds:.3f}s",
+            f"{result.mean_seconds:.3f}s",
+            _format_bytes(result.peak_bytes) if result.peak_bytes else "-",
+        ]
+        if baseline:
+            if base := baseline.get("results", {}).get(result.name):
+                change = result.seconds / base["seconds"] - 1 if base["seconds"] else 0.0
+                color = "red" if change > 0.1 else "green" if change < -0.1 else "white"
+                row += [f"{base['seconds']:.3f}s", f"[{color}]{change:+.0%}[/{color}]"]
+            else:
+                row += ["", ""]
+        table.add_row(*row)
+    rich.print(table)
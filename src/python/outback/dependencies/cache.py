@@ -0,0 +1,207 @@
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from .instrumentation import count
+from .types import DependencyType, PackageStore, PackageSummary
+
+# Bump whenever the encoded layout below changes; older rows are then ignored and evicted.
+_SCHEMA_VERSION = 1
+
+_DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Cache directory: $OUTBACK_CACHE_DIR, else $XDG_CACHE_HOME/outback, else ~/.cache/outback."""
+    if env := os.environ.get("OUTBACK_CACHE_DIR"):
+        return Path(env)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "outback"
+
+
+def _encode(summary: PackageSummary) -> bytes:
+    rows = []
+    for u in summary.usages:
+        name, type, framework, requested, resolved, dependencies, _ = u._row()
+        rows.append((name, type.value, framework, requested, resolved, dependencies))
+    payload = (str(summary.project_path), str(summary.packages_file_path), rows)
+    return zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _decode(blob: bytes, store: PackageStore) -> PackageSummary:
+    project_path, packages_file_path, rows = pickle.loads(zlib.decompress(blob))
+    add = store.add
+    usages = store.view(
+        add(name, DependencyType(type_value), framework, requested, resolved, dependencies)
+        for name, type_value, framework, requested, resolved, dependencies in rows
+    )
+    return PackageSummary(
+        project_path=Path(project_path), packages_file_path=Path(packages_file_path), usages=usages
+    )
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def __str__(self) -> str:
+        total = self.hits + self.misses
+        rate = f"{self.hits / total:.0%}" if total else "n/a"
+        return (
+            f"cache: {self.hits} hits, {self.misses} misses ({rate} hit rate), "
+            f"{self.writes} writes, {self.evictions} evictions"
+        )
+
+
+class SummaryCache:
+    """Persistent SQLite cache of parsed lock files.
+
+    Entries are keyed by (path, mtime_ns, size, include_transitive), so any change to a lock
+    file is a miss. The store is trimmed least-recently-used first once it exceeds `max_bytes`.
+
+    Usage:
+        with SummaryCache() as cache:
+            print_projects(base_dir, cache=cache)
+            print(cache.stats)
+    """
+
+    def __init__(self, cache_dir: Path | str | None = None, max_bytes: int = _DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._touched: dict[tuple[str, int], float] = {}
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.cache_dir / "summaries.sqlite3", check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS summaries (
+                path TEXT NOT NULL,
+                include_transitive INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                schema INTEGER NOT NULL,
+                accessed REAL NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (path, include_transitive)
+            );
+            CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed);
+            """
+        )
+
+    def __enter__(self) -> "SummaryCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @staticmethod
+    def _key(
+        packages_file_path: Path, include_transitive: bool, st: os.stat_result | None = None
+    ) -> tuple[str, int, int, int]:
+        st = st if st is not None else os.stat(packages_file_path)
+        return (
+            os.path.abspath(packages_file_path),
+            int(include_transitive),
+            st.st_mtime_ns,
+            st.st_size,
+        )
+
+    def get(
+        self,
+        packages_file_path: Path,
+        include_transitive: bool,
+        store: PackageStore | None = None,
+        st: os.stat_result | None = None,
+    ) -> PackageSummary | None:
+        """Return the cached summary if the file is unchanged since it was stored.
+
+        Usages are appended to `store`, or to a new store when none is given. `st` is the
+        file's os.stat when the caller already has it.
+        """
+        path, transitive, mtime_ns, size = self._key(packages_file_path, include_transitive, st)
+        row = self._conn.execute(
+            "SELECT data FROM summaries WHERE path = ? AND include_transitive = ?"
+            " AND mtime_ns = ? AND size = ? AND schema = ?",
+            (path, transitive, mtime_ns, size, _SCHEMA_VERSION),
+        ).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            count("cache misses")
+            return None
+        self.stats.hits += 1
+        count("cache hits")
+        self._touched[(path, transitive)] = time.time()
+        return _decode(row[0], store if store is not None else PackageStore())
+
+    def put(
+        self,
+        packages_file_path: Path,
+        include_transitive: bool,
+        summary: PackageSummary,
+        st: os.stat_result | None = None,
+    ) -> None:
+        """Store `summary` under the file's mtime and size.
+
+        Pass the os.stat taken before the file was read as `st`: a file rewritten while it
+        was being parsed is then stored under its old mtime and size and missed next time,
+        instead of the old content being served for the new file.
+        """
+        path, transitive, mtime_ns, size = self._key(packages_file_path, include_transitive, st)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, transitive, mtime_ns, size, _SCHEMA_VERSION, time.time(), _encode(summary)),
+        )
+        self.stats.writes += 1
+
+    def _evict(self) -> None:
+        self.stats.evictions += self._conn.execute(
+            "DELETE FROM summaries WHERE schema != ?", (_SCHEMA_VERSION,)
+        ).rowcount
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM summaries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for path, transitive, length in self._conn.execute(
+            "SELECT path, include_transitive, LENGTH(data) FROM summaries ORDER BY accessed"
+        ).fetchall():
+            self._conn.execute(
+                "DELETE FROM summaries WHERE path = ? AND include_transitive = ?",
+                (path, transitive),
+            )
+            self.stats.evictions += 1
+            total -= length
+            if total <= self.max_bytes:
+                break
+
+    def flush(self) -> None:
+        """Persist access times and writes, then trim the store to `max_bytes`."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE summaries SET accessed = ? WHERE path = ? AND include_transitive = ?",
+                [
+                    (accessed, path, transitive)
+                    for (path, transitive), accessed in self._touched.items()
+                ],
+            )
+            self._touched.clear()
+        self._evict()
+        self._conn.commit()
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM summaries")
+        self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,322 @@
+import glob
+import os
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PROPS_FILE_NAME = "Directory.Packages.props"
+
+_PROPERTY_RE = re.compile(r"\$\(([A-Za-z_][\w.-]*)\)")
+# Arguments may contain $(Property) references,
+# e.g. GetPathOfFileAbove(x, $(MSBuildThisFileDirectory)..)
+_ARGUMENT = r"((?:\$\([\w.-]+\)|[^,()])*?)"
+_FILE_ABOVE_RE = re.compile(
+    r"\$\(\[MSBuild\]::(GetPathOfFileAbove|GetDirectoryNameOfFileAbove)\(\s*"
+    + _ARGUMENT
+    + r"\s*(?:,\s*"
+    + _ARGUMENT
+    + r"\s*)?\)\)"
+)
+_EXISTS_RE = re.compile(r"^(!?)\s*Exists\(\s*'([^']*)'\s*\)$", re.IGNORECASE)
+_COMPARE_RE = re.compile(r"^'([^']*)'\s*(==|!=)\s*'([^']*)'$")
+_MAX_IMPORT_DEPTH = 32
+
+
+def _local(tag: str) -> str:
+    """Element name without the MSBuild XML namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _reserved_properties(path: Path) -> dict[str, str]:
+    directory = str(path.parent) + os.sep
+    return {
+        "MSBuildThisFile": path.name,
+        "MSBuildThisFileName": path.stem,
+        "MSBuildThisFileExtension": path.suffix,
+        "MSBuildThisFileFullPath": str(path),
+        "MSBuildThisFileDirectory": directory,
+    }
+
+
+@dataclass
+class _Evaluation:
+    versions: dict[str, str]
+    properties: dict[str, str]
+    files: list[tuple[str, int, int]] = field(
+        default_factory=list
+    )  # (path, mtime_ns, size) of every file read
+
+
+class CentralPackageResolver:
+    """Evaluates central package management (CPM) files the way MSBuild would, memoized per file.
+
+    For a project the effective file is the nearest `Directory.Packages.props` above it.
+    Evaluation follows `<Import>` (including the usual
+    `$([MSBuild]::GetPathOfFileAbove(Directory.Packages.props, ...))` chain to a parent props
+    file), substitutes `$(Property)` references from properties defined in the import chain
+    or the environment, and applies `PackageVersion` `Include`/`Update`/`Remove` items.
+    `VersionOverride` on a project's `PackageReference` takes precedence for that project.
+
+    Conditions are evaluated for `Exists(...)` and simple `'a' == 'b'` comparisons; anything
+    else counts as true. `$(MSBuildProjectDirectory)` is the props file's own directory, so
+    one evaluation serves every project below it. Parsed files and evaluated results are
+    reused until a file involved changes on disk.
+
+    Usage:
+        resolver = CentralPackageResolver()
+        versions = resolver.project_versions(project_path)  # name_lower -> version
+    """
+
+    def __init__(self) -> None:
+        self._parsed: dict[str, tuple[int, int, ET.Element]] = {}
+        self._evaluated: dict[str, _Evaluation] = {}
+        self._nearest: dict[str, Path | None] = {}
+
+    def find_props(self, project_path: Path | str) -> Path | None:
+        """Nearest Directory.Packages.props in `project_path` or any directory above it."""
+        directory = os.path.abspath(project_path)
+        visited = []
+        while directory not in self._nearest:
+            visited.append(directory)
+            candidate = os.path.join(directory, PROPS_FILE_NAME)
+            if os.path.isfile(candidate):
+                self._nearest[directory] = Path(candidate)
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                self._nearest[directory] = None
+                break
+            directory = parent
+        found = self._nearest[directory]
+        for path in visited:
+            self._nearest[path] = found
+        return found
+
+    def versions(self, props_path: Path | str) -> dict[str, str]:
+        """Central versions (name_lower -> version) defined by a props file and its imports."""
+        return self._evaluate(Path(os.path.abspath(props_path))).versions
+
+    def files(self, props_path: Path | str) -> list[Path]:
+        """Every file read to evaluate a props file: itself and its imports, in read order."""
+        return [
+            Path(path) for path, _, _ in self._evaluate(Path(os.path.abspath(props_path))).files
+        ]
+
+    def project_versions(self, project_path: Path | str) -> dict[str, str]:
+        """Effective central versions for a project, including its VersionOverride entries."""
+        props_path = self.find_props(project_path)
+        evaluation = self._evaluate(Path(os.path.abspath(props_path))) if props_path else None
+        versions = evaluation.versions if evaluation else {}
+        properties = evaluation.properties if evaluation else {}
+
+        overrides = {}
+        for csproj in sorted(Path(project_path).glob("*.csproj")):
+            if (root := self._parse(str(csproj))) is None:
+                continue
+            reserved = _reserved_properties(csproj)
+            for element in root.iter():
+                if _local(element.tag) != "PackageReference":
+                    continue
+                name = element.get("Include") or element.get("Update")
+                version = element.get("VersionOverride")
+                if name and version:
+                    overrides[name.lower()] = self._substitute(version, properties, reserved)
+        return {**versions, **overrides} if overrides else versions
+
+    def _parse(self, path: str) -> ET.Element | None:
+        """Parsed root of an MSBuild file, or None when it cannot be read.
+
+        Malformed XML raises ET.ParseError naming the file, as it did before imports were followed.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if (entry := self._parsed.get(path)) and entry[:2] == (st.st_mtime_ns, st.st_size):
+            return entry[2]
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError as error:
+            raise ET.ParseError(f"{path}: {error}") from error
+        self._parsed[path] = (st.st_mtime_ns, st.st_size, root)
+        return root
+
+    def _is_current(self, evaluation: _Evaluation) -> bool:
+        for path, mtime_ns, size in evaluation.files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+                return False
+        return True
+
+    def _evaluate(self, props_path: Path) -> _Evaluation:
+        key = str(props_path)
+        if (cached := self._evaluated.get(key)) is not None and self._is_current(cached):
+            return cached
+
+        properties: dict[str, str] = {"MSBuildProjectDirectory": str(props_path.parent)}
+        items: list[
+            tuple[ET.Element, ET.Element, dict[str, str]]
+        ] = []  # (item group, item, reserved)
+        evaluation = _Evaluation(versions={}, properties=properties)
+        importing: list[str] = []
+
+        def walk(path: str) -> None:
+            if path in importing or len(importing) >= _MAX_IMPORT_DEPTH:
+                return
+            if (root := self._parse(path)) is None:
+                return
+            mtime_ns, size, _ = self._parsed[path]
+            evaluation.files.append((path, mtime_ns, size))
+            reserved = _reserved_properties(Path(path))
+            importing.append(path)
+            # Properties and imports are evaluated in document order; items once all properties
+            # are known.
+            for element in root:
+                tag = _local(element.tag)
+                if not self._condition(element, properties, reserved):
+                    continue
+                if tag == "PropertyGroup":
+                    for prop in element:
+                        if isinstance(prop.tag, str) and self._condition(
+                            prop, properties, reserved
+                        ):
+                            properties[_local(prop.tag)] = self._substitute(
+                                prop.text or "", properties, reserved
+                            )
+                elif tag == "ItemGroup":
+                    items.extend(
+                        (element, item, reserved) for item in element if isinstance(item.tag, str)
+                    )
+                elif tag in ("Import", "ImportGroup"):
+                    imports = (
+                        [element]
+                        if tag == "Import"
+                        else [e for e in element if _local(e.tag) == "Import"]
+                    )
+                    for imp in imports:
+                        if tag == "Import" or self._condition(imp, properties, reserved):
+                            for target in self._import_targets(
+                                imp.get("Project", ""), path, properties, reserved
+                            ):
+                                walk(target)
+            importing.pop()
+
+        walk(key)
+
+        versions = evaluation.versions
+        for group, item, reserved in items:
+            if _local(item.tag) != "PackageVersion" or not self._condition(
+                group, properties, reserved
+            ):
+                continue
+            if not self._condition(item, properties, reserved):
+                continue
+            if remove := item.get("Remove"):
+                for name in self._substitute(remove, properties, reserved).split(";"):
+                    versions.pop(name.strip().lower(), None)
+                continue
+            version = item.get("Version")
+            if version is None:
+                child = next((c for c in item if _local(c.tag) == "Version"), None)
+                version = child.text if child is not None else None
+            if version is None:
+                continue
+            version = self._substitute(version, properties, reserved).strip()
+            if include := item.get("Include"):
+                for name in self._substitute(include, properties, reserved).split(";"):
+                    if name := name.strip():
+                        versions[name.lower()] = version
+            elif update := item.get("Update"):
+                for name in self._substitute(update, properties, reserved).split(";"):
+                    if (name := name.strip().lower()) in versions:
+                        versions[name] = version
+
+        self._evaluated[key] = evaluation
+        return evaluation
+
+    def _substitute(self, value: str, properties: dict[str, str], reserved: dict[str, str]) -> str:
+        def file_above(match: re.Match) -> str:
+            function, first, second = match.group(1), match.group(2), match.group(3)
+            if function == "GetPathOfFileAbove":
+                name, start = first, second or reserved["MSBuildThisFileDirectory"]
+            else:
+                start, name = first, second or ""
+            start = os.path.normpath(self._substitute(start, properties, reserved))
+            name = self._substitute(name, properties, reserved).strip("'\"")
+            found = self._file_above(start, name)
+            if found is None:
+                return ""
+            return found if function == "GetPathOfFileAbove" else os.path.dirname(found)
+
+        value = _FILE_ABOVE_RE.sub(file_above, value)
+
+        def lookup(match: re.Match) -> str:
+            name = match.group(1)
+            if name in reserved:
+                return reserved[name]
+            if name in properties:
+                return properties[name]
+            return os.environ.get(name, "")
+
+        return _PROPERTY_RE.sub(lookup, value)
+
+    @staticmethod
+    def _file_above(start: str, name: str) -> str | None:
+        directory = os.path.abspath(start)
+        while True:
+            candidate = os.path.join(directory, name)
+            if os.path.isfile(candidate):
+                return candidate
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+
+    def _import_targets(
+        self, project: str, importer: str, properties: dict[str, str], reserved: dict[str, str]
+    ) -> list[str]:
+        targets = []
+        for part in self._substitute(project, properties, reserved).split(";"):
+            if not (part := part.strip()) or "$(" in part:
+                continue
+            path = os.path.normpath(
+                os.path.join(os.path.dirname(importer), part.replace("\\", os.sep))
+            )
+            if glob.has_magic(path):
+                targets.extend(sorted(glob.glob(path)))
+            elif os.path.isfile(path):
+                targets.append(path)
+        return targets
+
+    def _condition(
+        self, element: ET.Element, properties: dict[str, str], reserved: dict[str, str]
+    ) -> bool:
+        if not (condition := element.get("Condition")):
+            return True
+        condition = self._substitute(condition, properties, reserved)
+        for alternative in re.split(r"\s+or\s+", condition, flags=re.IGNORECASE):
+            if all(
+                self._clause(clause.strip(), reserved)
+                for clause in re.split(r"\s+and\s+", alternative, flags=re.IGNORECASE)
+            ):
+                return True
+        return False
+
+    @staticmethod
+    def _clause(clause: str, reserved: dict[str, str]) -> bool:
+        if match := _EXISTS_RE.match(clause):
+            path = match.group(2).replace("\\", os.sep)
+            path = os.path.join(os.path.dirname(reserved["MSBuildThisFileFullPath"]), path)
+            return os.path.exists(path) != bool(match.group(1))
+        if match := _COMPARE_RE.match(clause):
+            equal = match.group(1).strip().lower() == match.group(3).strip().lower()
+            return equal if match.group(2) == "==" else not equal
+        return True
+
+
+# Shared by load_global_deps so repeated calls on the same props file do not re-parse it.
+_default_resolver = CentralPackageResolver()
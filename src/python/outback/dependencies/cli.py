@@ -0,0 +1,458 @@
+"""Command line interface: `outback <command> [options]` or python -m outback.dependencies.
+
+Command modules (and rich, through them) are imported only by the command that needs them,
+so `capture`, `clean`, `--help` and the json/ndjson output modes start without loading them.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import SummaryCache
+    from .synthetic import SyntheticRepoSpec
+
+
+def _add_common_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "base_dir", nargs="?", type=Path, default=Path("."), help="Directory to search for projects"
+    )
+    parser.add_argument(
+        "-f",
+        "--filter",
+        dest="project_filter",
+        help='Project path glob(s), e.g. "**/Core*;!**/Tests/**"',
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Parse lock files on N worker processes"
+    )
+    parser.add_argument("--cache", action="store_true", help="Use the persistent lock-file cache")
+    parser.add_argument(
+        "--cache-dir", type=Path, default=None, help="Cache directory (implies --cache)"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="summary",
+        choices=("summary", "json"),
+        help="Print per-phase timings and counters to stderr (summary table or json)",
+    )
+
+
+def _add_package_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-P",
+        "--package",
+        dest="package_filter",
+        action="append",
+        help='Only packages matching this name glob, e.g. "Newtonsoft.*" (repeatable)',
+    )
+
+
+def _add_tree_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max-depth", type=int, default=None, help="Maximum nesting depth of dependency trees"
+    )
+    parser.add_argument(
+        "--max-nodes", type=int, default=None, help="Maximum package nodes per framework tree"
+    )
+    parser.add_argument(
+        "--max-project-nodes",
+        type=int,
+        default=None,
+        help="Maximum package nodes per project, across frameworks",
+    )
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="Stream plain text without styling (fast, pager-friendly)",
+    )
+
+
+def _add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    # Unset options fall back to the SyntheticRepoSpec defaults in _spec_from_args
+    parser.add_argument("--projects", type=int, help="Number of projects")
+    parser.add_argument("--packages", type=int, help="Number of distinct packages")
+    parser.add_argument("--depth", type=int, help="Layers in the package graph")
+    parser.add_argument("--fan-out", type=int, help="Dependencies per package")
+    parser.add_argument("--diamonds", type=float, help="Diamond edge probability")
+    parser.add_argument("--multi-target", type=float, help="Multi-targeting ratio")
+    parser.add_argument("--drift", type=float, help="Ratio of projects that changed")
+    parser.add_argument("--seed", type=int)
+
+
+def _spec_from_args(args: argparse.Namespace) -> "SyntheticRepoSpec":
+    from .synthetic import SyntheticRepoSpec
+
+    values = {
+        "projects": args.projects,
+        "packages": args.packages,
+        "depth": args.depth,
+        "fan_out": args.fan_out,
+        "diamond_density": args.diamonds,
+        "multi_target_ratio": args.multi_target,
+        "drift_ratio": args.drift,
+        "seed": args.seed,
+    }
+    return SyntheticRepoSpec(**{name: value for name, value in values.items() if value is not None})
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="outback", description="Analyze .NET package dependencies"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    projects = commands.add_parser("projects", help="Show each project's dependency tree")
+    _add_common_arguments(projects)
+    projects.add_argument(
+        "--flat", action="store_true", help="Flat package list instead of nested tree"
+    )
+    projects.add_argument(
+        "--transitive", action="store_true", help="Include transitive dependencies"
+    )
+    _add_package_argument(projects)
+    _add_output_arguments(projects)
+    _add_tree_arguments(projects)
+
+    diff = commands.add_parser("diff", help="Compare before/after lock files")
+    _add_common_arguments(diff)
+    diff.add_argument(
+        "-g", "--global", dest="global_version_path", type=Path, help=".props or .packageset file"
+    )
+    diff.add_argument("--only-changes", action="store_true", help="Only show packages that changed")
+    diff.add_argument(
+        "--no-transitive", action="store_true", help="Exclude transitive dependencies"
+    )
+    diff.add_argument("--before-file", default="packages.before.lock.json")
+    diff.add_argument("--after-file", default="packages.lock.json")
+    diff.add_argument(
+        "--central", action="store_true", help="Use each project's nearest Directory.Packages.props"
+    )
+    diff.add_argument(
+        "--before-rev", help="Read the before state from this git revision (e.g. HEAD)"
+    )
+    _add_package_argument(diff)
+    _add_output_arguments(diff)
+    diff.add_argument("--max-rows", type=int, default=None, help="Maximum package rows per project")
+    diff.add_argument(
+        "--format",
+        choices=("table", "json", "ndjson"),
+        default="table",
+        help="Output format (default: table)",
+    )
+
+    watch = commands.add_parser("watch", help="Re-diff projects whenever their lock files change")
+    _add_common_arguments(watch)
+    watch.add_argument(
+        "-g", "--global", dest="global_version_path", type=Path, help=".props or .packageset file"
+    )
+    watch.add_argument(
+        "--only-changes", action="store_true", help="Only show packages that changed"
+    )
+    watch.add_argument(
+        "--no-transitive", action="store_true", help="Exclude transitive dependencies"
+    )
+    watch.add_argument("--before-file", default="packages.before.lock.json")
+    watch.add_argument("--after-file", default="packages.lock.json")
+    watch.add_argument(
+        "--before-rev", help="Read the before state from this git revision (e.g. HEAD)"
+    )
+    watch.add_argument(
+        "--central", action="store_true", help="Use each project's nearest Directory.Packages.props"
+    )
+    watch.add_argument(
+        "--debounce", type=float, default=0.2, help="Quiet seconds before rendering (default: 0.2)"
+    )
+    watch.add_argument(
+        "--poll", action="store_true", help="Poll file mtimes instead of using inotify"
+    )
+    watch.add_argument(
+        "--poll-interval", type=float, default=0.5, help="Seconds between polls (default: 0.5)"
+    )
+    _add_output_arguments(watch)
+
+    summary = commands.add_parser("summary", help="Dependency trees followed by before/after diffs")
+    _add_common_arguments(summary)
+    summary.add_argument(
+        "-g", "--global", dest="global_version_path", type=Path, help=".props or .packageset file"
+    )
+    summary.add_argument(
+        "--flat", action="store_true", help="Flat package lists, including transitive"
+    )
+    summary.add_argument(
+        "--only-changes", action="store_true", help="Only show packages that changed"
+    )
+    summary.add_argument(
+        "--central", action="store_true", help="Use each project's nearest Directory.Packages.props"
+    )
+    summary.add_argument(
+        "--before-rev", help="Read the before state from this git revision (e.g. HEAD)"
+    )
+    _add_package_argument(summary)
+    _add_output_arguments(summary)
+    summary.add_argument(
+        "--max-rows", type=int, default=None, help="Maximum package rows per project in diffs"
+    )
+    _add_tree_arguments(summary)
+
+    drift = commands.add_parser(
+        "drift", help="Packages resolved to several versions across the solution"
+    )
+    _add_common_arguments(drift)
+    drift.add_argument(
+        "-g", "--global", dest="global_version_path", type=Path, help=".props or .packageset file"
+    )
+    drift.add_argument(
+        "--central", action="store_true", help="Use each project's nearest Directory.Packages.props"
+    )
+    drift.add_argument(
+        "--no-transitive", action="store_true", help="Exclude transitive dependencies"
+    )
+    drift.add_argument(
+        "--all", dest="all_packages", action="store_true", help="Also list consistent packages"
+    )
+    drift.add_argument(
+        "--format",
+        choices=("table", "json"),
+        default="table",
+        help="Output format (default: table)",
+    )
+
+    why = commands.add_parser(
+        "why", help="Show which projects pull in a package and through which chain"
+    )
+    why.add_argument("package", help="Package name")
+    _add_common_arguments(why)
+    why.add_argument("-p", "--project", help="List every chain within this project (name or path)")
+    why.add_argument("--framework", help='Only this framework version, e.g. "8.0"')
+
+    dependents = commands.add_parser("dependents", help="Show which projects reference a project")
+    dependents.add_argument("project", help="Project name or path")
+    _add_common_arguments(dependents)
+    dependents.add_argument(
+        "--direct", action="store_true", help="Only projects referencing it directly"
+    )
+
+    capture = commands.add_parser(
+        "capture", help="Copy packages.lock.json to packages.before.lock.json"
+    )
+    capture.add_argument("base_dir", nargs="?", type=Path, default=Path("."))
+    capture.add_argument("-w", "--workers", type=int, default=None)
+
+    clean = commands.add_parser("clean", help="Remove packages.before.lock.json files")
+    clean.add_argument("base_dir", nargs="?", type=Path, default=Path("."))
+    clean.add_argument("-w", "--workers", type=int, default=None)
+
+    generate = commands.add_parser("generate", help="Write a synthetic monorepo for benchmarking")
+    generate.add_argument("base_dir", type=Path, help="Directory to generate the repo in")
+    _add_spec_arguments(generate)
+
+    bench = commands.add_parser("bench", help="Benchmark discovery, parsing, diffing and rendering")
+    _add_spec_arguments(bench)
+    bench.add_argument("--repeat", type=int, default=3, help="Timed runs per phase (default: 3)")
+    bench.add_argument(
+        "--dir", type=Path, default=None, help="Generate the repo here instead of a temp directory"
+    )
+    bench.add_argument(
+        "--baseline", type=Path, help="Compare against this baseline file; exit 1 on regressions"
+    )
+    bench.add_argument("--save-baseline", type=Path, help="Write the results as a baseline file")
+    bench.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown before flagging (default: 0.25)",
+    )
+
+    return parser
+
+
+def _run_bench(args: argparse.Namespace) -> int:
+    from .bench import (
+        benchmark_synthetic,
+        find_regressions,
+        load_baseline,
+        print_benchmarks,
+        save_baseline,
+    )
+
+    spec = _spec_from_args(args)
+    results = benchmark_synthetic(spec, repeat=args.repeat, root=args.dir)
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    print_benchmarks(results, baseline)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, spec)
+    if baseline is None:
+        return 0
+    regressions = find_regressions(results, baseline, spec, threshold=args.threshold)
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "capture":
+        from .utils import capture_before_deps
+
+        capture_before_deps(args.base_dir, workers=args.workers)
+        return 0
+    if args.command == "clean":
+        from .utils import remove_before_deps
+
+        remove_before_deps(args.base_dir, workers=args.workers)
+        return 0
+    if args.command == "generate":
+        from .synthetic import generate_repo
+
+        project_paths = generate_repo(args.base_dir, _spec_from_args(args))
+        print(f"generated {len(project_paths)} projects in {args.base_dir}")
+        return 0
+    if args.command == "bench":
+        return _run_bench(args)
+
+    from .instrumentation import print_profile, profiling
+
+    cache = None
+    if args.cache or args.cache_dir:
+        from .cache import SummaryCache
+
+        cache = SummaryCache(args.cache_dir)
+    common = {"project_filter": args.project_filter, "cache": cache, "workers": args.workers}
+    with profiling(args.profile is not None) as profiler:
+        status = _run_command(args, cache, common)
+    if profiler is not None:
+        print_profile(profiler, args.profile)
+    return status
+
+
+def _run_command(args: argparse.Namespace, cache: "SummaryCache | None", common: dict) -> int:
+    try:
+        if args.command == "projects":
+            from .print import print_projects
+            from .render import PlainRenderer
+
+            print_projects(
+                args.base_dir,
+                include_transitive=args.transitive,
+                nested=not args.flat,
+                max_depth=args.max_depth,
+                max_nodes=args.max_nodes,
+                package_filter=args.package_filter,
+                max_project_nodes=args.max_project_nodes,
+                renderer=PlainRenderer() if args.plain else None,
+                **common,
+            )
+        elif args.command == "diff":
+            diff_args = {
+                "before_file": args.before_file,
+                "after_file": args.after_file,
+                "global_version_path": args.global_version_path,
+                "only_changes": args.only_changes,
+                "include_transitive": not args.no_transitive,
+                "before_rev": args.before_rev,
+                "central": args.central,
+                "package_filter": args.package_filter,
+                **common,
+            }
+            if args.format == "table":
+                from .print import print_package_diffs
+                from .render import PlainRenderer
+
+                print_package_diffs(
+                    args.base_dir,
+                    max_rows=args.max_rows,
+                    renderer=PlainRenderer() if args.plain else None,
+                    **diff_args,
+                )
+            else:
+                from .diff import compute_package_diffs, write_package_diffs
+
+                write_package_diffs(
+                    compute_package_diffs(args.base_dir, **diff_args), sys.stdout, args.format
+                )
+        elif args.command == "watch":
+            from .render import PlainRenderer
+            from .watch import watch_package_diffs
+
+            watch_package_diffs(
+                args.base_dir,
+                before_file=args.before_file,
+                after_file=args.after_file,
+                global_version_path=args.global_version_path,
+                only_changes=args.only_changes,
+                include_transitive=not args.no_transitive,
+                before_rev=args.before_rev,
+                debounce=args.debounce,
+                poll_interval=args.poll_interval,
+                use_inotify=False if args.poll else None,
+                central=args.central,
+                renderer=PlainRenderer() if args.plain else None,
+                **common,
+            )
+        elif args.command == "summary":
+            from .print import print_project_summary
+            from .render import PlainRenderer
+
+            print_project_summary(
+                args.base_dir,
+                global_version_path=args.global_version_path,
+                flat=args.flat,
+                only_changes=args.only_changes,
+                max_depth=args.max_depth,
+                max_nodes=args.max_nodes,
+                before_rev=args.before_rev,
+                central=args.central,
+                package_filter=args.package_filter,
+                max_project_nodes=args.max_project_nodes,
+                max_rows=args.max_rows,
+                renderer=PlainRenderer() if args.plain else None,
+                **common,
+            )
+        elif args.command == "drift":
+            drift_args = {
+                "global_version_path": args.global_version_path,
+                "include_transitive": not args.no_transitive,
+                "all_packages": args.all_packages,
+                "central": args.central,
+                **common,
+            }
+            if args.format == "table":
+                from .print import print_version_drift
+
+                print_version_drift(args.base_dir, **drift_args)
+            else:
+                from .drift import compute_version_drift, write_version_drift
+
+                write_version_drift(compute_version_drift(args.base_dir, **drift_args), sys.stdout)
+        elif args.command == "why":
+            from .print import print_why
+
+            print_why(
+                args.base_dir,
+                args.package,
+                project=args.project,
+                framework=args.framework,
+                **common,
+            )
+        elif args.command == "dependents":
+            from .print import print_dependents
+
+            print_dependents(args.base_dir, args.project, direct=args.direct, **common)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The reader (head, a pager) went away; silence the flush at interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 141
+    finally:
+        if cache is not None:
+            cache.close()
+    return 0
@@ -0,0 +1,392 @@
+import json
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from .cache import SummaryCache
+from .git import read_git_blobs
+from .instrumentation import count, phase
+from .query import PackageFilter, prescan_projects
+from .types import PackageStore, PackageSummary, PackageUsage
+from .utils import _framework_sections, _summary_from_bytes, _summary_from_sections
+from .versions import VersionChange, classify_change, parse_range, version_key
+from .workspace import Workspace
+
+
+class DiffKind(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    UPGRADED = "upgraded"
+    DOWNGRADED = "downgraded"
+    TYPE_CHANGED = "type_changed"
+    CHANGED = "changed"  # same resolved version and type; requested range or dependencies differ
+    UNCHANGED = "unchanged"
+
+
+@dataclass(frozen=True)
+class PackageDiff:
+    """Change of one package in one framework of one project between two lock files.
+
+    `global_drift` is set when the after-state resolves to a version other than the central
+    (global) version for the package, independently of `kind`. `change` is the size of a
+    resolved-version step (major/minor/patch/revision/prerelease) for upgrades and downgrades;
+    `range_violation` is set when the after-state resolves outside its own requested range.
+    """
+
+    project_path: Path
+    framework: str
+    name: str
+    name_lower: str
+    kind: DiffKind
+    before: PackageUsage | None
+    after: PackageUsage | None
+    global_version: str | None = None
+    global_drift: bool = False
+    change: VersionChange | None = None
+    range_violation: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return self.kind != DiffKind.UNCHANGED
+
+    def to_dict(self) -> dict:
+        def usage_dict(usage: PackageUsage | None) -> dict | None:
+            if usage is None:
+                return None
+            return {
+                "type": usage.type.value,
+                "requested": usage.requested_version,
+                "resolved": usage.resolved_version,
+            }
+
+        return {
+            "project": str(self.project_path),
+            "framework": self.framework,
+            "package": self.name,
+            "kind": self.kind.value,
+            "before": usage_dict(self.before),
+            "after": usage_dict(self.after),
+            "global": self.global_version,
+            "global_drift": self.global_drift,
+            "change": self.change.value if self.change else None,
+            "range_violation": self.range_violation,
+        }
+
+
+def _classify(before: PackageUsage | None, after: PackageUsage | None) -> DiffKind:
+    if before is None:
+        return DiffKind.ADDED
+    if after is None:
+        return DiffKind.REMOVED
+    if before == after:
+        return DiffKind.UNCHANGED
+    if before.resolved_version != after.resolved_version:
+        if version_key(after.resolved_version) < version_key(before.resolved_version):
+            return DiffKind.DOWNGRADED
+        return DiffKind.UPGRADED
+    if before.type != after.type:
+        return DiffKind.TYPE_CHANGED
+    return DiffKind.CHANGED
+
+
+def diff_summaries(
+    project_path: Path,
+    before_summary: PackageSummary,
+    after_summary: PackageSummary,
+    global_versions: dict[str, str] | None = None,
+    only_changes: bool = False,
+) -> Iterator[PackageDiff]:
+    """Diff two parsed lock files of a project, ordered by framework then package name."""
+    global_versions = global_versions or {}
+    frameworks = before_summary.framework_lookup.keys() | after_summary.framework_lookup.keys()
+    for framework in sorted(frameworks):
+        before_by_name = before_summary.framework_lookup.get(framework, {})
+        after_by_name = after_summary.framework_lookup.get(framework, {})
+
+        for name_lower in sorted(before_by_name.keys() | after_by_name.keys()):
+            before = before_by_name.get(name_lower)
+            after = after_by_name.get(name_lower)
+            kind = _classify(before, after)
+            if only_changes and kind == DiffKind.UNCHANGED:
+                continue
+
+            global_version = global_versions.get(name_lower)
+            change = None
+            if kind in (DiffKind.UPGRADED, DiffKind.DOWNGRADED) and before and after:
+                change = classify_change(before.resolved_version, after.resolved_version)
+            yield PackageDiff(
+                project_path=project_path,
+                framework=framework,
+                name=(after or before_by_name[name_lower]).name,
+                name_lower=name_lower,
+                kind=kind,
+                before=before,
+                after=after,
+                global_version=global_version,
+                global_drift=bool(
+                    after and global_version and after.resolved_version != global_version
+                ),
+                change=change,
+                range_violation=bool(
+                    after
+                    and after.requested_version
+                    and after.resolved_version not in parse_range(after.requested_version)
+                ),
+            )
+
+
+@dataclass
+class DiffStats:
+    """Counts from the unchanged-file fast path of a diff run."""
+
+    projects_compared: int = 0
+    projects_skipped: int = 0
+    frameworks_skipped: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"unchanged: {self.projects_skipped}/{self.projects_compared} projects,"
+            f" {self.frameworks_skipped} framework sections (skipped)"
+        )
+
+
+def _read_bytes(path: Path) -> bytes | None:
+    try:
+        with phase("read"), open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    count("lock files read")
+    return data
+
+
+def _unchanged_fast_path(
+    before_path: Path,
+    after_path: Path,
+    before_data: bytes | None,
+    after_data: bytes | None,
+    include_transitive: bool,
+    store: PackageStore,
+    stats: DiffStats,
+) -> tuple[PackageSummary, PackageSummary] | bool | None:
+    """Compare raw lock files before decoding them.
+
+    Returns False when the files are identical (nothing to diff), a (before, after) pair of
+    summaries holding only the framework sections that differ, or None when the files must
+    be parsed in full.
+    """
+    if before_data is None or after_data is None:
+        return None
+    if len(before_data) == len(after_data) and before_data == after_data:
+        stats.projects_skipped += 1
+        return False
+
+    before_sections = _framework_sections(before_data)
+    after_sections = _framework_sections(after_data)
+    if before_sections is None or after_sections is None:
+        return None
+
+    # Only framework sections that differ are decoded.
+    unchanged = {k for k, section in before_sections.items() if after_sections.get(k) == section}
+    stats.frameworks_skipped += len(unchanged)
+    return (
+        _summary_from_sections(
+            before_path,
+            {k: v for k, v in before_sections.items() if k not in unchanged},
+            include_transitive,
+            store,
+        ),
+        _summary_from_sections(
+            after_path,
+            {k: v for k, v in after_sections.items() if k not in unchanged},
+            include_transitive,
+            store,
+        ),
+    )
+
+
+def iter_project_pairs(
+    workspace: Workspace,
+    before_file: str = "packages.before.lock.json",
+    after_file: str = "packages.lock.json",
+    include_transitive: bool = True,
+    skip_unchanged: bool = False,
+    stats: DiffStats | None = None,
+    before_rev: str | None = None,
+    project_paths: Iterable[Path] | None = None,
+) -> Iterator[tuple[Path, PackageSummary | None, PackageSummary | None]]:
+    """Yield (project_path, before_summary, after_summary) in project order.
+
+    Both summaries are None when either file is missing; only complete pairs are parsed.
+    With before_rev, the before state is `after_file` at that git revision instead of
+    `before_file`; all baseline files are read in one batched git call and parsed in memory.
+    With skip_unchanged, projects whose two lock files are byte-identical are not yielded at
+    all, and frameworks whose sections are identical are left out of the yielded summaries.
+    Only use it when unchanged packages are not going to be shown.
+    `project_paths` restricts the run to those projects (default: all discovered ones).
+    """
+    stats = stats if stats is not None else DiffStats()
+    project_paths = sorted(workspace.project_paths if project_paths is None else project_paths)
+    with_after = [p for p in project_paths if (p / after_file).exists()]
+
+    blobs: dict[Path, bytes] = {}
+    if before_rev is not None:
+        found = read_git_blobs(workspace.base_dir, before_rev, [p / after_file for p in with_after])
+        blobs = {path: data for path, data in found.items() if data is not None}
+        comparable = [p for p in with_after if p / after_file in blobs]
+    else:
+        comparable = [p for p in with_after if (p / before_file).exists()]
+    stats.projects_compared += len(comparable)
+
+    def before_data(project_path: Path) -> bytes | None:
+        if before_rev is not None:
+            return blobs[project_path / after_file]
+        return _read_bytes(project_path / before_file)
+
+    # Fast-path outcome per comparable project. Projects are checked one at a time as the loop
+    # below reaches them, or as the workspace reads ahead for the next lock file to parse, and
+    # dropped once yielded.
+    planned: dict[Path, tuple[PackageSummary, PackageSummary] | bool | None] = {}
+    unplanned = iter(comparable)
+    queued: deque[Path] = deque()
+
+    def plan_next() -> bool:
+        """Check the next comparable project and queue its lock files if they must be parsed."""
+        if (p := next(unplanned, None)) is None:
+            return False
+        planned[p] = (
+            _unchanged_fast_path(
+                p / (after_file if before_rev is not None else before_file),
+                p / after_file,
+                before_data(p),
+                _read_bytes(p / after_file),
+                include_transitive,
+                workspace.store,
+                stats,
+            )
+            if skip_unchanged
+            else None
+        )
+        if planned[p] is None:
+            if before_rev is None:
+                queued.append(p / before_file)
+            queued.append(p / after_file)
+        return True
+
+    def to_parse() -> Iterator[Path]:
+        """Lock files still to be parsed, in the order they are consumed below."""
+        while queued or plan_next():
+            if queued:
+                yield queued.popleft()
+
+    summaries = workspace.iter_summaries(to_parse(), include_transitive=include_transitive)
+    comparable_set = set(comparable)
+
+    for project_path in project_paths:
+        if project_path not in comparable_set:
+            yield project_path, None, None
+            continue
+        while project_path not in planned:
+            plan_next()
+        pair = planned.pop(project_path)
+        if pair is False:
+            # Byte-identical lock files
+            continue
+        if isinstance(pair, tuple):
+            yield project_path, *pair
+        elif before_rev is not None:
+            after_path = project_path / after_file
+            before_summary = _summary_from_bytes(
+                after_path,
+                blobs[after_path],
+                include_transitive=include_transitive,
+                store=workspace.store,
+            )
+            yield project_path, before_summary, next(summaries)
+        else:
+            yield project_path, next(summaries), next(summaries)
+
+
+def compute_package_diffs(
+    base_dir: Path,
+    before_file: str = "packages.before.lock.json",
+    after_file: str = "packages.lock.json",
+    global_version_path: Path | None = None,
+    only_changes: bool = False,
+    project_filter: str | None = None,
+    include_transitive: bool = True,
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    stats: DiffStats | None = None,
+    before_rev: str | None = None,
+    central: bool = False,
+    package_filter: str | Iterable[str] | PackageFilter | None = None,
+) -> Iterator[PackageDiff]:
+    """Yield typed diff records for every project with both lock files; nothing is rendered.
+
+    Takes the same arguments as print_package_diffs. Projects missing either file are skipped.
+    With only_changes, identical lock files and framework sections are skipped before
+    decoding; pass `stats` to collect how many were skipped. With `central`, each project is
+    compared against its own nearest Directory.Packages.props instead of `global_version_path`.
+    With `package_filter`, only matching packages are yielded and projects whose lock files
+    cannot mention one are skipped undecoded.
+    """
+    workspace = workspace or Workspace(
+        base_dir, project_filter=project_filter, cache=cache, workers=workers
+    )
+    global_versions = workspace.global_deps(global_version_path)
+    compiled_filter = PackageFilter.compile(package_filter)
+    project_paths = None
+    if compiled_filter:
+        before = before_file if before_rev is None else None
+        project_paths = prescan_projects(
+            workspace.project_paths, compiled_filter, after_file, before
+        )
+
+    for project_path, before_summary, after_summary in iter_project_pairs(
+        workspace,
+        before_file,
+        after_file,
+        include_transitive,
+        skip_unchanged=only_changes,
+        stats=stats,
+        before_rev=before_rev,
+        project_paths=project_paths,
+    ):
+        if before_summary is None or after_summary is None:
+            continue
+        versions = workspace.central_versions(project_path) if central else global_versions
+        diffs = diff_summaries(project_path, before_summary, after_summary, versions, only_changes)
+        if compiled_filter:
+            diffs = (d for d in diffs if compiled_filter.matches(d.name_lower))
+        yield from diffs
+
+
+def write_package_diffs(
+    diffs: Iterable[PackageDiff], stream: IO[str], format: str = "ndjson"
+) -> int:
+    """Stream diff records as NDJSON (one object per line) or as a single JSON array.
+
+    Records are written as they are produced, so memory stays flat. Returns the record count.
+    """
+    if format not in ("json", "ndjson"):
+        raise ValueError(f"unsupported format: {format}")
+
+    written = 0
+    if format == "ndjson":
+        for diff in diffs:
+            stream.write(json.dumps(diff.to_dict(), separators=(",", ":")))
+            stream.write("\n")
+            written += 1
+        return written
+
+    stream.write("[")
+    for diff in diffs:
+        stream.write(",\n  " if written else "\n  ")
+        stream.write(json.dumps(diff.to_dict()))
+        written += 1
+    stream.write("\n]\n" if written else "]\n")
+    return written
@@ -0,0 +1,291 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .instrumentation import count
+
+DEFAULT_IGNORE_DIRS: frozenset[str] = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".vs",
+        ".idea",
+        "bin",
+        "obj",
+        "node_modules",
+        "packages",
+        "TestResults",
+    }
+)
+
+_CASE_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one glob path segment (no separators) into a regex fragment."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = segment.find("]", i + 1 if i < n and segment[i] in "!]" else i)
+            if j == -1:
+                out.append(re.escape(c))
+                continue
+            body = segment[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a right-anchored path glob into a regex.
+
+    `**` matches zero or more whole path segments. Patterns starting with `/` are anchored
+    at the start of the path; all others may match any trailing run of segments.
+    """
+    anchored = pattern.startswith("/")
+    segments = [s for s in pattern.strip("/").split("/") if s]
+    parts: list[str] = []
+    for idx, segment in enumerate(segments):
+        if segment != "**":
+            parts.append(_translate_segment(segment) + "/")
+        elif idx < len(segments) - 1:
+            parts.append("(?:[^/]+/)*")
+        elif parts and parts[-1].endswith("/"):
+            # Trailing "a/**" also matches "a" itself, i.e. the whole subtree rooted at it.
+            parts[-1] = parts[-1][:-1] + "(?:/[^/]+)*"
+        else:
+            parts.append("[^/]+(?:/[^/]+)*")
+    body = "".join(parts)
+    if body.endswith("/"):
+        body = body[:-1]
+    prefix = "^/?" if anchored else "(?:^|/)"
+    return f"{prefix}{body}$"
+
+
+@dataclass(frozen=True)
+class PathFilter:
+    """Compiled form of a `;`-separated include/exclude glob filter.
+
+    Patterns starting with `!` are exclusions. Exclusions ending in `/**` also prune whole
+    subtrees during discovery so they are never entered.
+    """
+
+    includes: tuple[re.Pattern, ...] = ()
+    excludes: tuple[re.Pattern, ...] = ()
+    subtree_excludes: tuple[re.Pattern, ...] = ()
+
+    @classmethod
+    def compile(cls, filter: str | None) -> "PathFilter":
+        if not filter:
+            return cls()
+        patterns = [p.strip() for p in filter.split(";") if p.strip()]
+        includes, excludes, subtree_excludes = [], [], []
+        for pattern in patterns:
+            pattern = pattern.replace("\\", "/")
+            if pattern.startswith("!"):
+                pattern = pattern[1:]
+                excludes.append(re.compile(_translate_glob(pattern), _CASE_FLAGS))
+                stripped = pattern.rstrip("/")
+                if stripped.endswith("/**") and stripped != "/**":
+                    subtree_excludes.append(re.compile(_translate_glob(stripped[:-3]), _CASE_FLAGS))
+            else:
+                includes.append(re.compile(_translate_glob(pattern), _CASE_FLAGS))
+        return cls(tuple(includes), tuple(excludes), tuple(subtree_excludes))
+
+    def __bool__(self) -> bool:
+        return bool(self.includes or self.excludes)
+
+    def matches(self, path: Path | str) -> bool:
+        text = path.as_posix() if isinstance(path, Path) else path.replace(os.sep, "/")
+        if self.includes and not any(p.search(text) for p in self.includes):
+            return False
+        return not any(p.search(text) for p in self.excludes)
+
+    def prunes(self, dir_path: str) -> bool:
+        """Whether every path below `dir_path` is excluded."""
+        if not self.subtree_excludes:
+            return False
+        text = dir_path.replace(os.sep, "/")
+        return any(p.search(text) for p in self.subtree_excludes)
+
+
+@dataclass
+class _GitIgnoreRule:
+    regex: re.Pattern
+    negated: bool
+    dir_only: bool
+
+
+@dataclass
+class _GitIgnore:
+    """Rules from a single .gitignore, matched relative to the directory that holds it."""
+
+    root: str
+    rules: list[_GitIgnoreRule] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, dir_path: str) -> "_GitIgnore | None":
+        try:
+            with open(
+                os.path.join(dir_path, ".gitignore"), encoding="utf-8", errors="replace"
+            ) as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+
+        rules = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # Patterns containing a separator are relative to the .gitignore directory.
+            anchored = "/" in line
+            regex = _translate_glob(("/" if anchored else "") + line.lstrip("/"))
+            rules.append(_GitIgnoreRule(re.compile(regex, _CASE_FLAGS), negated, dir_only))
+        return cls(dir_path, rules) if rules else None
+
+    def ignored(self, path: str, is_dir: bool) -> bool | None:
+        """Return True/False when a rule decides, or None when no rule matches."""
+        rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+        result = None
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.search(rel):
+                result = not rule.negated
+        return result
+
+
+def _is_ignored(gitignores: tuple[_GitIgnore, ...], path: str, is_dir: bool) -> bool:
+    for gitignore in reversed(gitignores):
+        decision = gitignore.ignored(path, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+def _walk(
+    top: str,
+    file_match: Callable[[str], bool],
+    path_filter: PathFilter,
+    ignore_dirs: frozenset[str],
+    use_gitignore: bool,
+    gitignores: tuple[_GitIgnore, ...],
+) -> list[str]:
+    """Iterative os.scandir walk of `top` returning the paths of matching files."""
+    found: list[str] = []
+    stack = [(top, gitignores)]
+    visited = 0
+    while stack:
+        dir_path, inherited = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        visited += 1
+        if use_gitignore and any(e.name == ".gitignore" for e in entries):
+            if gitignore := _GitIgnore.load(dir_path):
+                inherited = (*inherited, gitignore)
+
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if name in ignore_dirs or path_filter.prunes(entry.path):
+                    continue
+                if inherited and _is_ignored(inherited, entry.path, True):
+                    continue
+                stack.append((entry.path, inherited))
+            elif file_match(name):
+                if inherited and _is_ignored(inherited, entry.path, False):
+                    continue
+                found.append(entry.path)
+    count("directories visited", visited)
+    return found
+
+
+def walk_files(
+    base_dir: Path | str,
+    file_match: Callable[[str], bool],
+    path_filter: PathFilter | None = None,
+    ignore_dirs: Iterable[str] | None = None,
+    use_gitignore: bool = True,
+    workers: int | None = None,
+) -> list[Path]:
+    """Find files below `base_dir` whose name satisfies `file_match`.
+
+    Args:
+        base_dir: Directory to search
+        file_match: Predicate called with each file name
+        path_filter: Compiled filter; only its subtree exclusions are applied here
+        ignore_dirs: Directory names never entered (default: DEFAULT_IGNORE_DIRS)
+        use_gitignore: Skip paths ignored by .gitignore files found during the walk
+        workers: Walk each top-level directory on a thread pool of this size when > 1
+    """
+    base = os.fspath(base_dir)
+    path_filter = path_filter or PathFilter()
+    ignore = DEFAULT_IGNORE_DIRS if ignore_dirs is None else frozenset(ignore_dirs)
+
+    if not workers or workers <= 1:
+        found = _walk(base, file_match, path_filter, ignore, use_gitignore, ())
+        return [Path(p) for p in found]
+
+    # Fan out: scan the base directory here, then hand each subdirectory to the pool.
+    gitignores: tuple[_GitIgnore, ...] = ()
+    if use_gitignore and (gitignore := _GitIgnore.load(base)):
+        gitignores = (gitignore,)
+
+    found = []
+    subdirs = []
+    try:
+        with os.scandir(base) as it:
+            entries = list(it)
+    except OSError:
+        return []
+    count("directories visited")
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            if entry.name in ignore or path_filter.prunes(entry.path):
+                continue
+            if not _is_ignored(gitignores, entry.path, True):
+                subdirs.append(entry.path)
+        elif file_match(entry.name) and not _is_ignored(gitignores, entry.path, False):
+            found.append(entry.path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(
+            lambda d: _walk(d, file_match, path_filter, ignore, use_gitignore, gitignores), subdirs
+        ):
+            found.extend(result)
+
+    return [Path(p) for p in found]
@@ -0,0 +1,139 @@
+import json
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Iterable
+
+from .cache import SummaryCache
+from .types import DependencyType
+from .versions import version_key
+from .workspace import Workspace
+
+
+@dataclass(frozen=True)
+class PackageDrift:
+    """Every version a package resolves to across the solution.
+
+    `versions` maps each resolved version to the (project, framework) pairs on it, both
+    sorted. `deviating` lists the pairs whose version differs from the global version that
+    applies to the project. With per-project central versions (nested props files or
+    VersionOverride), `global_version` is the one that applies to most projects.
+    """
+
+    name: str
+    name_lower: str
+    versions: dict[str, list[tuple[Path, str]]]
+    global_version: str | None = None
+    deviating: list[tuple[Path, str]] = field(default_factory=list)
+
+    @property
+    def conflict(self) -> bool:
+        """Resolved to more than one version somewhere in the solution."""
+        return len(self.versions) > 1
+
+    def projects(self, version: str) -> list[Path]:
+        return sorted({project_path for project_path, _ in self.versions.get(version, [])})
+
+    def to_dict(self) -> dict:
+        return {
+            "package": self.name,
+            "global": self.global_version,
+            "conflict": self.conflict,
+            "versions": {
+                version: [{"project": str(p), "framework": framework} for p, framework in usages]
+                for version, usages in self.versions.items()
+            },
+            "deviating": len(self.deviating),
+        }
+
+
+def compute_version_drift(
+    base_dir: Path,
+    global_version_path: Path | None = None,
+    packages_file_name: str = "packages.lock.json",
+    include_transitive: bool = True,
+    all_packages: bool = False,
+    project_filter: str | None = None,
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    central: bool = False,
+) -> list[PackageDrift]:
+    """Index package -> resolved version -> projects in one pass over every lock file.
+
+    Returns packages that resolve to more than one version or deviate from the global
+    version (every package with `all_packages`), sorted by name. Project references are
+    not packages and are left out.
+
+    Args:
+        base_dir: Base directory to search for projects
+        global_version_path: Path to global package versions file (.props or .packageset)
+        packages_file_name: Name of the lock file to read
+        include_transitive: Include transitive dependencies
+        all_packages: Also return packages on a single, non-deviating version
+        project_filter: Optional glob pattern to filter project paths
+        cache: Optional persistent cache of parsed lock files
+        workspace: Shared discovery/parse state
+        workers: Parse lock files on a process pool of this size
+        central: Compare each project against its nearest Directory.Packages.props (imports,
+                 properties and VersionOverride resolved) instead of global_version_path
+    """
+    workspace = workspace or Workspace(
+        base_dir, project_filter=project_filter, cache=cache, workers=workers
+    )
+    global_versions = workspace.global_deps(global_version_path)
+    project_paths = sorted(workspace.project_paths)
+
+    names: dict[str, str] = {}
+    index: dict[str, dict[str, list[tuple[Path, str]]]] = defaultdict(lambda: defaultdict(list))
+    expected: dict[str, Counter[str]] = defaultdict(
+        Counter
+    )  # central version -> usages it applies to
+    deviating: dict[str, list[tuple[Path, str]]] = defaultdict(list)
+    summaries = workspace.iter_summaries(
+        [p / packages_file_name for p in project_paths], include_transitive=include_transitive
+    )
+    for project_path, summary in zip(project_paths, summaries):
+        if summary is None:
+            continue
+        versions = workspace.central_versions(project_path) if central else global_versions
+        for usage in summary.usages:
+            if usage.type == DependencyType.PROJECT:
+                continue
+            name_lower = usage.name_lower
+            if name_lower not in names:
+                names[name_lower] = usage.name
+            key = (project_path, usage.framework_version)
+            index[name_lower][usage.resolved_version].append(key)
+            if global_version := versions.get(name_lower):
+                expected[name_lower][global_version] += 1
+                if usage.resolved_version != global_version:
+                    deviating[name_lower].append(key)
+
+    result = []
+    for name_lower in sorted(index):
+        by_version = index[name_lower]
+        if not all_packages and len(by_version) == 1 and not deviating.get(name_lower):
+            continue
+        most_common = expected[name_lower].most_common(1) if name_lower in expected else []
+        result.append(
+            PackageDrift(
+                name=names[name_lower],
+                name_lower=name_lower,
+                versions={
+                    version: sorted(by_version[version])
+                    for version in sorted(by_version, key=version_key)
+                },
+                global_version=most_common[0][0] if most_common else None,
+                deviating=sorted(deviating.get(name_lower, [])),
+            )
+        )
+    return result
+
+
+def write_version_drift(drifts: Iterable[PackageDrift], stream: IO[str]) -> int:
+    """Write drift records as one JSON array. Returns the record count."""
+    records = [drift.to_dict() for drift in drifts]
+    json.dump(records, stream, indent=2)
+    stream.write("\n")
+    return len(records)
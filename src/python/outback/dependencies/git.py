@@ -0,0 +1,51 @@
+import os
+import subprocess
+from pathlib import Path
+
+
+def _git(cwd: Path, *args: str, input: bytes | None = None) -> bytes:
+    result = subprocess.run(["git", *args], cwd=cwd, input=input, capture_output=True)
+    if result.returncode != 0:
+        message = result.stderr.decode(errors="replace").strip()
+        raise RuntimeError(f"git {' '.join(args)} failed in {cwd}: {message}")
+    return result.stdout
+
+
+def git_toplevel(path: Path | str) -> Path:
+    """Root of the git work tree containing `path`."""
+    return Path(_git(Path(path), "rev-parse", "--show-toplevel").decode().strip())
+
+
+def read_git_blobs(base_dir: Path | str, rev: str, paths: list[Path]) -> dict[Path, bytes | None]:
+    """Read the content of `paths` at revision `rev` with a single `git cat-file --batch` call.
+
+    Paths are working-tree paths below `base_dir`. Files that do not exist at `rev` map to None.
+    """
+    if not paths:
+        return {}
+    base = Path(base_dir)
+    toplevel = os.path.realpath(git_toplevel(base))
+    # Resolve once so that a revision name containing ":" cannot be split ambiguously per path.
+    commit = _git(base, "rev-parse", "--verify", f"{rev}^{{commit}}").decode().strip()
+
+    specs = []
+    for path in paths:
+        rel = os.path.relpath(os.path.realpath(path), toplevel).replace(os.sep, "/")
+        specs.append(f"{commit}:{rel}\n")
+    output = _git(base, "cat-file", "--batch", input="".join(specs).encode())
+
+    blobs: dict[Path, bytes | None] = {}
+    pos = 0
+    for path in paths:
+        header_end = output.index(b"\n", pos)
+        header = output[pos:header_end].split(b" ")
+        pos = header_end + 1
+        if header[-1] in (b"missing", b"ambiguous"):
+            blobs[path] = None
+            continue
+        _, object_type, size = header
+        content = output[pos : pos + int(size)]
+        pos += int(size) + 1  # content is followed by a newline
+        # A tree or commit where a file was expected counts as missing
+        blobs[path] = content if object_type == b"blob" else None
+    return blobs
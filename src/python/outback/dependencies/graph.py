@@ -0,0 +1,214 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from .types import DependencyType, PackageSummary, PackageUsage
+from .workspace import Workspace
+
+_ROOT_TYPES = (DependencyType.DIRECT, DependencyType.PROJECT)
+
+
+@dataclass(frozen=True)
+class DependencyPath:
+    """One way a project reaches a package in a target framework.
+
+    `chain` runs from a top-level reference of the project (a direct package or a referenced
+    project) down to the package itself; its last element is the package's usage.
+    """
+
+    project_path: Path
+    framework: str
+    chain: tuple[PackageUsage, ...]
+
+    @property
+    def usage(self) -> PackageUsage:
+        return self.chain[-1]
+
+    @property
+    def resolved_version(self) -> str:
+        return self.chain[-1].resolved_version
+
+
+def _project_names(project_path: Path) -> list[str]:
+    names = [p.stem.lower() for p in project_path.glob("*.csproj")]
+    return names or [project_path.name.lower()]
+
+
+def _upward_chains(
+    summary: PackageSummary, target: PackageUsage, limit: int | None
+) -> list[tuple[PackageUsage, ...]]:
+    """Chains from top-level references down to `target`, shortest first when limit == 1."""
+    framework = target.framework_version
+    dependents = summary.dependents
+
+    def parents(usage: PackageUsage) -> list[PackageUsage]:
+        return dependents.get((framework, usage.name_lower), [])
+
+    if target.type in _ROOT_TYPES or not parents(target):
+        return [(target,)]
+
+    if limit == 1:
+        # Breadth-first over packages gives the shortest chain.
+        previous: dict[str, PackageUsage | None] = {target.name_lower: None}
+        queue = deque([target])
+        while queue:
+            usage = queue.popleft()
+            if usage.type in _ROOT_TYPES or (
+                usage.name_lower != target.name_lower and not parents(usage)
+            ):
+                chain = [usage]
+                while (child := previous[chain[-1].name_lower]) is not None:
+                    chain.append(child)
+                return [tuple(chain)]
+            for parent in parents(usage):
+                if parent.name_lower not in previous:
+                    previous[parent.name_lower] = usage
+                    queue.append(parent)
+        return [(target,)]
+
+    chains: list[tuple[PackageUsage, ...]] = []
+    on_path: set[str] = set()
+
+    def walk(usage: PackageUsage, below: tuple[PackageUsage, ...]) -> None:
+        if limit is not None and len(chains) >= limit:
+            return
+        chain = (usage, *below)
+        upward = [p for p in parents(usage) if p.name_lower not in on_path]
+        if usage.type in _ROOT_TYPES or not upward:
+            chains.append(chain)
+            return
+        on_path.add(usage.name_lower)
+        for parent in upward:
+            walk(parent, chain)
+        on_path.discard(usage.name_lower)
+
+    walk(target, ())
+    chains.sort(key=len)
+    return chains
+
+
+class SolutionGraph:
+    """Solution-wide dependency graph built once from every discovered lock file.
+
+    Holds an inverted index from each package to the projects (and usages) that resolve it,
+    and project-to-project edges taken from `Project` entries, so "why is this package here"
+    questions are answered without re-reading lock files.
+
+    Usage:
+        graph = SolutionGraph.build(base_dir)
+        for path in graph.why("Newtonsoft.Json"):
+            print(path.project_path, path.framework, [u.name for u in path.chain])
+    """
+
+    def __init__(self, summaries: dict[Path, PackageSummary]):
+        self.summaries = summaries
+        self._packages: dict[str, dict[Path, list[PackageUsage]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self._projects_by_name: dict[str, Path] = {}
+        self._references: dict[Path, set[Path]] = defaultdict(set)
+        self._referenced_by: dict[Path, set[Path]] = defaultdict(set)
+
+        for project_path in summaries:
+            for name in _project_names(project_path):
+                self._projects_by_name.setdefault(name, project_path)
+
+        for project_path, summary in summaries.items():
+            for usage in summary.usages:
+                if usage.type != DependencyType.PROJECT:
+                    self._packages[usage.name_lower][project_path].append(usage)
+                elif (referenced := self._projects_by_name.get(usage.name_lower)) is not None:
+                    self._references[project_path].add(referenced)
+                    self._referenced_by[referenced].add(project_path)
+
+    @classmethod
+    def build(
+        cls,
+        base_dir: Path | str,
+        packages_file_name: str = "packages.lock.json",
+        project_filter: str | None = None,
+        workspace: Workspace | None = None,
+        workers: int | None = None,
+    ) -> "SolutionGraph":
+        """Discover projects and parse every lock file, including transitive dependencies."""
+        workspace = workspace or Workspace(base_dir, project_filter=project_filter, workers=workers)
+        project_paths = workspace.project_paths
+        summaries = workspace.iter_summaries(
+            [p / packages_file_name for p in project_paths], include_transitive=True
+        )
+        return cls({p: s for p, s in zip(project_paths, summaries) if s is not None})
+
+    def project(self, project: Path | str) -> Path:
+        """Resolve a project directory or project name to the project's path."""
+        if isinstance(project, Path) and project in self.summaries:
+            return project
+        if (path := self._projects_by_name.get(str(project).lower())) is not None:
+            return path
+        candidate = Path(project)
+        for path in self.summaries:
+            if path == candidate or path.resolve() == candidate.resolve():
+                return path
+        raise KeyError(f"unknown project: {project}")
+
+    def packages(self) -> list[str]:
+        """All package names (lowercase) referenced anywhere in the solution."""
+        return sorted(self._packages)
+
+    def projects_using(self, package: str) -> list[Path]:
+        return sorted(self._packages.get(package.lower(), {}))
+
+    def versions(self, package: str) -> dict[str, list[Path]]:
+        """Resolved version -> projects resolving the package to it."""
+        result: dict[str, set[Path]] = defaultdict(set)
+        for project_path, usages in self._packages.get(package.lower(), {}).items():
+            for usage in usages:
+                result[usage.resolved_version].add(project_path)
+        return {version: sorted(paths) for version, paths in sorted(result.items())}
+
+    def why(self, package: str, framework: str | None = None) -> list[DependencyPath]:
+        """Shortest chain by which each project (and framework) pulls in `package`."""
+        result = []
+        for project_path, usages in sorted(self._packages.get(package.lower(), {}).items()):
+            summary = self.summaries[project_path]
+            for usage in usages:
+                if framework is not None and usage.framework_version != framework:
+                    continue
+                for chain in _upward_chains(summary, usage, limit=1):
+                    result.append(DependencyPath(project_path, usage.framework_version, chain))
+        return result
+
+    def paths(
+        self,
+        project: Path | str,
+        package: str,
+        framework: str | None = None,
+        limit: int | None = 100,
+    ) -> list[DependencyPath]:
+        """Every chain (up to `limit` per framework) from `project`'s references to `package`."""
+        project_path = self.project(project)
+        summary = self.summaries[project_path]
+        result = []
+        for usage in self._packages.get(package.lower(), {}).get(project_path, []):
+            if framework is not None and usage.framework_version != framework:
+                continue
+            for chain in _upward_chains(summary, usage, limit=limit):
+                result.append(DependencyPath(project_path, usage.framework_version, chain))
+        return result
+
+    def references(self, project: Path | str) -> list[Path]:
+        """Projects referenced directly by `project`."""
+        return sorted(self._references.get(self.project(project), ()))
+
+    def dependents(self, project: Path | str, transitive: bool = True) -> list[Path]:
+        """Projects that reference `project`, directly or (by default) through other projects."""
+        start = self.project(project)
+        if not transitive:
+            return sorted(self._referenced_by.get(start, ()))
+        seen: set[Path] = set()
+        queue = deque([start])
+        while queue:
+            for dependent in self._referenced_by.get(queue.popleft(), ()):
+                if dependent not in seen and dependent != start:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return sorted(seen)
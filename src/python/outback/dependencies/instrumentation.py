@@ -0,0 +1,145 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import IO, ContextManager, Iterator
+
+# Profiler collecting phases and counters, or None when profiling is off. Instrumented code
+# only pays for this module-level lookup while disabled.
+_active: "Profiler | None" = None
+_DISABLED = nullcontext()
+
+
+class Profiler:
+    """Per-phase wall/CPU time and named counters for one run.
+
+    Phase times are exclusive: time spent in a nested phase (e.g. parsing a lock file while a
+    tree is being rendered lazily) is attributed to the inner phase only. Work done on worker
+    processes is not seen; phases and counters of worker threads are.
+
+    Usage:
+        with profiling() as profiler:
+            print_project_summary(base_dir)
+        print_profile(profiler)
+    """
+
+    def __init__(self) -> None:
+        self.wall: dict[str, float] = {}
+        self.cpu: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self.total_wall = 0.0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stack = self._local.__dict__.setdefault("stack", [])
+        frame = [0.0, 0.0]  # wall and CPU time of nested phases
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            with self._lock:
+                self.wall[name] = self.wall.get(name, 0.0) + wall - frame[0]
+                self.cpu[name] = self.cpu.get(name, 0.0) + cpu - frame[1]
+                self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_seconds": self.total_wall,
+            "phases": {
+                name: {
+                    "wall_seconds": self.wall[name],
+                    "cpu_seconds": self.cpu[name],
+                    "calls": self.calls[name],
+                }
+                for name in self.wall
+            },
+            "counters": dict(self.counters),
+        }
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Context manager timing `name` when profiling is on; a shared no-op otherwise."""
+    return _DISABLED if _active is None else _active.phase(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    if _active is not None:
+        _active.count(name, n)
+
+
+@contextmanager
+def profiling(enabled: bool = True) -> Iterator[Profiler | None]:
+    """Collect phases and counters for the duration of the block."""
+    global _active
+    if not enabled:
+        yield None
+        return
+    previous, _active = _active, Profiler()
+    profiler = _active
+    try:
+        yield profiler
+    finally:
+        profiler.total_wall = time.perf_counter() - profiler._started
+        _active = previous
+
+
+def print_profile(
+    profiler: Profiler, format: str = "summary", stream: IO[str] | None = None
+) -> None:
+    """Print a profile as a table ("summary") or as JSON; to stderr unless `stream` is given."""
+    if format == "json":
+        print(json.dumps(profiler.to_dict(), indent=2), file=stream or sys.stderr)
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console(file=stream, stderr=stream is None)
+    table = Table(title=f"Profile ({profiler.total_wall:.3f}s wall)", title_justify="left")
+    table.add_column("Phase")
+    table.add_column("Wall", justify="right")
+    table.add_column("CPU", justify="right")
+    table.add_column("Share", justify="right")
+    table.add_column("Calls", justify="right")
+    for name in sorted(profiler.wall, key=profiler.wall.__getitem__, reverse=True):
+        share = profiler.wall[name] / profiler.total_wall if profiler.total_wall else 0.0
+        table.add_row(
+            name,
+            f"{profiler.wall[name]:.3f}s",
+            f"{profiler.cpu[name]:.3f}s",
+            f"{share:.0%}",
+            str(profiler.calls[name]),
+        )
+    if profiler.total_wall:
+        other = max(profiler.total_wall - sum(profiler.wall.values()), 0.0)
+        share = other / profiler.total_wall
+        table.add_row(
+            "[dim](outside phases)[/dim]",
+            f"[dim]{other:.3f}s[/dim]",
+            "",
+            f"[dim]{share:.0%}[/dim]",
+            "",
+        )
+    console.print(table)
+
+    counters = Table(title="Counters", title_justify="left")
+    counters.add_column("Counter")
+    counters.add_column("Value", justify="right")
+    for name, value in sorted(profiler.counters.items()):
+        counters.add_row(name, f"{value:,}")
+    console.print(counters)
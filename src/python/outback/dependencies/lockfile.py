@@ -0,0 +1,142 @@
+import codecs
+import json
+import os
+import re
+from pathlib import Path
+from typing import IO, Any, Callable, Collection, Iterator
+
+# Files up to this size are decoded with one json.loads, which is faster than walking them
+STREAM_THRESHOLD = 4 * 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _JsonStream:
+    """Incremental JSON reader over a text buffer refilled from a binary file.
+
+    Structure (objects and their keys) is walked event by event; leaf values, such as one
+    lock-file entry, are decoded whole with the C scanner (`raw_decode`). Only the unread
+    tail of the buffer is kept, so memory stays proportional to the chunk size plus the
+    largest single value decoded.
+    """
+
+    def __init__(self, f: IO[bytes], chunk_size: int = CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False once the file is exhausted."""
+        if self._eof:
+            return False
+        data = self._f.read(self._chunk_size)
+        self.bytes_read += len(data)
+        self._eof = not data
+        text = self._decoder.decode(data, final=self._eof)
+        self._buf = self._buf[self._pos :] + text
+        self._pos = 0
+        return bool(data or text)
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at end of input)."""
+        while True:
+            # The pattern matches the empty string, so there is always a match
+            self._pos = _WHITESPACE_RE.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if (found := self._peek()) != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}, found {found!r}", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof or not self._fill():
+                    raise
+                continue
+            # A number or literal ending at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def skip(self) -> None:
+        """Consume the next value; an object is decoded and dropped one member at a time."""
+        if self._peek() == "{":
+            for _ in self.members():
+                self.value()
+        else:
+            self.value()
+
+    def members(self) -> Iterator[str]:
+        """Yield the keys of the next object; the caller consumes each member's value in turn."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            return
+
+
+def iter_lock_entries(
+    packages_file_path: Path | str,
+    frameworks: Collection[str] | None = None,
+    keep: Callable[[str, dict], bool] | None = None,
+    stream_threshold: int = STREAM_THRESHOLD,
+) -> Iterator[tuple[str, str, dict]]:
+    """Yield (framework, package name, entry) for the `dependencies` of a lock file, in file order.
+
+    Files larger than `stream_threshold` are read incrementally: frameworks not in
+    `frameworks` are skipped entry by entry, and entries rejected by `keep(name, entry)` are
+    dropped as soon as they are decoded, so peak memory follows what is kept rather than the
+    file size. Smaller files are decoded in one go and filtered the same way.
+
+    Args:
+        packages_file_path: packages.lock.json to read
+        frameworks: Only these lock-file framework keys (e.g. "net8.0"); None for all
+        keep: Predicate on (name, entry); None keeps every entry
+        stream_threshold: Size in bytes above which the file is streamed
+    """
+    with open(packages_file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= stream_threshold:
+            for framework, deps in json.loads(f.read()).get("dependencies", {}).items():
+                if frameworks is None or framework in frameworks:
+                    for name, entry in deps.items():
+                        if keep is None or keep(name, entry):
+                            yield framework, name, entry
+            return
+
+        stream = _JsonStream(f)
+        for key in stream.members():
+            if key != "dependencies":
+                stream.skip()
+                continue
+            for framework in stream.members():
+                if frameworks is not None and framework not in frameworks:
+                    stream.skip()
+                    continue
+                for name in stream.members():
+                    entry = stream.value()
+                    if keep is None or keep(name, entry):
+                        yield framework, name, entry
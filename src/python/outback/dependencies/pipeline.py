@@ -0,0 +1,286 @@
+import asyncio
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+
+from .central import CentralPackageResolver
+from .diff import DiffStats, PackageDiff, _read_bytes, _unchanged_fast_path, diff_summaries
+from .git import read_git_blobs
+from .lockfile import STREAM_THRESHOLD
+from .query import PackageFilter, prescan_projects
+from .types import PackageStore, PackageSummary
+from .utils import _package_summary, _summary_from_bytes, find_project_paths, load_global_deps
+
+# End-of-stream marker passed down the queues, one per consuming worker
+_DONE = object()
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+@dataclass(frozen=True)
+class ProjectAnalysis:
+    """Diff of one project's before and after lock files, as yielded by analyze_projects.
+
+    `unchanged` is set when both lock files are byte-identical and were not decoded (only
+    with only_changes); `diffs` is then empty.
+    """
+
+    project_path: Path
+    diffs: tuple[PackageDiff, ...]
+    unchanged: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return any(d.changed for d in self.diffs)
+
+    def to_dict(self) -> dict:
+        return {
+            "project": str(self.project_path),
+            "changed": self.changed,
+            "diffs": [d.to_dict() for d in self.diffs],
+        }
+
+
+@dataclass
+class _Loaded:
+    """Lock-file content of one project, between the read and parse stages.
+
+    Each side holds the file's bytes, or its path when it is large enough to be streamed by
+    _package_summary instead of being held in a queue.
+    """
+
+    project_path: Path
+    before_path: Path
+    after_path: Path
+    before: bytes | Path
+    after: bytes | Path
+
+
+@dataclass
+class _Failed:
+    error: BaseException
+
+
+def _load(path: Path) -> bytes | Path | None:
+    """Content of a lock file, its path when over STREAM_THRESHOLD, or None when unreadable."""
+    try:
+        if os.path.getsize(path) > STREAM_THRESHOLD:
+            return path
+    except OSError:
+        return None
+    return _read_bytes(path)
+
+
+def _summary(
+    path: Path, content: bytes | Path, include_transitive: bool, store: PackageStore
+) -> PackageSummary:
+    if isinstance(content, Path):
+        return _package_summary(content, include_transitive=include_transitive, store=store)
+    return _summary_from_bytes(path, content, include_transitive=include_transitive, store=store)
+
+
+def _analyze(
+    loaded: _Loaded,
+    versions: dict[str, str],
+    include_transitive: bool,
+    only_changes: bool,
+    package_filter: PackageFilter | None,
+    stats: DiffStats,
+) -> ProjectAnalysis:
+    """Parse and diff one project; runs on a worker thread with a store of its own."""
+    store = PackageStore()
+    fast: tuple[PackageSummary, PackageSummary] | bool | None = None
+    if only_changes and isinstance(loaded.before, bytes) and isinstance(loaded.after, bytes):
+        fast = _unchanged_fast_path(
+            loaded.before_path,
+            loaded.after_path,
+            loaded.before,
+            loaded.after,
+            include_transitive,
+            store,
+            stats,
+        )
+    if fast is False:
+        return ProjectAnalysis(loaded.project_path, (), unchanged=True)
+    if isinstance(fast, tuple):
+        before, after = fast
+    else:
+        before = _summary(loaded.before_path, loaded.before, include_transitive, store)
+        after = _summary(loaded.after_path, loaded.after, include_transitive, store)
+
+    diffs: Iterable[PackageDiff] = diff_summaries(
+        loaded.project_path, before, after, versions, only_changes
+    )
+    if package_filter:
+        diffs = (d for d in diffs if package_filter.matches(d.name_lower))
+    return ProjectAnalysis(loaded.project_path, tuple(diffs))
+
+
+async def _stage(
+    source: asyncio.Queue,
+    sink: asyncio.Queue,
+    handle: Callable[[_T], Awaitable[_R | None]],
+    workers: int,
+    downstream: int,
+) -> None:
+    """Run `workers` consumers of `source`, putting each non-None result of `handle` into `sink`.
+
+    Each worker stops at its own end marker; when the last one has, `downstream` markers are
+    passed on so that every worker of the next stage stops too.
+    """
+
+    async def work() -> None:
+        while (item := await source.get()) is not _DONE:
+            if (result := await handle(item)) is not None:
+                await sink.put(result)
+
+    await asyncio.gather(*(work() for _ in range(workers)))
+    for _ in range(downstream):
+        await sink.put(_DONE)
+
+
+async def analyze_projects(
+    base_dir: Path | str,
+    before_file: str = "packages.before.lock.json",
+    after_file: str = "packages.lock.json",
+    global_version_path: Path | None = None,
+    only_changes: bool = False,
+    project_filter: str | None = None,
+    include_transitive: bool = True,
+    before_rev: str | None = None,
+    central: bool = False,
+    package_filter: str | Iterable[str] | None = None,
+    project_paths: Iterable[Path] | None = None,
+    stats: DiffStats | None = None,
+    readers: int = 4,
+    parsers: int = 2,
+    max_pending: int = 16,
+) -> AsyncIterator[ProjectAnalysis]:
+    """Diff every project with both lock files without blocking the event loop.
+
+    Async counterpart of compute_package_diffs for services: results are grouped per project
+    and nothing is printed. Discovery, reading and parsing are pipeline stages joined by
+    queues of at most `max_pending` items; blocking work runs on threads through
+    asyncio.to_thread. A slow consumer therefore holds back reading instead of letting parsed
+    projects pile up, and at most about 3 * max_pending lock files are in memory at once.
+    Projects are yielded as they complete, not in path order.
+
+    Leaving the `async for` early, or cancelling the task iterating it, cancels every stage;
+    reads already running on a thread finish in the background and are discarded. The first
+    error raised by a stage is re-raised to the caller. Each call keeps its own state, so
+    several repositories can be analyzed concurrently on one loop.
+
+    Usage:
+        async for result in analyze_projects(repo, before_rev="origin/main", only_changes=True):
+            report(result.to_dict())
+
+    Args:
+        base_dir: Base directory to search for projects
+        before_file: Baseline lock file name, ignored when `before_rev` is given
+        after_file: Current lock file name
+        global_version_path: Directory.Packages.props or .packageset with global versions
+        only_changes: Leave unchanged packages out; identical lock files are not decoded
+        project_filter: Glob pattern(s) to filter project paths, as for find_project_paths
+        include_transitive: Whether to include transitive dependencies
+        before_rev: Compare against `after_file` at this git revision instead of `before_file`
+        central: Compare each project against its own nearest Directory.Packages.props
+        package_filter: Package-name globs; only matching packages are reported
+        project_paths: Projects to analyze instead of discovering them under `base_dir`
+        stats: Collects how many projects and frameworks the unchanged fast path skipped
+        readers: Concurrent lock-file reads
+        parsers: Concurrent parse-and-diff jobs
+        max_pending: Capacity of each queue between stages
+    """
+    base_dir = Path(base_dir)
+    stats = stats if stats is not None else DiffStats()
+    compiled_filter = PackageFilter.compile(package_filter)
+    resolver = CentralPackageResolver() if central else None
+    # The resolver memoizes evaluated props files and is shared by the parser threads
+    resolver_lock = threading.Lock()
+
+    paths: asyncio.Queue = asyncio.Queue(max_pending)
+    loaded: asyncio.Queue = asyncio.Queue(max_pending)
+    results: asyncio.Queue = asyncio.Queue(max_pending)
+    blobs: dict[Path, bytes | None] = {}
+    global_versions: dict[str, str] = {}
+
+    async def discover() -> None:
+        nonlocal blobs, global_versions
+        global_versions = await asyncio.to_thread(load_global_deps, global_version_path)
+        if project_paths is None:
+            candidates = sorted(
+                await asyncio.to_thread(find_project_paths, base_dir, project_filter)
+            )
+        else:
+            candidates = sorted(project_paths)
+        if compiled_filter:
+            before = before_file if before_rev is None else None
+            candidates = await asyncio.to_thread(
+                prescan_projects, candidates, compiled_filter, after_file, before
+            )
+        if before_rev is not None:
+            # All baseline files come from one batched git call, as in iter_project_pairs
+            after_paths = [p / after_file for p in candidates]
+            blobs = await asyncio.to_thread(read_git_blobs, base_dir, before_rev, after_paths)
+        for project_path in candidates:
+            await paths.put(project_path)
+        for _ in range(readers):
+            await paths.put(_DONE)
+
+    def read(project_path: Path) -> _Loaded | None:
+        after_path = project_path / after_file
+        before: bytes | Path | None
+        if before_rev is not None:
+            before_path, before = after_path, blobs.get(after_path)
+        else:
+            before_path = project_path / before_file
+            before = _load(before_path)
+        if before is None or (after := _load(after_path)) is None:
+            return None
+        return _Loaded(project_path, before_path, after_path, before, after)
+
+    def parse(item: _Loaded) -> tuple[ProjectAnalysis, DiffStats]:
+        versions = global_versions
+        if resolver is not None:
+            with resolver_lock:
+                versions = resolver.project_versions(item.project_path)
+        local_stats = DiffStats()
+        return _analyze(
+            item, versions, include_transitive, only_changes, compiled_filter, local_stats
+        ), local_stats
+
+    # Stats are only updated here, on the event loop thread, never from two threads at once
+    async def read_item(project_path: Path) -> _Loaded | None:
+        if item := await asyncio.to_thread(read, project_path):
+            stats.projects_compared += 1
+        return item
+
+    async def parse_item(item: _Loaded) -> ProjectAnalysis:
+        result, local_stats = await asyncio.to_thread(parse, item)
+        stats.projects_skipped += local_stats.projects_skipped
+        stats.frameworks_skipped += local_stats.frameworks_skipped
+        return result
+
+    async def forward_errors(stage: Awaitable[None]) -> None:
+        try:
+            await stage
+        except Exception as error:
+            await results.put(_Failed(error))
+
+    tasks = [
+        asyncio.ensure_future(forward_errors(discover())),
+        asyncio.ensure_future(forward_errors(_stage(paths, loaded, read_item, readers, parsers))),
+        asyncio.ensure_future(forward_errors(_stage(loaded, results, parse_item, parsers, 1))),
+    ]
+    try:
+        while (item := await results.get()) is not _DONE:
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
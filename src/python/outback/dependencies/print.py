@@ -1,157 +1,133 @@
-import json
-import re
+import os
+from itertools import groupby
 from pathlib import Path
-
-import rich
-from rich.table import Table
-from rich.tree import Tree
+from typing import Generic, Iterable, Iterator
 
 from outback.dependencies.types import DependencyType, PackageSummary, PackageUsage
 
-from .utils import (
-    find_project_paths,
-    load_global_deps,
-    parse_framework_version,
+from .cache import SummaryCache
+from .central import PROPS_FILE_NAME
+from .diff import DiffStats, diff_summaries, iter_project_pairs
+from .drift import compute_version_drift
+from .git import git_toplevel
+from .graph import SolutionGraph
+from .instrumentation import count, phase
+from .query import PackageFilter, prescan_projects
+from .render import (  # noqa: F401
+    Budget,
+    H,
+    PlainRenderer,
+    Renderer,
+    RichRenderer,
+    _capitalize_name,
+    _package_color,
 )
+from .utils import _package_summary  # noqa: F401 - re-exported for existing callers
+from .workspace import Workspace
 
-type_map = {
-    "Direct": DependencyType.DIRECT,
-    "Transitive": DependencyType.TRANSITIVE,
-    "CentralTransitive": DependencyType.CENTRAL_TRANSITIVE,
-    "Project": DependencyType.PROJECT,
-}
-
-
-def _capitalize_name(name: str) -> str:
-    return re.sub(r"(?:^|(?<=\.))(.)(?=\w)", lambda m: m.group(1).upper(), name)
-
-
-def _package_summary(packages_file_path: Path, include_transitive: bool = False) -> PackageSummary:
-    """
-    Analyze package usage across multiple .NET projects.
-
-    Args:
-        base_dir: Base directory to search for projects
-        package_filename: Name of the lock file to parse (default: packages.lock.json)
-        include_transitive: Whether to include transitive dependencies (default: True)
-        project_filter: Optional regex pattern to filter project paths
-
-    Returns:
-        PackageSummary: Strongly-typed model containing:
-            - usages: List of all PackageUsage instances
-            - project_lookup: Dict mapping project paths to their package usages
-            - package_lookup: Dict mapping package names to their usages across projects
-    """
-    usages: list[PackageUsage] = []
-
-    with open(packages_file_path) as f:
-        package_json = json.load(f)
-
-    # Iterate through all frameworks
-    for framework, deps in package_json.get("dependencies", {}).items():
-        parsed_framework = parse_framework_version(framework)
-        for dep_name, dep_info in deps.items():
-            dep_type_str = dep_info.get("type", "Unknown")
-            dep_type = type_map.get(dep_type_str, DependencyType.UNKNOWN)
-
-            if not include_transitive and dep_type == DependencyType.TRANSITIVE:
-                continue
-
-            dep_name_lower = dep_name.lower()
-            requested_version = dep_info.get("requested", "")
-            resolved_version = dep_info.get("resolved", "")
-            nested_deps = dep_info.get("dependencies", {})
-
-            usage = PackageUsage(
-                name_lower=dep_name_lower,
-                name=dep_name,
-                type=dep_type,
-                framework_version=parsed_framework,
-                requested_version=requested_version,
-                resolved_version=resolved_version,
-                dependencies=nested_deps if nested_deps else None,
-            )
-
-            usages.append(usage)
-
-    return PackageSummary(project_path=packages_file_path, packages_file_path=packages_file_path, usages=usages)
 
+class _DependencyTreeBuilder(Generic[H]):
+    """Adds nested dependency nodes for one (project, framework) through a renderer.
 
-def _print_projects_add_package(
-    parent_node,
-    summary: PackageSummary,
-    usage: PackageUsage,
-    badge_map: dict,
-    framework: str,
-    max_name_length: int,
-    visited: set[str] | None = None,
-    indent_level: int = 0,
-    include_transitive: bool = False,
-):
-    """
-    Recursively add package nodes with their dependencies.
+    Package names are resolved through the summary's framework index. Each package's subtree
+    is expanded in full only once; later occurrences are collapsed to a "(see above)"
+    reference, so diamond-shaped graphs render in time linear in their edges. A subtree that
+    showed no children, or was cut by max_depth or a node limit, is not referred to.
 
     Args:
-        parent_node: The parent tree node to add to
-        usage: The PackageUsage to display
+        summary: Parsed lock file of the project
+        framework: Framework version being rendered
+        renderer: Output backend the nodes are added to
         max_name_length: Maximum package name length for formatting
-        badge_map: Mapping of DependencyType to badge strings
-        package_lookup: Lookup dict to find dependency details
-        framework: Current framework version
-        visited: Set of visited package names to prevent cycles
-        indent_level: Current indentation level for formatting
+        include_transitive: Show dependencies that have no entry in the lock file
+        max_depth: Do not expand dependencies deeper than this (top level is depth 0)
+        max_nodes: Stop adding nodes to this framework's tree after this many
+        package_filter: Summary is filtered; dependencies it does not hold are left out unless
+                        they match
+        project_budget: Node budget shared by every framework of the project
     """
-    if visited is None:
-        visited = set()
 
-    # Prevent infinite loops
-    if usage.name_lower in visited:
-        return
-    visited.add(usage.name_lower)
-
-    color = (
-        "green"
-        if usage.type == DependencyType.DIRECT
-        else "yellow"
-        if usage.type == DependencyType.CENTRAL_TRANSITIVE
-        else "white"
-        if usage.type == DependencyType.PROJECT
-        else "dim"
-        if usage.type == DependencyType.TRANSITIVE
-        else "red"
-    )
-    badge = badge_map[usage.type]
-    name_display = _capitalize_name(usage.name)
-    padding = (max_name_length + 1) - (indent_level * 4)
-    pkg_label = f"[{color}]{badge}[/{color}] {name_display:<{padding}} {usage.resolved_version}"
-    pkg_node = parent_node.add(pkg_label)
-
-    # Add nested dependencies if they exist
-    if usage.dependencies:
+    def __init__(
+        self,
+        summary: PackageSummary,
+        framework: str,
+        renderer: Renderer[H],
+        max_name_length: int,
+        include_transitive: bool = False,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+        package_filter: PackageFilter | None = None,
+        project_budget: Budget | None = None,
+    ) -> None:
+        self.summary = summary
+        self.framework = framework
+        self.renderer = renderer
+        self.max_name_length = max_name_length
+        self.include_transitive = include_transitive
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.package_filter = package_filter
+        self.project_budget = project_budget or Budget()
+        self.node_count = 0
+        self.truncated = False
+        self._expanded: set[str] = set()
+        self._depth_cuts = 0
+        self._ancestors: set[str] = set()
+
+    def _reserve_node(self, parent_node: H) -> bool:
+        if self.truncated:
+            return False
+        if self.max_nodes is not None and self.node_count >= self.max_nodes:
+            self.renderer.add_note(parent_node, f"… truncated after {self.max_nodes} nodes")
+            self.truncated = True
+            return False
+        if not self.project_budget.take():
+            self.renderer.add_note(
+                parent_node, f"… project truncated after {self.project_budget.limit} nodes"
+            )
+            self.truncated = True
+            return False
+        self.node_count += 1
+        return True
+
+    def add(self, parent_node: H, usage: PackageUsage, depth: int = 0) -> None:
+        # Prevent infinite loops
+        if usage.name_lower in self._ancestors or not self._reserve_node(parent_node):
+            return
+
+        padding = max((self.max_name_length + 1) - (depth * 4), 0)
+        if not usage.dependencies:
+            self.renderer.add_package(parent_node, usage, padding)
+            return
+        if usage.name_lower in self._expanded:
+            self.renderer.add_package(parent_node, usage, padding, see_above=True)
+            return
+        pkg_node = self.renderer.add_package(parent_node, usage, padding)
+        if self.max_depth is not None and depth >= self.max_depth:
+            self.renderer.add_note(pkg_node, "…")
+            self._depth_cuts += 1
+            return
+
+        nodes_before, cuts_before = self.node_count, self._depth_cuts
+        self._ancestors.add(usage.name_lower)
         for dep_name, dep_version in sorted(usage.dependencies.items()):
-            dep_name_lower = dep_name.lower()
-            dep_usages = summary.lookup.get(dep_name_lower, [])
-            matching_usage = next((u for u in dep_usages if u.framework_version == framework), None)
-
-            # If no exact framework match, try any usage from this package
-            if not matching_usage and dep_usages:
-                matching_usage = dep_usages[0]
-
-            if matching_usage:
-                # Recursively add the dependency and its dependencies
-                _print_projects_add_package(
-                    pkg_node,
-                    summary,
-                    matching_usage,
-                    badge_map,
-                    framework,
-                    max_name_length,
-                    visited.copy(),  # Copy to allow different branches to revisit packages
-                    indent_level + 1,
-                )
-            elif include_transitive:
+            if matching_usage := self.summary.resolve(self.framework, dep_name.lower()):
+                self.add(pkg_node, matching_usage, depth + 1)
+            elif (
+                self.include_transitive
+                and (self.package_filter is None or self.package_filter.matches(dep_name))
+                and self._reserve_node(pkg_node)
+            ):
                 # Dependency not found in package lookup - show as transitive
-                pkg_node.add(f"[cyan][T ][/cyan] [dim]{_capitalize_name(dep_name)} {dep_version}[/dim]")
+                self.renderer.add_unresolved(pkg_node, dep_name, dep_version)
+        self._ancestors.discard(usage.name_lower)
+        # Only a complete, non-empty subtree can be referred to as "(see above)"
+        if (
+            self.node_count > nodes_before
+            and self._depth_cuts == cuts_before
+            and not self.truncated
+        ):
+            self._expanded.add(usage.name_lower)
 
 
 def print_projects(
@@ -160,7 +136,15 @@ def print_projects(
     include_transitive: bool = False,
     project_filter: str | None = None,
     nested: bool = True,
-):
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    package_filter: str | Iterable[str] | PackageFilter | None = None,
+    max_project_nodes: int | None = None,
+    renderer: Renderer | None = None,
+) -> None:
     """
     Display dependency graph showing project -> package relationships with nested dependencies.
 
@@ -168,92 +152,117 @@ def print_projects(
         base_directory: Base directory to search for projects
         project_filter: Optional glob pattern to filter project paths (e.g., "*/Transformation.*/*")
         nested: Show nested dependencies (True) or flat list (False)
+        cache: Optional persistent cache of parsed lock files
+        workspace: Shared discovery/parse state; its own project filter and cache take precedence
+        workers: Parse lock files on a process pool of this size (output order is unchanged)
+        max_depth: Maximum nesting depth of dependencies shown under each top-level package
+        max_nodes: Maximum number of package nodes per framework in nested mode
+        package_filter: Package name glob(s) (`;`-separated string or list). Only projects using a
+                        matching package are shown, with only the dependency chains that reach it;
+                        lock files are prescanned and skipped undecoded when they cannot match
+        max_project_nodes: Maximum number of package nodes per project, across its frameworks
+        renderer: Output backend (default: RichRenderer; PlainRenderer streams unstyled text)
     """
-    project_paths = find_project_paths(base_dir, project_filter=project_filter)
-
-    badge_map = {
-        DependencyType.DIRECT: "[D]",
-        DependencyType.CENTRAL_TRANSITIVE: "[C]",
-        DependencyType.TRANSITIVE: "[T]",
-        DependencyType.PROJECT: "[P]",
-        DependencyType.UNKNOWN: "[?]",
-    }
+    workspace = workspace or Workspace(
+        base_dir, project_filter=project_filter, cache=cache, workers=workers
+    )
+    project_paths = sorted(workspace.project_paths)
+    compiled_filter = PackageFilter.compile(package_filter)
+    renderer = renderer or RichRenderer()
+
+    packages_file_paths = [project_path / packages_file_name for project_path in project_paths]
+    summaries: Iterator[PackageSummary | None]
+    if compiled_filter:
+        summaries = (
+            workspace.filtered_summary(p, compiled_filter) if p.exists() else None
+            for p in packages_file_paths
+        )
+    else:
+        summaries = workspace.iter_summaries(
+            packages_file_paths, include_transitive=include_transitive
+        )
 
     # Use project_lookup directly - already grouped by project
-    for project_path in sorted(project_paths):
-        packages_path = project_path / packages_file_name
-        if not packages_path.exists():
-            print(f"packages not found: {packages_path}")
+    for project_path, packages_file_path, summary in zip(
+        project_paths, packages_file_paths, summaries
+    ):
+        if summary is None:
+            if not compiled_filter or not packages_file_path.exists():
+                renderer.message(f"packages not found: {packages_file_path}")
             continue
 
-        summary = _package_summary(packages_path, include_transitive=include_transitive)
-        usages = summary.usages
-
-        # Create a new tree for each project
-        tree = Tree(f"[cyan]Project Dependencies[/cyan] - {project_path}")
-        project_node = tree
-
-        # Group by framework
-        framework_groups: dict[str, list[PackageUsage]] = {}
-        for usage in usages:
-            if usage.framework_version not in framework_groups:
-                framework_groups[usage.framework_version] = []
-            framework_groups[usage.framework_version].append(usage)
-
-        for framework in sorted(framework_groups.keys()):
-            framework_node = project_node.add(f"{framework}")
-            packages = framework_groups[framework]
-
-            # Calculate max package name length for this framework
-            max_name_length = max((len(_capitalize_name(p.name)) for p in packages), default=0)
-
-            if nested:
-                # Show nested dependencies
-                top_level_packages = [p for p in packages if p.type in (DependencyType.DIRECT, DependencyType.PROJECT)]
-                for usage in sorted(top_level_packages, key=lambda x: x.name_lower):
-                    _print_projects_add_package(
-                        framework_node,
+        by_framework = summary.by_framework
+        if compiled_filter and not nested:
+            # Flat lists show the matches themselves, not the chains that reach them. The filtered
+            # summary keeps transitive entries, which a flat list only shows with
+            # include_transitive.
+            by_framework = {
+                framework: matches
+                for framework, packages in by_framework.items()
+                if (
+                    matches := [
+                        p
+                        for p in packages
+                        if compiled_filter.matches(p.name_lower)
+                        and (include_transitive or p.type != DependencyType.TRANSITIVE)
+                    ]
+                )
+            }
+            if not by_framework:
+                continue
+
+        with phase("tree"):
+            # Create a new tree for each project
+            tree = renderer.begin_tree(project_path)
+            project_node = tree
+            budget = Budget(max_project_nodes)
+
+            for framework in sorted(by_framework.keys()):
+                framework_node = renderer.add_framework(project_node, framework)
+                packages = by_framework[framework]
+
+                # Calculate max package name length for this framework
+                max_name_length = max((len(_capitalize_name(p.name)) for p in packages), default=0)
+
+                if nested:
+                    # Show nested dependencies
+                    top_level_packages = [
+                        p
+                        for p in packages
+                        if p.type in (DependencyType.DIRECT, DependencyType.PROJECT)
+                    ]
+                    builder = _DependencyTreeBuilder(
                         summary,
-                        usage,
-                        badge_map,
                         framework,
+                        renderer,
                         max_name_length,
                         include_transitive=include_transitive,
+                        max_depth=max_depth,
+                        max_nodes=max_nodes,
+                        package_filter=compiled_filter,
+                        project_budget=budget,
                     )
-            else:
-                # Show flat list
-                for usage in sorted(packages, key=lambda x: x.name_lower):
-                    color = (
-                        "green"
-                        if usage.type == DependencyType.DIRECT
-                        else "yellow"
-                        if usage.type == DependencyType.CENTRAL_TRANSITIVE
-                        else "white"
-                        if usage.type == DependencyType.PROJECT
-                        else "dim"
-                    )
-                    badge = badge_map[usage.type]
-                    name_display = _capitalize_name(usage.name)
-                    pkg_label = f"[{color}]{badge}[/{color}] {name_display:<{max_name_length}} {usage.resolved_version}"
-                    framework_node.add(pkg_label)
-
-        rich.print(tree)
-        # rich.print("[green][D][/green] Direct  [yellow][C][/yellow] CentralTransitive  [dim][T][/dim] Transitive")
-
-
-def _format_version_display(usage: PackageUsage | None, highlight: bool = False, absent_value: str = "") -> str:
-    """Helper to format version display for diff tables."""
-    if not usage:
-        return absent_value
-    if usage.type == DependencyType.PROJECT:
-        return "Project"
-    color = "yellow" if highlight else "white"
-    return "\n".join(
-        [
-            f"[{color}]{usage.type.value}[/{color}]\n[{color}]{usage.requested_version}",
-            f"  → {usage.resolved_version}[/{color}]",
-        ]
-    )
+                    for usage in sorted(top_level_packages, key=lambda x: x.name_lower):
+                        builder.add(framework_node, usage)
+                    count("tree nodes", builder.node_count)
+                else:
+                    # Show flat list
+                    shown = 0
+                    for usage in sorted(packages, key=lambda x: x.name_lower):
+                        if not budget.take():
+                            renderer.add_note(
+                                framework_node, f"… project truncated after {budget.limit} nodes"
+                            )
+                            break
+                        renderer.add_package(framework_node, usage, max_name_length)
+                        shown += 1
+                    count("tree nodes", shown)
+
+        renderer.end_tree(tree)
+        # rich.print(
+        #     "[green][D][/green] Direct  [yellow][C][/yellow] CentralTransitive"
+        #     "  [dim][T][/dim] Transitive"
+        # )
 
 
 def print_package_diffs(
@@ -264,7 +273,16 @@ def print_package_diffs(
     only_changes: bool = False,
     project_filter: str | None = None,
     include_transitive: bool = True,
-):
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    before_rev: str | None = None,
+    project_paths: list[Path] | None = None,
+    central: bool = False,
+    package_filter: str | Iterable[str] | PackageFilter | None = None,
+    max_rows: int | None = None,
+    renderer: Renderer | None = None,
+) -> None:
     """Print package differences between before and after states.
 
     Args:
@@ -275,94 +293,181 @@ def print_package_diffs(
         only_changes: Only show packages that changed
         project_filter: Optional glob pattern to filter project paths (e.g., "*/Transformation.*/*")
         include_transitive: Include transitive dependencies
+        cache: Optional persistent cache of parsed lock files
+        workspace: Shared discovery/parse state; its own project filter and cache take precedence
+        workers: Parse lock files on a process pool of this size (output order is unchanged)
+        before_rev: Git revision whose after_file is the before state (e.g. "HEAD"); replaces
+                    before_file
+        project_paths: Only diff these projects (default: every discovered project)
+        central: Compare each project against its nearest Directory.Packages.props (imports,
+                 properties and VersionOverride resolved) instead of global_version_path
+        package_filter: Package name glob(s) (`;`-separated string or list); only matching packages
+                        are shown and projects whose lock files cannot mention one are skipped
+                        undecoded
+        max_rows: Maximum number of package rows per project, across its frameworks; the rest are
+                  counted in a "more not shown" marker
+        renderer: Output backend (default: RichRenderer; PlainRenderer streams unstyled text)
     """
+    workspace = workspace or Workspace(
+        base_dir, project_filter=project_filter, cache=cache, workers=workers
+    )
+    renderer = renderer or RichRenderer()
+    before_label = f"{before_rev}:{after_file}" if before_rev is not None else before_file
+    compiled_filter = PackageFilter.compile(package_filter)
+    if compiled_filter:
+        project_paths = prescan_projects(
+            project_paths if project_paths is not None else workspace.project_paths,
+            compiled_filter,
+            after_file,
+            before_file if before_rev is None else None,
+        )
+
     # Load global package versions
-    global_versions = load_global_deps(global_version_path) if global_version_path else {}
+    global_versions = workspace.global_deps(global_version_path)
 
-    project_paths = find_project_paths(base_dir, project_filter=project_filter)
+    # With only_changes, identical lock files (or framework sections) are skipped undecoded
+    stats = DiffStats()
+    # Work-tree root, resolved on first use to name files at before_rev as `rev:path`
+    toplevel: Path | None = None
 
     # Process each project
-    for project_path in sorted(project_paths):
-        before_path = project_path / before_file
-        after_path = project_path / after_file
-
-        if not after_path.exists():
-            print(f"packages not found: {before_path}")
-            continue
-        if not before_path.exists():
-            print(f"before packages not found: {before_path}")
+    for project_path, before_summary, after_summary in iter_project_pairs(
+        workspace,
+        before_file,
+        after_file,
+        include_transitive,
+        skip_unchanged=only_changes,
+        stats=stats,
+        before_rev=before_rev,
+        project_paths=project_paths,
+    ):
+        if before_summary is None or after_summary is None:
+            before_path: Path | str = project_path / before_file
+            if before_rev is not None:
+                toplevel = toplevel or Path(os.path.realpath(git_toplevel(workspace.base_dir)))
+                relative = os.path.relpath(os.path.realpath(project_path / after_file), toplevel)
+                before_path = f"{before_rev}:{Path(relative).as_posix()}"
+            if not (project_path / after_file).exists():
+                renderer.message(f"packages not found: {before_path}")
+            else:
+                renderer.message(f"before packages not found: {before_path}")
             continue
 
-        before_summary = _package_summary(before_path, include_transitive=include_transitive)
-        after_summary = _package_summary(after_path, include_transitive=include_transitive)
-
-        frameworks = set()
-        for usage in before_summary.usages + after_summary.usages:
-            frameworks.add(usage.framework_version)
-
-        # Process each framework
-        for framework in sorted(frameworks):
-            # Build lookup dicts for this project/framework combination
-            before_by_name = {u.name_lower: u for u in before_summary.usages if u.framework_version == framework}
-            after_by_name = {u.name_lower: u for u in after_summary.usages if u.framework_version == framework}
-
-            # Build dependency rows
-            rows = []
-            all_pkg_names = set(before_by_name.keys()) | set(after_by_name.keys())
-
-            for pkg_name in sorted(all_pkg_names):
-                before_pkg = before_by_name.get(pkg_name)
-                after_pkg = after_by_name.get(pkg_name)
+        versions = global_versions
+        global_label = global_version_path if global_version_path else "N/A"
+        if central:
+            versions = workspace.central_versions(project_path)
+            global_label = workspace.central.find_props(project_path) or "N/A"
+        budget = Budget(max_rows)
 
-                has_change = before_pkg != after_pkg
-
-                global_diff = (
-                    after_pkg
-                    and global_versions.get(pkg_name)
-                    and after_pkg.resolved_version != global_versions.get(pkg_name)
-                ) or False
-
-                if only_changes and not has_change:
-                    continue
-                if not (pkg := (after_pkg or before_pkg)):
+        with phase("diff"):
+            diffs = list(
+                diff_summaries(project_path, before_summary, after_summary, versions, only_changes)
+            )
+            if compiled_filter:
+                diffs = [d for d in diffs if compiled_filter.matches(d.name_lower)]
+
+        with phase("table"):
+            # Process each framework
+            for framework, group in groupby(diffs, key=lambda d: d.framework):
+                framework_diffs = sorted(group, key=lambda d: _capitalize_name(d.name))
+                if not framework_diffs:
                     continue
-                pkg_name_display = _capitalize_name(pkg.name)
-
-                before_display = _format_version_display(before_pkg)
-                after_display = _format_version_display(
-                    after_pkg, highlight=has_change, absent_value="\n\n[yellow]removed[/yellow]"
+                remaining = budget.remaining
+                shown = framework_diffs if remaining is None else framework_diffs[:remaining]
+                budget.used += len(shown)
+                renderer.diff_table(
+                    framework,
+                    project_path,
+                    before_label,
+                    after_file,
+                    global_label,
+                    shown,
+                    hidden=len(framework_diffs) - len(shown),
                 )
+                count("table rows", len(shown))
 
-                global_display = ""
-                if global_ver := global_versions.get(pkg_name):
-                    color = "yellow" if global_diff else "green"
-                    global_display = f"\n\n[{color}]{global_ver}[/{color}]"
+    if only_changes:
+        renderer.message(str(stats), style="dim")
 
-                rows.append((pkg_name_display, before_display, after_display, global_display))
 
-            if not rows:
-                continue
+def print_version_drift(
+    base_dir: Path,
+    global_version_path: Path | None = None,
+    include_transitive: bool = True,
+    all_packages: bool = False,
+    project_filter: str | None = None,
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    central: bool = False,
+) -> None:
+    """Print one table of packages resolved to several versions or deviating from the global one.
+
+    Args:
+        base_dir: Base directory to search for projects
+        global_version_path: Path to global package versions file (.props or .packageset)
+        include_transitive: Include transitive dependencies
+        all_packages: Also list packages on a single, non-deviating version
+        project_filter: Optional glob pattern to filter project paths
+        cache: Optional persistent cache of parsed lock files
+        workspace: Shared discovery/parse state
+        workers: Parse lock files on a process pool of this size
+        central: Compare each project against its nearest Directory.Packages.props
+    """
+    import rich
+    from rich.table import Table
 
-            title = [
-                f"[cyan]Dependency diff ({framework})[/cyan]",
-                f"project: {project_path}",
-                f"         {before_file} -> {after_file}",
-                f"global: {global_version_path if global_version_path else 'N/A'}",
-            ]
+    drifts = compute_version_drift(
+        base_dir,
+        global_version_path=global_version_path,
+        include_transitive=include_transitive,
+        all_packages=all_packages,
+        project_filter=project_filter,
+        cache=cache,
+        workspace=workspace,
+        workers=workers,
+        central=central,
+    )
+    if not drifts:
+        rich.print("[green]No version drift[/green]")
+        return
 
-            table = Table(
-                title="\n".join(title),
-                title_justify="left",
+    conflicts = sum(1 for drift in drifts if drift.conflict)
+    table = Table(
+        title=f"[cyan]Version drift[/cyan] - {conflicts} package(s) on several versions"
+        f"\nglobal: {'nearest ' + PROPS_FILE_NAME if central else global_version_path or 'N/A'}",
+        title_justify="left",
+    )
+    table.add_column(f"Package   ({len(drifts)})", style="white")
+    table.add_column("Versions", no_wrap=True)
+    table.add_column("Projects", justify="right", no_wrap=True)
+    table.add_column("Global", no_wrap=True)
+    table.add_column("Deviating", justify="right", no_wrap=True)
+    with phase("table"):
+        for drift in drifts:
+            versions, projects = [], []
+            for version in drift.versions:
+                color = (
+                    "green"
+                    if version == drift.global_version
+                    else "yellow"
+                    if drift.global_version
+                    else "white"
+                )
+                versions.append(f"[{color}]{version}[/{color}]")
+                projects.append(str(len(drift.projects(version))))
+            deviating = len({project_path for project_path, _ in drift.deviating})
+            table.add_row(
+                _capitalize_name(drift.name),
+                "\n".join(versions),
+                "\n".join(projects),
+                drift.global_version or "",
+                f"[yellow]{deviating}[/yellow]" if deviating else "",
             )
-            table.add_column(f"Package   ({len(rows)})", style="white")
-            table.add_column("Before", no_wrap=True)
-            table.add_column("After", no_wrap=True)
-            table.add_column("Global", no_wrap=True)
-            rows.sort(key=lambda x: x[0])
-            for row in rows:
-                table.add_row(*row)
-                table.add_row()
-            rich.print(table)
+        count("table rows", len(drifts))
+    with phase("render"):
+        rich.print(table)
 
 
 def print_project_summary(
@@ -371,16 +476,175 @@ def print_project_summary(
     flat: bool = False,
     project_filter: str | None = None,
     only_changes: bool = False,
-):
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    before_rev: str | None = None,
+    central: bool = False,
+    package_filter: str | Iterable[str] | PackageFilter | None = None,
+    max_project_nodes: int | None = None,
+    max_rows: int | None = None,
+    renderer: Renderer | None = None,
+) -> None:
     nested = not flat
+    compiled_filter = PackageFilter.compile(package_filter)
     include_transitive = flat
 
-    print_projects(base_dir, nested=nested, include_transitive=include_transitive, project_filter=project_filter)
+    # One workspace for both passes: the tree is walked once and each lock file parsed once.
+    workspace = workspace or Workspace(
+        base_dir, project_filter=project_filter, cache=cache, workers=workers
+    )
+
+    print_projects(
+        base_dir,
+        nested=nested,
+        include_transitive=include_transitive,
+        workspace=workspace,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+        package_filter=compiled_filter,
+        max_project_nodes=max_project_nodes,
+        renderer=renderer,
+    )
 
     print_package_diffs(
         base_dir,
         global_version_path=global_version_path,
         only_changes=only_changes,
         include_transitive=include_transitive,
-        project_filter=project_filter,
+        workspace=workspace,
+        before_rev=before_rev,
+        central=central,
+        package_filter=compiled_filter,
+        max_rows=max_rows,
+        renderer=renderer,
     )
+
+    if workspace.cache is not None:
+        import rich
+
+        workspace.cache.flush()
+        rich.print(f"[dim]{workspace.cache.stats}[/dim]")
+
+
+def print_why(
+    base_dir: Path,
+    package: str,
+    project: str | None = None,
+    framework: str | None = None,
+    project_filter: str | None = None,
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    graph: SolutionGraph | None = None,
+) -> None:
+    """Show which projects pull in a package, through which chain and at which versions.
+
+    Args:
+        base_dir: Base directory to search for projects
+        package: Package name (case-insensitive)
+        project: Only show chains for this project (name or path); all chains are listed
+        framework: Only show this framework version (e.g. "8.0")
+        project_filter: Optional glob pattern to filter project paths
+        cache: Optional persistent cache of parsed lock files
+        workspace: Shared discovery/parse state
+        workers: Parse lock files on a process pool of this size
+        graph: Prebuilt SolutionGraph to query instead of building one
+    """
+    import rich
+    from rich.table import Table
+    from rich.tree import Tree
+
+    if graph is None:
+        workspace = workspace or Workspace(
+            base_dir, project_filter=project_filter, cache=cache, workers=workers
+        )
+        graph = SolutionGraph.build(base_dir, workspace=workspace)
+
+    try:
+        paths = (
+            graph.paths(project, package, framework=framework)
+            if project
+            else graph.why(package, framework=framework)
+        )
+    except KeyError:
+        rich.print(f"[red]project not found: {project}[/red]")
+        return
+    if not paths:
+        rich.print(f"[yellow]{package} is not used by any project[/yellow]")
+        return
+
+    tree = Tree(f"[cyan]Why[/cyan] {_capitalize_name(paths[0].usage.name)}")
+    project_nodes: dict[Path, Tree] = {}
+    framework_nodes: dict[tuple[Path, str], Tree] = {}
+    for path in paths:
+        if path.project_path not in project_nodes:
+            project_nodes[path.project_path] = tree.add(f"{path.project_path}")
+        key = (path.project_path, path.framework)
+        if key not in framework_nodes:
+            framework_nodes[key] = project_nodes[path.project_path].add(path.framework)
+        chain = " → ".join(
+            f"[{_package_color(u.type)}]{_capitalize_name(u.name)}[/{_package_color(u.type)}]"
+            f" {u.resolved_version}".rstrip()
+            for u in path.chain
+        )
+        framework_nodes[key].add(chain)
+    rich.print(tree)
+
+    versions = graph.versions(package)
+    table = Table(title=f"Resolved versions ({len(versions)})", title_justify="left")
+    table.add_column("Version", no_wrap=True)
+    table.add_column("Projects", justify="right")
+    for version, project_paths in versions.items():
+        table.add_row(version, str(len(project_paths)))
+    rich.print(table)
+
+
+def print_dependents(
+    base_dir: Path,
+    project: str,
+    direct: bool = False,
+    project_filter: str | None = None,
+    cache: SummaryCache | None = None,
+    workspace: Workspace | None = None,
+    workers: int | None = None,
+    graph: SolutionGraph | None = None,
+) -> None:
+    """Show the projects that reference a project, i.e. those affected by changing it.
+
+    Args:
+        base_dir: Base directory to search for projects
+        project: Project name or path
+        direct: Only projects that reference it directly, not through other projects
+        project_filter: Optional glob pattern to filter project paths
+        cache: Optional persistent cache of parsed lock files
+        workspace: Shared discovery/parse state
+        workers: Parse lock files on a process pool of this size
+        graph: Prebuilt SolutionGraph to query instead of building one
+    """
+    import rich
+    from rich.tree import Tree
+
+    if graph is None:
+        workspace = workspace or Workspace(
+            base_dir, project_filter=project_filter, cache=cache, workers=workers
+        )
+        graph = SolutionGraph.build(base_dir, workspace=workspace)
+
+    try:
+        project_path = graph.project(project)
+    except KeyError:
+        rich.print(f"[red]project not found: {project}[/red]")
+        return
+    dependents = graph.dependents(project_path, transitive=not direct)
+    if not dependents:
+        rich.print(f"[yellow]No project references {project_path}[/yellow]")
+        return
+
+    title = "Direct dependents" if direct else "Dependents"
+    tree = Tree(f"[cyan]{title}[/cyan] of {project_path} ({len(dependents)})")
+    for dependent in dependents:
+        tree.add(f"{dependent}")
+    rich.print(tree)
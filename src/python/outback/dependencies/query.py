@@ -0,0 +1,197 @@
+import json
+import mmap
+import os
+import re
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from fnmatch import translate
+from pathlib import Path
+from typing import Any, Iterable
+
+from .instrumentation import count, phase
+from .types import PackageStore, PackageSummary
+from .utils import _add_framework_usages, _framework_sections
+
+# Glob metacharacters; the literal runs between them are what a lock file must contain to match
+_GLOB_SPECIAL_RE = re.compile(r"\*|\?|\[[^\]]*\]")
+
+
+@dataclass(frozen=True)
+class PackageFilter:
+    """Compiled package-name filter: globs such as `Newtonsoft.*`, matched case-insensitively.
+
+    `needle` is a case-insensitive bytes pattern of the longest literal run of each glob.
+    A lock file that does not contain it cannot mention a matching package, so it is skipped
+    without being decoded. It is None when some glob has no literal run (e.g. `*`).
+    """
+
+    patterns: tuple[str, ...]
+    regex: re.Pattern
+    needle: re.Pattern | None
+
+    @classmethod
+    def compile(
+        cls, filter: "str | Iterable[str] | PackageFilter | None"
+    ) -> "PackageFilter | None":
+        """Compile a `;`/`,`-separated string or an iterable of globs; None or empty: no filter."""
+        if filter is None or isinstance(filter, PackageFilter):
+            return filter
+        if isinstance(filter, str):
+            filter = re.split(r"[;,]", filter)
+        patterns = tuple(p.strip().lower() for p in filter if p and p.strip())
+        if not patterns:
+            return None
+
+        regex = re.compile("|".join(f"(?:{translate(p)})" for p in patterns))
+        literals = [max(_GLOB_SPECIAL_RE.split(p), key=len) for p in patterns]
+        needle = None
+        if all(literals):
+            needle = re.compile(
+                b"|".join(re.escape(s.encode()) for s in sorted(set(literals))), re.IGNORECASE
+            )
+        return cls(patterns, regex, needle)
+
+    def matches(self, name: str) -> bool:
+        return self.regex.match(name.lower()) is not None
+
+    def may_match(self, path: Path | str) -> bool:
+        """Byte prescan of a file through mmap; False only when it cannot contain a match.
+
+        Unreadable files return True so that callers report them as usual.
+        """
+        if self.needle is None:
+            return True
+        with phase("prescan"):
+            try:
+                with open(path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        return False
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        found = self.needle.search(data) is not None
+            except OSError:
+                return True
+        count("lock files prescanned")
+        return found
+
+
+def _reaching(deps: dict[str, Any], package_filter: PackageFilter) -> set[str]:
+    """Names in one framework section that match the filter or depend on a match, at any depth."""
+    stack = [name for name in deps if package_filter.matches(name)]
+    if not stack:
+        return set()
+    dependents: defaultdict[str, list[str]] = defaultdict(list)
+    for name, info in deps.items():
+        for dep_name in info.get("dependencies") or ():
+            dependents[dep_name.lower()].append(name)
+
+    keep: set[str] = set()
+    while stack:
+        name = stack.pop()
+        if name in keep:
+            continue
+        keep.add(name)
+        stack.extend(dependents.get(name.lower(), ()))
+    return keep
+
+
+def filtered_package_summary(
+    packages_file_path: Path,
+    package_filter: PackageFilter,
+    store: PackageStore | None = None,
+) -> PackageSummary | None:
+    """Summary of only the packages matching `package_filter` and the packages that reach them.
+
+    Returns None when the lock file has no match. Files that cannot match are rejected by
+    the byte prescan, and framework sections that cannot match are never decoded. Packages
+    on a path to a match are kept whatever their type, so transitive links show in trees.
+
+    Args:
+        packages_file_path: Lock file to read
+        package_filter: Compiled package filter
+        store: PackageStore to append usages to (default: a new store for this file)
+    """
+    if not package_filter.may_match(packages_file_path):
+        count("lock files skipped")
+        return None
+
+    with phase("read"):
+        with open(packages_file_path, "rb") as f:
+            data = f.read()
+    count("lock files read")
+
+    sections: dict[str, Any] = {}
+    if raw_sections := _framework_sections(data):
+        for framework, section in raw_sections.items():
+            if package_filter.needle is None or package_filter.needle.search(section):
+                with phase("decode"):
+                    sections[framework] = json.loads(section)
+                count("bytes decoded", len(section))
+    else:
+        with phase("decode"):
+            sections = json.loads(data).get("dependencies", {})
+        count("bytes decoded", len(data))
+
+    store = store if store is not None else PackageStore()
+    indices = array("I")
+    with phase("build"):
+        for framework, deps in sections.items():
+            if keep := _reaching(deps, package_filter):
+                kept = {name: info for name, info in deps.items() if name in keep}
+                _add_framework_usages(store, indices, framework, kept, include_transitive=True)
+    count("usages built", len(indices))
+    if not indices:
+        return None
+    return PackageSummary(
+        project_path=packages_file_path,
+        packages_file_path=packages_file_path,
+        usages=store.view(indices),
+    )
+
+
+def filter_summary(
+    summary: PackageSummary, package_filter: PackageFilter, store: PackageStore
+) -> PackageSummary | None:
+    """Restrict a parsed summary (sharing `store`) the way filtered_package_summary does."""
+    usages = store.adopt(summary.usages)
+    keep: set[tuple[str, str]] = set()
+    stack = [
+        (u.framework_version, u.name_lower)
+        for u in summary.usages
+        if package_filter.matches(u.name_lower)
+    ]
+    while stack:
+        key = stack.pop()
+        if key in keep:
+            continue
+        keep.add(key)
+        stack.extend((key[0], u.name_lower) for u in summary.dependents.get(key, ()))
+    if not keep:
+        return None
+    return PackageSummary(
+        project_path=summary.project_path,
+        packages_file_path=summary.packages_file_path,
+        usages=store.view(
+            i for i, u in zip(usages.indices, usages) if (u.framework_version, u.name_lower) in keep
+        ),
+    )
+
+
+def prescan_projects(
+    project_paths: Iterable[Path],
+    package_filter: PackageFilter,
+    after_file: str = "packages.lock.json",
+    before_file: str | None = "packages.before.lock.json",
+) -> list[Path]:
+    """Projects whose after (or before) lock file may mention a matching package.
+
+    Pass `before_file=None` when the before state is not on disk (e.g. read from git); then
+    no project can be ruled out.
+    """
+    if before_file is None:
+        return list(project_paths)
+    return [
+        p
+        for p in project_paths
+        if package_filter.may_match(p / after_file) or package_filter.may_match(p / before_file)
+    ]
@@ -0,0 +1,324 @@
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Protocol, Sequence, TypeVar
+
+from .diff import PackageDiff
+from .instrumentation import phase
+from .types import DependencyType, PackageUsage
+from .versions import VersionChange
+
+if TYPE_CHECKING:
+    from rich.tree import Tree
+
+BADGES = {
+    DependencyType.DIRECT: "[D]",
+    DependencyType.CENTRAL_TRANSITIVE: "[C]",
+    DependencyType.TRANSITIVE: "[T]",
+    DependencyType.PROJECT: "[P]",
+    DependencyType.UNKNOWN: "[?]",
+}
+
+_CAPITALIZE_RE = re.compile(r"(?:^|(?<=\.))(.)(?=\w)")
+
+
+@lru_cache(maxsize=65536)
+def _capitalize_name(name: str) -> str:
+    # Package names repeat across projects and frameworks; each distinct name is converted once.
+    return _CAPITALIZE_RE.sub(lambda m: m.group(1).upper(), name)
+
+
+def _package_color(dep_type: DependencyType) -> str:
+    return (
+        "green"
+        if dep_type == DependencyType.DIRECT
+        else "yellow"
+        if dep_type == DependencyType.CENTRAL_TRANSITIVE
+        else "white"
+        if dep_type == DependencyType.PROJECT
+        else "dim"
+        if dep_type == DependencyType.TRANSITIVE
+        else "red"
+    )
+
+
+class Budget:
+    """Countdown of the nodes or rows one project may still emit; a None limit is unlimited."""
+
+    def __init__(self, limit: int | None = None):
+        self.limit = limit
+        self.used = 0
+
+    def take(self) -> bool:
+        if self.limit is not None and self.used >= self.limit:
+            return False
+        self.used += 1
+        return True
+
+    @property
+    def remaining(self) -> int | None:
+        return None if self.limit is None else max(self.limit - self.used, 0)
+
+
+# Node handle type of a Renderer
+H = TypeVar("H")
+
+
+class Renderer(Protocol[H]):
+    """Output backend of print_projects and print_package_diffs.
+
+    Tree methods return an opaque handle of type H for the node just added; children are
+    added by passing it back as `parent`. Nodes are added depth-first, in output order.
+    """
+
+    def begin_tree(self, project_path: Path) -> H: ...
+
+    def add_framework(self, parent: H, framework: str) -> H: ...
+
+    def add_package(
+        self, parent: H, usage: PackageUsage, padding: int, see_above: bool = False
+    ) -> H: ...
+
+    def add_unresolved(self, parent: H, name: str, version: str) -> H: ...
+
+    def add_note(self, parent: H, text: str) -> H: ...
+
+    def end_tree(self, tree: H) -> None: ...
+
+    def diff_table(
+        self,
+        framework: str,
+        project_path: Path,
+        before_label: str,
+        after_file: str,
+        global_label: object,
+        diffs: Sequence[PackageDiff],
+        hidden: int = 0,
+    ) -> None: ...
+
+    def message(self, text: str, style: str | None = None) -> None: ...
+
+
+def _format_version_display(
+    usage: PackageUsage | None, highlight: bool = False, absent_value: str = ""
+) -> str:
+    """Helper to format version display for diff tables."""
+    if not usage:
+        return absent_value
+    if usage.type == DependencyType.PROJECT:
+        return "Project"
+    color = "yellow" if highlight else "white"
+    return "\n".join(
+        [
+            f"[{color}]{usage.type.value}[/{color}]\n[{color}]{usage.requested_version}",
+            f"  → {usage.resolved_version}[/{color}]",
+        ]
+    )
+
+
+class RichRenderer:
+    """Renders through rich (imported on first use): markup, colors, box-drawn trees and tables.
+
+    A tree is laid out once per project. Diff tables longer than `chunk_rows` are printed as
+    consecutive tables of that many rows, so the first rows appear without waiting for the
+    whole table to be laid out.
+    """
+
+    def __init__(self, chunk_rows: int | None = 200):
+        self.chunk_rows = chunk_rows
+
+    def begin_tree(self, project_path: Path) -> "Tree":
+        from rich.tree import Tree
+
+        return Tree(f"[cyan]Project Dependencies[/cyan] - {project_path}")
+
+    def add_framework(self, parent: "Tree", framework: str) -> "Tree":
+        return parent.add(f"{framework}")
+
+    def add_package(
+        self, parent: "Tree", usage: PackageUsage, padding: int, see_above: bool = False
+    ) -> "Tree":
+        color = _package_color(usage.type)
+        name = _capitalize_name(usage.name)
+        label = (
+            f"[{color}]{BADGES[usage.type]}[/{color}] {name:<{padding}} {usage.resolved_version}"
+        )
+        return parent.add(f"{label} [dim](see above)[/dim]" if see_above else label)
+
+    def add_unresolved(self, parent: "Tree", name: str, version: str) -> "Tree":
+        return parent.add(f"[cyan][T ][/cyan] [dim]{_capitalize_name(name)} {version}[/dim]")
+
+    def add_note(self, parent: "Tree", text: str) -> "Tree":
+        return parent.add(f"[dim]{text}[/dim]")
+
+    def end_tree(self, tree: "Tree") -> None:
+        import rich
+
+        with phase("render"):
+            rich.print(tree)
+
+    def diff_table(
+        self,
+        framework: str,
+        project_path: Path,
+        before_label: str,
+        after_file: str,
+        global_label: object,
+        diffs: Sequence[PackageDiff],
+        hidden: int = 0,
+    ) -> None:
+        import rich
+        from rich.table import Table
+
+        title = [
+            f"[cyan]Dependency diff ({framework})[/cyan]",
+            f"project: {project_path}",
+            f"         {before_label} -> {after_file}",
+            f"global: {global_label}",
+        ]
+        chunk_rows = self.chunk_rows or len(diffs) or 1
+        for start in range(0, max(len(diffs), 1), chunk_rows):
+            chunk = diffs[start : start + chunk_rows]
+            table = Table(
+                title="\n".join(title if start == 0 else [f"{title[0]} [dim](continued)[/dim]"]),
+                title_justify="left",
+            )
+            table.add_column(f"Package   ({len(diffs) + hidden})", style="white")
+            table.add_column("Before", no_wrap=True)
+            table.add_column("After", no_wrap=True)
+            table.add_column("Global", no_wrap=True)
+            for diff in chunk:
+                table.add_row(*self._diff_row(diff))
+                table.add_row()
+            if hidden and start + chunk_rows >= len(diffs):
+                table.add_row(f"[dim]… {hidden} more not shown[/dim]")
+            with phase("render"):
+                rich.print(table)
+
+    @staticmethod
+    def _diff_row(diff: PackageDiff) -> tuple[str, str, str, str]:
+        name_display = _capitalize_name(diff.name)
+        if diff.change:
+            color = "red" if diff.change == VersionChange.MAJOR else "yellow"
+            name_display += f"\n[{color}]{diff.change.value}[/{color}]"
+        if diff.range_violation:
+            name_display += "\n[red]outside requested range[/red]"
+
+        before_display = _format_version_display(diff.before)
+        after_display = _format_version_display(
+            diff.after, highlight=diff.changed, absent_value="\n\n[yellow]removed[/yellow]"
+        )
+
+        global_display = ""
+        if diff.global_version:
+            color = "yellow" if diff.global_drift else "green"
+            global_display = f"\n\n[{color}]{diff.global_version}[/{color}]"
+        return name_display, before_display, after_display, global_display
+
+    def message(self, text: str, style: str | None = None) -> None:
+        if style:
+            import rich
+
+            rich.print(f"[{style}]{text}[/{style}]")
+        else:
+            print(text)
+
+
+def _plain_version(usage: PackageUsage | None, absent_value: str = "-") -> str:
+    if usage is None:
+        return absent_value
+    if usage.type == DependencyType.PROJECT:
+        return "Project"
+    return f"{usage.resolved_version} ({usage.type.value} {usage.requested_version})"
+
+
+class PlainRenderer:
+    """Writes plain text lines straight to a stream: no markup parsing, layout or colors.
+
+    Tree nesting is shown by four-space indentation, so every line is written as soon as its
+    node is reached and memory does not grow with the size of a project. Output is flushed
+    once per project, which keeps pagers such as `less` fed in whole chunks.
+
+    Args:
+        stream: Where to write (default: sys.stdout at the time of writing)
+    """
+
+    def __init__(self, stream: IO[str] | None = None):
+        self.stream = stream
+
+    @property
+    def _out(self) -> IO[str]:
+        return self.stream if self.stream is not None else sys.stdout
+
+    def _line(self, depth: int, text: str) -> int:
+        self._out.write(f"{'    ' * depth}{text}\n")
+        return depth
+
+    def begin_tree(self, project_path: Path) -> int:
+        self._line(0, f"Project Dependencies - {project_path}")
+        return 0
+
+    def add_framework(self, parent: int, framework: str) -> int:
+        return self._line(parent + 1, framework)
+
+    def add_package(
+        self, parent: int, usage: PackageUsage, padding: int, see_above: bool = False
+    ) -> int:
+        name = _capitalize_name(usage.name)
+        label = f"{BADGES[usage.type]} {name:<{padding}} {usage.resolved_version}".rstrip()
+        return self._line(parent + 1, f"{label} (see above)" if see_above else label)
+
+    def add_unresolved(self, parent: int, name: str, version: str) -> int:
+        return self._line(parent + 1, f"[T ] {_capitalize_name(name)} {version}")
+
+    def add_note(self, parent: int, text: str) -> int:
+        return self._line(parent + 1, text)
+
+    def end_tree(self, tree: int) -> None:
+        self._out.flush()
+
+    def diff_table(
+        self,
+        framework: str,
+        project_path: Path,
+        before_label: str,
+        after_file: str,
+        global_label: object,
+        diffs: Sequence[PackageDiff],
+        hidden: int = 0,
+    ) -> None:
+        out = self._out
+        out.write(
+            f"Dependency diff ({framework})\nproject: {project_path}\n"
+            f"         {before_label} -> {after_file}\nglobal: {global_label}\n"
+        )
+        rows = []
+        for diff in diffs:
+            notes = [diff.change.value] if diff.change else []
+            if diff.range_violation:
+                notes.append("outside requested range")
+            if diff.global_version:
+                notes.append(
+                    f"global {diff.global_version}{' (drift)' if diff.global_drift else ''}"
+                )
+            rows.append(
+                (
+                    _capitalize_name(diff.name),
+                    _plain_version(diff.before),
+                    _plain_version(diff.after, absent_value="removed"),
+                    ", ".join(notes),
+                )
+            )
+        name_width = max((len(row[0]) for row in rows), default=0)
+        before_width = max((len(row[1]) for row in rows), default=0)
+        for name, before, after, note_text in rows:
+            line = f"  {name:<{name_width}}  {before:<{before_width}} -> {after}"
+            out.write(f"{line}  [{note_text}]\n" if note_text else f"{line}\n")
+        if hidden:
+            out.write(f"  … {hidden} more not shown\n")
+        out.write("\n")
+        out.flush()
+
+    def message(self, text: str, style: str | None = None) -> None:
+        self._out.write(f"{text}\n")
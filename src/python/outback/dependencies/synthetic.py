@@ -0,0 +1,206 @@
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+_PREFIXES = (
+    "Microsoft.Extensions",
+    "System",
+    "Azure",
+    "Newtonsoft",
+    "Serilog",
+    "Polly",
+    "Contoso.Shared",
+    "Contoso.Platform",
+)
+
+
+@dataclass(frozen=True)
+class SyntheticRepoSpec:
+    """Shape of a generated monorepo.
+
+    Packages form a layered graph `depth` levels deep: each package depends on `fan_out`
+    packages of the next layer, and with probability `diamond_density` one of those edges is
+    redirected to a widely shared package of any deeper layer, producing diamonds.
+
+    Args:
+        projects: Number of projects (each gets a .csproj and lock files)
+        packages: Number of distinct packages in the universe
+        direct_per_project: Direct package references per project and framework
+        depth: Layers in the package graph (1 means no transitive dependencies)
+        fan_out: Dependencies per non-leaf package
+        diamond_density: Probability that a dependency edge targets a shared package
+        frameworks: Target frameworks; every project targets the first one
+        multi_target_ratio: Fraction of projects that also target the remaining frameworks
+        project_references: Maximum referenced (earlier) projects per project
+        central_transitive_ratio: Fraction of transitive packages pinned centrally
+        drift_ratio: Fraction of projects whose after lock file differs from the before one
+        areas: Top-level source directories the projects are spread over
+        seed: Random seed; the same spec always produces the same tree
+    """
+
+    projects: int = 200
+    packages: int = 400
+    direct_per_project: int = 8
+    depth: int = 3
+    fan_out: int = 3
+    diamond_density: float = 0.3
+    frameworks: tuple[str, ...] = ("net8.0", "net6.0", ".NETFramework,Version=v4.7.2")
+    multi_target_ratio: float = 0.25
+    project_references: int = 2
+    central_transitive_ratio: float = 0.1
+    drift_ratio: float = 0.2
+    areas: int = 10
+    seed: int = 0
+
+
+class _PackageGraph:
+    def __init__(self, spec: SyntheticRepoSpec, rng: random.Random):
+        count = max(spec.packages, spec.depth)
+        self.names = [f"{_PREFIXES[i % len(_PREFIXES)]}.Package{i}" for i in range(count)]
+        self.versions = [
+            f"{rng.randint(1, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 5)}" for _ in range(count)
+        ]
+        self.central = {i for i in range(count) if rng.random() < spec.central_transitive_ratio}
+
+        layers: list[list[int]] = [[] for _ in range(spec.depth)]
+        for i in range(count):
+            layers[i * spec.depth // count].append(i)
+        self.layers = layers
+
+        # A few packages per layer are depended on from everywhere (logging, primitives, ...)
+        shared = [i for layer in layers[1:] for i in layer[: max(1, len(layer) // 20)]]
+        self.deps: list[list[int]] = [[] for _ in range(count)]
+        for level, layer in enumerate(layers[:-1]):
+            below = layers[level + 1]
+            deeper_shared = [i for i in shared if i >= below[0]]
+            for i in layer:
+                deps = rng.sample(below, min(spec.fan_out, len(below)))
+                if deeper_shared and deps and rng.random() < spec.diamond_density:
+                    deps[0] = rng.choice(deeper_shared)
+                self.deps[i] = sorted(set(deps))
+
+    def closure(self, roots: list[int]) -> list[int]:
+        seen = set(roots)
+        stack = list(roots)
+        while stack:
+            for dep in self.deps[stack.pop()]:
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return sorted(seen)
+
+
+def _bump(version: str, rng: random.Random) -> str:
+    major, minor, patch = (int(p) for p in version.split("."))
+    kind = rng.random()
+    if kind < 0.15:
+        return f"{major + 1}.0.0"
+    if kind < 0.6:
+        return f"{major}.{minor + 1}.0"
+    if kind < 0.9:
+        return f"{major}.{minor}.{patch + 1}"
+    return f"{major}.{minor}.{patch}-preview.1"
+
+
+def _lock_file(
+    graph: _PackageGraph,
+    frameworks: list[str],
+    direct: list[int],
+    referenced: list[tuple[str, list[int]]],
+    versions: dict[int, str],
+) -> dict:
+    def version(i: int) -> str:
+        return versions.get(i) or graph.versions[i]
+
+    def entry(i: int, package_type: str) -> dict:
+        result: dict = {"type": package_type}
+        if package_type != "Transitive":
+            result["requested"] = f"[{version(i)}, )"
+        result["resolved"] = version(i)
+        result["contentHash"] = f"{i:08x}"
+        if deps := graph.deps[i]:
+            result["dependencies"] = {graph.names[d]: version(d) for d in deps}
+        return result
+
+    referenced_direct = [i for _, packages in referenced for i in packages]
+    packages = graph.closure(direct + referenced_direct)
+    direct_set = set(direct)
+
+    section: dict[str, dict] = {}
+    for i in sorted(direct_set, key=lambda i: graph.names[i]):
+        section[graph.names[i]] = entry(i, "Direct")
+    for i in sorted((i for i in packages if i not in direct_set), key=lambda i: graph.names[i]):
+        section[graph.names[i]] = entry(
+            i, "CentralTransitive" if i in graph.central else "Transitive"
+        )
+    for name, project_direct in referenced:
+        section[name.lower()] = {
+            "type": "Project",
+            "dependencies": {graph.names[i]: f"[{version(i)}, )" for i in project_direct},
+        }
+    return {"version": 1, "dependencies": dict.fromkeys(frameworks, section)}
+
+
+def generate_repo(root: Path | str, spec: SyntheticRepoSpec | None = None) -> list[Path]:
+    """Write a synthetic .NET monorepo under `root` and return its project directories.
+
+    Every project gets `<Name>.csproj`, `packages.before.lock.json` and `packages.lock.json`
+    (identical unless the project drifted), plus `obj` noise that discovery must skip.
+    A `Directory.Packages.props` with the baseline versions and a `.gitignore` are written at
+    the root.
+    """
+    spec = spec or SyntheticRepoSpec()
+    rng = random.Random(spec.seed)
+    root = Path(root)
+    graph = _PackageGraph(spec, rng)
+    candidates = graph.layers[0] + graph.layers[1] if len(graph.layers) > 1 else graph.layers[0]
+
+    project_paths = []
+    project_direct: list[tuple[str, list[int]]] = []
+    for n in range(spec.projects):
+        area = f"Area{n % spec.areas:02d}"
+        name = f"Contoso.{area}.Project{n:05d}"
+        project_path = root / "src" / area / name
+        project_path.mkdir(parents=True, exist_ok=True)
+        (project_path / f"{name}.csproj").write_text('<Project Sdk="Microsoft.NET.Sdk" />\n')
+        noise = project_path / "obj"
+        noise.mkdir(exist_ok=True)
+        (noise / "project.assets.json").write_text("{}\n")
+
+        frameworks = list(spec.frameworks[:1])
+        if rng.random() < spec.multi_target_ratio:
+            frameworks.extend(spec.frameworks[1:])
+        direct = rng.sample(candidates, min(spec.direct_per_project, len(candidates)))
+        referenced = rng.sample(
+            project_direct, min(rng.randint(0, spec.project_references), len(project_direct))
+        )
+
+        before = _lock_file(graph, frameworks, direct, referenced, {})
+        after = before
+        if rng.random() < spec.drift_ratio:
+            bumped = {
+                i: _bump(graph.versions[i], rng) for i in rng.sample(direct, min(2, len(direct)))
+            }
+            after_direct = direct
+            if rng.random() < 0.3:
+                after_direct = direct + [i for i in rng.sample(candidates, 1) if i not in direct]
+            after = _lock_file(graph, frameworks, after_direct, referenced, bumped)
+
+        before_text = json.dumps(before, indent=2)
+        (project_path / "packages.before.lock.json").write_text(before_text)
+        (project_path / "packages.lock.json").write_text(
+            before_text if after is before else json.dumps(after, indent=2)
+        )
+        project_paths.append(project_path)
+        project_direct.append((name, direct))
+
+    props = "".join(
+        f'    <PackageVersion Include="{name}" Version="{version}" />\n'
+        for name, version in zip(graph.names, graph.versions)
+    )
+    (root / "Directory.Packages.props").write_text(
+        f"<Project>\n  <ItemGroup>\n{props}  </ItemGroup>\n</Project>\n"
+    )
+    (root / ".gitignore").write_text("bin/\nobj/\n")
+    return project_paths
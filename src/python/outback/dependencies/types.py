@@ -1,7 +1,10 @@
+from array import array
 from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
+from typing import Iterable, Iterator, Sequence, overload
 
 
 class DependencyType(Enum):
@@ -12,29 +15,344 @@ class DependencyType(Enum):
     UNKNOWN = "Unknown"
 
 
-@dataclass
+_TYPES: tuple[DependencyType, ...] = tuple(DependencyType)
+_TYPE_CODES: dict[DependencyType, int] = {t: i for i, t in enumerate(_TYPES)}
+
+
+class PackageStore:
+    """Columnar, interned storage for package usages.
+
+    Names, versions and framework strings are interned into one shared string table and
+    identical `dependencies` maps are stored once, so the same package referenced by hundreds of
+    projects and target frameworks costs a handful of integers per usage. Each usage is a row
+    across typed arrays; `PackageUsage` objects are lightweight views over a row.
+
+    A workspace keeps one store for the whole solution. Stores are append-only.
+    """
+
+    __slots__ = (
+        "_strings",
+        "_string_ids",
+        "_deps",
+        "_deps_ids",
+        "_name",
+        "_name_lower",
+        "_type",
+        "_framework",
+        "_requested",
+        "_resolved",
+        "_dependencies",
+    )
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._deps: list[dict[str, str]] = []
+        self._deps_ids: dict[tuple[tuple[str, str], ...], int] = {}
+        self._name = array("I")
+        self._name_lower = array("I")
+        self._type = array("B")
+        self._framework = array("I")
+        self._requested = array("I")
+        self._resolved = array("I")
+        self._dependencies = array("i")  # -1 when the usage has no nested dependencies
+
+    def __len__(self) -> int:
+        return len(self._name)
+
+    def intern(self, value: str) -> int:
+        if (sid := self._string_ids.get(value)) is None:
+            sid = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return sid
+
+    def _intern_deps(self, dependencies: dict[str, str] | None) -> int:
+        if not dependencies:
+            return -1
+        key = tuple(dependencies.items())
+        if (did := self._deps_ids.get(key)) is None:
+            did = self._deps_ids[key] = len(self._deps)
+            self._deps.append(dict(key))
+        return did
+
+    def add(
+        self,
+        name: str,
+        type: DependencyType,
+        framework_version: str,
+        requested_version: str,
+        resolved_version: str,
+        dependencies: dict[str, str] | None = None,
+        name_lower: str | None = None,
+    ) -> int:
+        """Append a usage row and return its index."""
+        intern = self.intern
+        self._name.append(intern(name))
+        self._name_lower.append(intern(name_lower if name_lower is not None else name.lower()))
+        self._type.append(_TYPE_CODES[type])
+        self._framework.append(intern(framework_version))
+        self._requested.append(intern(requested_version))
+        self._resolved.append(intern(resolved_version))
+        self._dependencies.append(self._intern_deps(dependencies))
+        return len(self._name) - 1
+
+    def usage(self, index: int) -> "PackageUsage":
+        view = object.__new__(PackageUsage)
+        view._store = self
+        view._index = index
+        return view
+
+    def view(self, indices: Iterable[int]) -> "UsageView":
+        return UsageView(self, indices if isinstance(indices, array) else array("I", indices))
+
+    def row(self, index: int) -> tuple:
+        """Plain-value tuple for a row, in PackageStore.add argument order."""
+        s = self._strings
+        did = self._dependencies[index]
+        return (
+            s[self._name[index]],
+            _TYPES[self._type[index]],
+            s[self._framework[index]],
+            s[self._requested[index]],
+            s[self._resolved[index]],
+            self._deps[did] if did >= 0 else None,
+            s[self._name_lower[index]],
+        )
+
+    def adopt(self, usages: Iterable["PackageUsage"]) -> "UsageView":
+        """Copy usages from another store (or standalone ones) into this store."""
+        if isinstance(usages, UsageView) and usages.store is self:
+            return usages
+        return self.view(self.add(*u._row()) for u in usages)
+
+
 class PackageUsage:
-    name: str
-    name_lower: str
-    type: DependencyType
-    framework_version: str
-    requested_version: str
-    resolved_version: str
-    dependencies: dict[str, str] | None = None  # package_name -> version
+    """A single package reference in one target framework of a lock file.
+
+    Instances are read-only views over a row of a `PackageStore`. Constructing one directly
+    gives it a one-row store of its own; parsers create usages through a shared store instead.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(
+        self,
+        name: str,
+        name_lower: str,
+        type: DependencyType,
+        framework_version: str,
+        requested_version: str,
+        resolved_version: str,
+        dependencies: dict[str, str] | None = None,  # package_name -> version
+    ):
+        self._store = PackageStore()
+        self._index = self._store.add(
+            name,
+            type,
+            framework_version,
+            requested_version,
+            resolved_version,
+            dependencies,
+            name_lower,
+        )
+
+    @property
+    def name(self) -> str:
+        return self._store._strings[self._store._name[self._index]]
+
+    @property
+    def name_lower(self) -> str:
+        return self._store._strings[self._store._name_lower[self._index]]
+
+    @property
+    def type(self) -> DependencyType:
+        return _TYPES[self._store._type[self._index]]
+
+    @property
+    def framework_version(self) -> str:
+        return self._store._strings[self._store._framework[self._index]]
+
+    @property
+    def requested_version(self) -> str:
+        return self._store._strings[self._store._requested[self._index]]
+
+    @property
+    def resolved_version(self) -> str:
+        return self._store._strings[self._store._resolved[self._index]]
+
+    @property
+    def dependencies(self) -> dict[str, str] | None:
+        did = self._store._dependencies[self._index]
+        return self._store._deps[did] if did >= 0 else None
+
+    def _row(self) -> tuple:
+        return self._store.row(self._index)
+
+    def _key(self) -> tuple:
+        name, type, framework, requested, resolved, dependencies, name_lower = self._row()
+        return (name, name_lower, type, framework, requested, resolved, dependencies)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackageUsage):
+            return NotImplemented
+        if self._store is other._store:
+            store, i, j = self._store, self._index, other._index
+            return i == j or (
+                store._name[i] == store._name[j]
+                and store._type[i] == store._type[j]
+                and store._framework[i] == store._framework[j]
+                and store._requested[i] == store._requested[j]
+                and store._resolved[i] == store._resolved[j]
+                and store._dependencies[i] == store._dependencies[j]
+            )
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        name, name_lower, type, framework, requested, resolved, _ = self._key()
+        return hash((name, name_lower, type, framework, requested, resolved))
+
+    def __repr__(self) -> str:
+        fields = zip(
+            (
+                "name",
+                "name_lower",
+                "type",
+                "framework_version",
+                "requested_version",
+                "resolved_version",
+                "dependencies",
+            ),
+            self._key(),
+        )
+        return f"PackageUsage({', '.join(f'{k}={v!r}' for k, v in fields)})"
+
+    def __reduce__(self) -> tuple:
+        # Unpickled into a one-row store of its own, like a directly constructed usage
+        return _restore_usage, (self._row(),)
+
+
+def _restore_usage(row: tuple) -> PackageUsage:
+    store = PackageStore()
+    return store.usage(store.add(*row))
+
+
+def _restore_view(rows: list[tuple]) -> "UsageView":
+    store = PackageStore()
+    return store.view(store.add(*row) for row in rows)
+
+
+class UsageView(Sequence[PackageUsage]):
+    """Immutable sequence of PackageUsage views over selected rows of a PackageStore."""
+
+    __slots__ = ("store", "indices")
+
+    def __init__(self, store: PackageStore, indices: array):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, i: int) -> PackageUsage: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "UsageView": ...
+
+    def __getitem__(self, i: int | slice) -> "PackageUsage | UsageView":
+        if isinstance(i, slice):
+            return UsageView(self.store, self.indices[i])
+        return self.store.usage(self.indices[i])
+
+    def __iter__(self) -> Iterator[PackageUsage]:
+        usage = self.store.usage
+        for index in self.indices:
+            yield usage(index)
+
+    def __add__(self, other: Iterable[PackageUsage]) -> list[PackageUsage]:
+        return [*self, *other]
+
+    def __radd__(self, other: Iterable[PackageUsage]) -> list[PackageUsage]:
+        return [*other, *self]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"UsageView({list(self)!r})"
+
+    def __reduce__(self) -> tuple:
+        # Rows travel by value (e.g. back from worker processes) and land in a fresh store.
+        row = self.store.row
+        return _restore_view, ([row(i) for i in self.indices],)
 
 
 @dataclass
 class PackageSummary:
+    """Usages parsed from one lock file, with indexes built on first use.
+
+    Indexes:
+        lookup: name_lower -> usages across all frameworks
+        by_framework: framework -> usages in lock-file order
+        framework_lookup: framework -> name_lower -> usage
+        by_type: DependencyType -> usages
+        dependents: (framework, name_lower) -> usages that list the package as a dependency
+    """
+
     project_path: Path
     packages_file_path: Path
-    usages: list[PackageUsage]
+    usages: Sequence[PackageUsage]
 
-    @property
+    @cached_property
     def lookup(self) -> dict[str, list[PackageUsage]]:
-        """Returns a dictionary mapping package names (lowercase) to their usages."""
-        if not hasattr(self, "_lookup_cache"):
-            result = defaultdict(list)
-            for usage in self.usages:
-                result[usage.name_lower].append(usage)
-            self._lookup_cache = dict(result)
-        return self._lookup_cache
+        lookup: defaultdict[str, list[PackageUsage]] = defaultdict(list)
+        for usage in self.usages:
+            lookup[usage.name_lower].append(usage)
+        return dict(lookup)
+
+    @cached_property
+    def by_framework(self) -> dict[str, list[PackageUsage]]:
+        by_framework: defaultdict[str, list[PackageUsage]] = defaultdict(list)
+        for usage in self.usages:
+            by_framework[usage.framework_version].append(usage)
+        return dict(by_framework)
+
+    @cached_property
+    def framework_lookup(self) -> dict[str, dict[str, PackageUsage]]:
+        framework_lookup: defaultdict[str, dict[str, PackageUsage]] = defaultdict(dict)
+        for usage in self.usages:
+            framework_lookup[usage.framework_version][usage.name_lower] = usage
+        return dict(framework_lookup)
+
+    @cached_property
+    def by_type(self) -> dict[DependencyType, list[PackageUsage]]:
+        by_type: defaultdict[DependencyType, list[PackageUsage]] = defaultdict(list)
+        for usage in self.usages:
+            by_type[usage.type].append(usage)
+        return dict(by_type)
+
+    @cached_property
+    def dependents(self) -> dict[tuple[str, str], list[PackageUsage]]:
+        dependents: defaultdict[tuple[str, str], list[PackageUsage]] = defaultdict(list)
+        for usage in self.usages:
+            if dependencies := usage.dependencies:
+                framework = usage.framework_version
+                for dep_name in dependencies:
+                    dependents[(framework, dep_name.lower())].append(usage)
+        return dict(dependents)
+
+    def __reduce__(self) -> tuple:
+        # Only the usages are pickled, as one compact view; the indexes are rebuilt on use
+        usages = (
+            self.usages if isinstance(self.usages, UsageView) else PackageStore().adopt(self.usages)
+        )
+        return PackageSummary, (self.project_path, self.packages_file_path, usages)
+
+    def resolve(self, framework: str, name_lower: str) -> PackageUsage | None:
+        """Usage of a package in `framework`, else its first usage in any framework."""
+        if (usage := self.framework_lookup.get(framework, {}).get(name_lower)) is not None:
+            return usage
+        usages = self.lookup.get(name_lower)
+        return usages[0] if usages else None
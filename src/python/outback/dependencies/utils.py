@@ -1,29 +1,35 @@
 import json
+import os
 import re
 import shutil
-import xml.etree.ElementTree as ET
+from array import array
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
-import rich
+from .cache import SummaryCache
+from .central import _default_resolver
+from .discovery import PathFilter, walk_files
+from .instrumentation import count, phase
+from .lockfile import STREAM_THRESHOLD, iter_lock_entries
+from .types import DependencyType, PackageStore, PackageSummary
 
+type_map = {
+    "Direct": DependencyType.DIRECT,
+    "Transitive": DependencyType.TRANSITIVE,
+    "CentralTransitive": DependencyType.CENTRAL_TRANSITIVE,
+    "Project": DependencyType.PROJECT,
+}
 
-def _apply_path_filter(sources: list[Path], filter: str) -> list[Path]:
-    patterns = [p.strip() for p in filter.split(";")]
-    include_patterns = [p for p in patterns if not p.startswith("!")]
-    exclude_patterns = [p[1:] for p in patterns if p.startswith("!")]
 
-    if include_patterns:
-        sources = [p for p in sources if any(p.match(pattern) for pattern in include_patterns)]
-    if exclude_patterns:
-        sources = [p for p in sources if not any(p.match(pattern) for pattern in exclude_patterns)]
+def _apply_path_filter(sources: list[Path], filter: str | PathFilter) -> list[Path]:
+    path_filter = filter if isinstance(filter, PathFilter) else PathFilter.compile(filter)
+    return [p for p in sources if path_filter.matches(p)]
 
-    return sources
 
-
-def capture_before_deps(base_dir: Path):
+def capture_before_deps(base_dir: Path, workers: int | None = None) -> None:
     """Copy packages.lock.json to packages.before.lock.json"""
-    project_paths = find_project_paths(base_dir)
+    # .gitignore is not applied: the lock files this copies from and to are commonly ignored
+    project_paths = find_project_paths(base_dir, use_gitignore=False, workers=workers)
     # Convert single path to list for uniform processing
     if isinstance(project_paths, Path):
         project_paths = [project_paths]
@@ -39,10 +45,18 @@ def capture_before_deps(base_dir: Path):
             print(f"Warning: {source} does not exist")
 
 
-def remove_before_deps(base_dir: Path | str):
+def remove_before_deps(base_dir: Path | str, workers: int | None = None) -> None:
     """Remove all packages.before.lock.json files from base directory"""
-    base_path = Path(base_dir)
-    before_files = list(base_path.rglob("packages.before.lock.json"))
+    # packages.before.lock.json is a temporary artifact and usually gitignored, so .gitignore is
+    # not applied
+    before_files = sorted(
+        walk_files(
+            base_dir,
+            lambda name: name == "packages.before.lock.json",
+            use_gitignore=False,
+            workers=workers,
+        )
+    )
 
     for before_file in before_files:
         before_file.unlink()
@@ -52,52 +66,74 @@ def remove_before_deps(base_dir: Path | str):
 
 
 def load_deps(file_path: Path, framework: str, project_path: Path) -> dict[str, Any]:
-    """Load and filter dependencies from a packages.lock.json file."""
-    with open(file_path) as f:
-        data = json.load(f)
-    if framework not in data["dependencies"]:
+    """Load and filter dependencies from a packages.lock.json file.
+
+    Only `framework` is read, and runtime* and Project entries are dropped as they are
+    decoded (large lock files are streamed, see iter_lock_entries).
+    """
+    deps = {}
+    found = False
+    for _, name, entry in iter_lock_entries(file_path, frameworks=(framework,)):
+        found = True
+        if not name.startswith("runtime") and entry["type"] != "Project":
+            deps[name.lower()] = entry
+    if not found:
+        import rich
+
         rich.print(f"{project_path}: [yellow]skipping, {framework} not available[/yellow]")
-        return {}
-    deps = data["dependencies"][framework]
-    return {k.lower(): v for k, v in deps.items() if not k.startswith("runtime") and v["type"] != "Project"}
+    return deps
 
 
-def find_project_paths(base_dir: Path | str, project_filter: str | None = None) -> list[Path]:
+def find_project_paths(
+    base_dir: Path | str,
+    project_filter: str | None = None,
+    ignore_dirs: Iterable[str] | None = None,
+    use_gitignore: bool = True,
+    workers: int | None = None,
+) -> list[Path]:
     """Find all .csproj files recursively from a base directory.
 
+    Directories named in `ignore_dirs` (bin, obj, .git, node_modules, packages, ... by default)
+    and paths ignored by .gitignore are never entered. Exclusion patterns ending in `/**`
+    prune their subtree during the walk instead of being applied afterwards.
+
     Args:
         base_dir: Base directory to search for projects
         project_filter: Optional glob pattern(s) to filter project paths.
                        Multiple patterns can be separated by semicolons.
                        Patterns starting with ! are exclusions.
                        (e.g., "**/Transformation.Formula;!**/Semantics/**")
+        ignore_dirs: Directory names to skip (default: DEFAULT_IGNORE_DIRS)
+        use_gitignore: Honor .gitignore files found during the walk
+        workers: Walk top-level directories on a thread pool of this size
     """
-    base_path = Path(base_dir)
-    project_paths = [csproj.parent for csproj in base_path.rglob("*.csproj")]
-    # Filter to only include directories with packages.lock.json
-    # packages_paths = [p for p in project_dirs if (p / "packages.lock.json").exists()]
+    path_filter = PathFilter.compile(project_filter)
+    with phase("discovery"):
+        csproj_files = walk_files(
+            base_dir,
+            lambda name: name.endswith(".csproj"),
+            path_filter=path_filter,
+            ignore_dirs=ignore_dirs,
+            use_gitignore=use_gitignore,
+            workers=workers,
+        )
+    project_paths = {csproj.parent for csproj in csproj_files}
 
     # Apply glob filter if provided
-    if project_filter:
-        project_paths = _apply_path_filter(project_paths, project_filter)
+    if path_filter:
+        return sorted(p for p in project_paths if path_filter.matches(p))
 
     return sorted(project_paths)
 
 
 def load_global_deps(global_package_path: Path | None) -> dict[str, str]:
-    """Parse global package versions from .props or .packageset file."""
+    """Parse global package versions from a .props (central package management) or .packageset."""
     if not global_package_path:
         return {}
 
     if global_package_path.suffix == ".props":
-        global_xml = ET.parse(global_package_path).getroot()
-        ret = {}
-        for pkg in global_xml.findall(".//PackageVersion"):
-            key = pkg.get("Include")
-            value = pkg.get("Version") or ""
-            if key:
-                ret[key.lower()] = value
-        return ret
+        # Follows <Import> chains and $(Property) versions; parsed files are memoized
+        return dict(_default_resolver.versions(global_package_path))
     elif global_package_path.suffix == ".packageset":
         with open(global_package_path) as f:
             global_json = json.load(f)
@@ -111,3 +147,199 @@ def parse_framework_version(framework: str) -> str:
     # Match patterns like "net8.0" -> "8.0" or ".NETFramework,Version=v4.7.2" -> "4.7.2"
     match = re.search(r"(\d+\.\d+(?:\.\d+)?)", framework)
     return match.group(1) if match else framework
+
+
+def _add_usage(
+    store: PackageStore, indices: array, parsed_framework: str, dep_name: str, dep_info: dict
+) -> None:
+    """Append the usage for one lock-file entry to `store` and `indices`."""
+    nested_deps = dep_info.get("dependencies", {})
+    indices.append(
+        store.add(
+            dep_name,
+            type_map.get(dep_info.get("type", "Unknown"), DependencyType.UNKNOWN),
+            parsed_framework,
+            dep_info.get("requested", ""),
+            dep_info.get("resolved", ""),
+            nested_deps if nested_deps else None,
+        )
+    )
+
+
+def _add_framework_usages(
+    store: PackageStore,
+    indices: array,
+    framework: str,
+    deps: dict[str, Any],
+    include_transitive: bool,
+) -> None:
+    """Append the usages of one lock-file framework section to `store` and `indices`."""
+    parsed_framework = parse_framework_version(framework)
+    for dep_name, dep_info in deps.items():
+        if include_transitive or dep_info.get("type") != "Transitive":
+            _add_usage(store, indices, parsed_framework, dep_name, dep_info)
+
+
+def _not_transitive(name: str, entry: dict) -> bool:
+    return entry.get("type") != "Transitive"
+
+
+def _package_summary(
+    packages_file_path: Path,
+    include_transitive: bool = False,
+    cache: SummaryCache | None = None,
+    store: PackageStore | None = None,
+) -> PackageSummary:
+    """
+    Analyze package usage across multiple .NET projects.
+
+    Lock files larger than STREAM_THRESHOLD are streamed entry by entry (see
+    iter_lock_entries), so peak memory follows the usages kept rather than the file size.
+
+    Args:
+        base_dir: Base directory to search for projects
+        package_filename: Name of the lock file to parse (default: packages.lock.json)
+        include_transitive: Whether to include transitive dependencies (default: True)
+        project_filter: Optional regex pattern to filter project paths
+        cache: Optional persistent cache consulted before the lock file is decoded
+        store: PackageStore to append usages to (default: a new store for this file)
+
+    Returns:
+        PackageSummary: Strongly-typed model containing:
+            - usages: List of all PackageUsage instances
+            - project_lookup: Dict mapping project paths to their package usages
+            - package_lookup: Dict mapping package names to their usages across projects
+    """
+    # Taken before the file is read, so that the cache entry describes the content parsed
+    st = os.stat(packages_file_path)
+    if cache is not None and (
+        cached := cache.get(packages_file_path, include_transitive, store=store, st=st)
+    ):
+        return cached
+
+    store = store if store is not None else PackageStore()
+    indices = array("I")
+
+    if (size := st.st_size) > STREAM_THRESHOLD:
+        # Large (e.g. multi-RID) lock files: entries are decoded one at a time and transitive
+        # ones dropped before any usage is built
+        keep = None if include_transitive else _not_transitive
+        parsed_frameworks: dict[str, str] = {}
+        with phase("stream"):
+            for framework, dep_name, dep_info in iter_lock_entries(packages_file_path, keep=keep):
+                if (parsed_framework := parsed_frameworks.get(framework)) is None:
+                    parsed_framework = parsed_frameworks[framework] = parse_framework_version(
+                        framework
+                    )
+                _add_usage(store, indices, parsed_framework, dep_name, dep_info)
+        count("lock files read")
+        count("bytes streamed", size)
+    else:
+        with phase("read"):
+            with open(packages_file_path, "rb") as f:
+                data = f.read()
+        count("lock files read")
+        with phase("decode"):
+            package_json = json.loads(data)
+        count("bytes decoded", len(data))
+
+        # Iterate through all frameworks
+        with phase("build"):
+            for framework, deps in package_json.get("dependencies", {}).items():
+                _add_framework_usages(store, indices, framework, deps, include_transitive)
+
+    with phase("build"):
+        summary = PackageSummary(
+            project_path=packages_file_path,
+            packages_file_path=packages_file_path,
+            usages=store.view(indices),
+        )
+    count("usages built", len(indices))
+    if cache is not None:
+        cache.put(packages_file_path, include_transitive, summary, st=st)
+    return summary
+
+
+_TOP_LEVEL_DEPENDENCIES_RE = re.compile(rb'^( +)"dependencies": \{\r?$', re.MULTILINE)
+
+
+def _framework_sections(data: bytes) -> dict[str, bytes] | None:
+    """Split an indented lock file into raw per-framework JSON sections without decoding it.
+
+    Relies on the layout NuGet writes (one key per line, nested objects indented one level
+    deeper). Returns None when the file does not follow that layout.
+    """
+    if not (deps_match := _TOP_LEVEL_DEPENDENCIES_RE.search(data)):
+        return None
+    indent = deps_match.group(1) * 2
+    # An empty framework is written on one line: `"net472": {},`
+    key_re = re.compile(rb"^" + indent + rb'"((?:[^"\\]|\\.)*)": (\{(?:\},?)?)\r?$', re.MULTILINE)
+    end_re = re.compile(rb"^" + indent + rb"\}", re.MULTILINE)
+    closing_re = re.compile(rb"[\r\n,]*" + deps_match.group(1) + rb"\}")
+
+    sections = {}
+    pos = deps_match.end()
+    while (key_match := key_re.search(data, pos)) and not data[pos : key_match.start()].strip(
+        b"\r\n,"
+    ):
+        key = json.loads(b'"' + key_match.group(1) + b'"')
+        if key_match.group(2) != b"{":
+            sections[key] = b"{}"
+            pos = key_match.end()
+            continue
+        if not (end_match := end_re.search(data, key_match.end())):
+            return None
+        sections[key] = data[key_match.start(2) : end_match.end()]
+        pos = end_match.end()
+    # Anything but the closing brace of "dependencies" here is a layout this split does not know
+    if not sections or not closing_re.match(data, pos):
+        return None
+    return sections
+
+
+def _summary_from_sections(
+    packages_file_path: Path,
+    sections: dict[str, bytes],
+    include_transitive: bool = False,
+    store: PackageStore | None = None,
+) -> PackageSummary:
+    """Build a summary from selected raw framework sections, decoding only those sections."""
+    store = store if store is not None else PackageStore()
+    indices = array("I")
+    for framework, section in sections.items():
+        with phase("decode"):
+            deps = json.loads(section)
+        count("bytes decoded", len(section))
+        with phase("build"):
+            _add_framework_usages(store, indices, framework, deps, include_transitive)
+    count("usages built", len(indices))
+    with phase("build"):
+        return PackageSummary(
+            project_path=packages_file_path,
+            packages_file_path=packages_file_path,
+            usages=store.view(indices),
+        )
+
+
+def _summary_from_bytes(
+    packages_file_path: Path,
+    data: bytes,
+    include_transitive: bool = False,
+    store: PackageStore | None = None,
+) -> PackageSummary:
+    """Build a summary from lock-file content already in memory (e.g. read from git)."""
+    store = store if store is not None else PackageStore()
+    indices = array("I")
+    with phase("decode"):
+        package_json = json.loads(data)
+    count("bytes decoded", len(data))
+    with phase("build"):
+        for framework, deps in package_json.get("dependencies", {}).items():
+            _add_framework_usages(store, indices, framework, deps, include_transitive)
+        summary = PackageSummary(
+            project_path=packages_file_path,
+            packages_file_path=packages_file_path,
+            usages=store.view(indices),
+        )
+    count("usages built", len(indices))
+    return summary
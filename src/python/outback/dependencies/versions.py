@@ -0,0 +1,151 @@
+import re
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+
+_VERSION_RE = re.compile(
+    r"^\s*v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?\s*$"
+)
+
+
+def _label_key(label: str) -> tuple[int, int, str]:
+    # SemVer 2.0: numeric labels sort numerically and before alphanumeric ones (compared
+    # case-insensitively)
+    return (0, int(label), "") if label.isdigit() else (1, 0, label.lower())
+
+
+@dataclass(frozen=True, slots=True)
+class NuGetVersion:
+    """A parsed NuGet (SemVer 2.0 plus 4th revision part) version.
+
+    `key` orders versions the way NuGet does: numeric parts, then a prerelease before the
+    release; build metadata is ignored. Unparseable strings get a key that sorts before any
+    valid version. Obtain instances through `parse_version`, which interns them.
+    """
+
+    original: str
+    major: int
+    minor: int
+    patch: int
+    revision: int
+    prerelease: tuple[str, ...]
+    metadata: str
+    valid: bool
+    key: tuple
+
+    @property
+    def is_prerelease(self) -> bool:
+        return bool(self.prerelease)
+
+    def __lt__(self, other: "NuGetVersion") -> bool:
+        return self.key < other.key
+
+    def __str__(self) -> str:
+        return self.original
+
+
+@lru_cache(maxsize=None)
+def parse_version(value: str) -> NuGetVersion:
+    """Parse (once per distinct string) a NuGet version: `1.2.3`, `1.2.3.4` or `2.0.0-rc.1+abc`."""
+    if not (match := _VERSION_RE.match(value)):
+        return NuGetVersion(
+            value, 0, 0, 0, 0, (), "", False, (-1, -1, -1, -1, 0, ((1, 0, value.lower()),))
+        )
+    major, minor, patch, revision = (int(part) if part else 0 for part in match.group(1, 2, 3, 4))
+    prerelease = tuple(match.group(5).split(".")) if match.group(5) else ()
+    labels = tuple(_label_key(label) for label in prerelease)
+    key = (major, minor, patch, revision, 0 if prerelease else 1, labels)
+    return NuGetVersion(
+        value, major, minor, patch, revision, prerelease, match.group(6) or "", True, key
+    )
+
+
+def version_key(value: str) -> tuple:
+    """Sortable key for a version string, e.g. `sorted(versions, key=version_key)`."""
+    return parse_version(value).key
+
+
+@dataclass(frozen=True, slots=True)
+class VersionRange:
+    """A NuGet version range such as `[1.2.3, )`, `(, 2.0)`, `[1.0]` or a bare `1.2.3` (minimum)."""
+
+    original: str
+    min: NuGetVersion | None
+    max: NuGetVersion | None
+    min_inclusive: bool
+    max_inclusive: bool
+    valid: bool = True
+
+    def __contains__(self, version: NuGetVersion | str) -> bool:
+        if not self.valid:
+            return True
+        if isinstance(version, str):
+            version = parse_version(version)
+        if self.min is not None:
+            if version.key < self.min.key or (
+                version.key == self.min.key and not self.min_inclusive
+            ):
+                return False
+        if self.max is not None:
+            if version.key > self.max.key or (
+                version.key == self.max.key and not self.max_inclusive
+            ):
+                return False
+        return True
+
+    def __str__(self) -> str:
+        return self.original
+
+
+@lru_cache(maxsize=None)
+def parse_range(value: str) -> VersionRange:
+    """Parse (once per distinct string) a NuGet version range; unparseable ranges allow anything."""
+    text = value.strip()
+    if not text:
+        return VersionRange(value, None, None, True, True, valid=False)
+    if text[0] not in "[(":
+        version = parse_version(text)
+        return VersionRange(value, version, None, True, True, valid=version.valid)
+    if text[-1] not in "])" or len(text) < 3:
+        return VersionRange(value, None, None, True, True, valid=False)
+
+    min_inclusive, max_inclusive = text[0] == "[", text[-1] == "]"
+    body = text[1:-1]
+    if "," not in body:
+        # [1.0] is an exact version
+        version = parse_version(body.strip())
+        return VersionRange(
+            value, version, version, True, True, valid=version.valid and min_inclusive
+        )
+    low, high = (part.strip() for part in body.split(",", 1))
+    minimum = parse_version(low) if low else None
+    maximum = parse_version(high) if high else None
+    valid = all(v is None or v.valid for v in (minimum, maximum))
+    return VersionRange(value, minimum, maximum, min_inclusive, max_inclusive, valid=valid)
+
+
+class VersionChange(Enum):
+    MAJOR = "major"
+    MINOR = "minor"
+    PATCH = "patch"
+    REVISION = "revision"
+    PRERELEASE = "prerelease"  # same numeric version, prerelease labels differ
+    NONE = "none"
+
+
+def classify_change(before: str, after: str) -> VersionChange:
+    """Size of the step between two versions, independently of its direction."""
+    b, a = parse_version(before), parse_version(after)
+    if b.key == a.key:
+        return VersionChange.NONE
+    if not (a.valid and b.valid) or a.major != b.major:
+        return VersionChange.MAJOR
+    if a.minor != b.minor:
+        return VersionChange.MINOR
+    if a.patch != b.patch:
+        return VersionChange.PATCH
+    if a.revision != b.revision:
+        return VersionChange.REVISION
+    return VersionChange.PRERELEASE
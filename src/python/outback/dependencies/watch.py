@@ -0,0 +1,330 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Iterable
+
+from .cache import SummaryCache
+from .print import print_package_diffs
+from .render import Renderer, RichRenderer
+from .workspace import Workspace
+
+# inotify(7) event bits
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Detects changes to a fixed set of files by comparing (mtime, size) between scans.
+
+    Works everywhere; each scan is one stat per watched file.
+    """
+
+    def __init__(self, paths: Iterable[Path], interval: float = 0.5):
+        self.paths = [Path(p) for p in paths]
+        self.interval = interval
+        self._state = {p: self._stat(p) for p in self.paths}
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int] | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _scan(self) -> set[Path]:
+        changed: set[Path] = set()
+        for path in self.paths:
+            state = self._stat(path)
+            if state != self._state[path]:
+                self._state[path] = state
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until a watched file changes or `timeout` seconds pass; return changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = (
+                self.interval
+                if deadline is None
+                else min(self.interval, deadline - time.monotonic())
+            )
+            time.sleep(max(delay, 0))
+            if changed := self._scan():
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watch on the directories holding the watched files.
+
+    Files written in place (close after write), replaced by rename, or deleted are reported.
+    Raises OSError when inotify is unavailable or the watch limit is reached.
+    """
+
+    def __init__(self, paths: Iterable[Path]):
+        self.paths = {Path(os.path.abspath(p)) for p in paths}
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1: {os.strerror(errno)}")
+
+        self._dirs: dict[int, Path] = {}
+        for directory in sorted({p.parent for p in self.paths}):
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                self.close()
+                raise OSError(errno, f"inotify_add_watch {directory}: {os.strerror(errno)}")
+            self._dirs[wd] = directory
+
+    def _read_events(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, pos)
+                pos += _EVENT.size
+                name = data[pos : pos + length].rstrip(b"\0")
+                pos += length
+                if mask & _IN_Q_OVERFLOW:
+                    # Events were dropped; report everything rather than miss a change.
+                    return set(self.paths)
+                if (directory := self._dirs.get(wd)) is not None:
+                    path = directory / os.fsdecode(name)
+                    if path in self.paths:
+                        changed.add(path)
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until a watched file changes or `timeout` seconds pass; return changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready and (changed := self._read_events()):
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    paths: Iterable[Path], poll_interval: float = 0.5, use_inotify: bool | None = None
+) -> InotifyWatcher | PollingWatcher:
+    """Watch `paths` with inotify where available, else by mtime polling.
+
+    Args:
+        paths: Files to watch; they need not exist yet, but their directories must
+        poll_interval: Seconds between scans when polling
+        use_inotify: True to require inotify, False to always poll, None to pick automatically
+    """
+    paths = list(paths)
+    if use_inotify is not False and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            if use_inotify:
+                raise
+    elif use_inotify:
+        raise OSError("inotify is only available on Linux")
+    return PollingWatcher(paths, interval=poll_interval)
+
+
+def wait_for_changes(watcher: InotifyWatcher | PollingWatcher, debounce: float = 0.2) -> set[Path]:
+    """Block until files change, then keep collecting until `debounce` seconds pass quietly.
+
+    A `dotnet restore` rewrites many lock files in a burst; this returns them as one batch.
+    """
+    changed = watcher.wait()
+    while more := watcher.wait(debounce):
+        changed |= more
+    return changed
+
+
+def watch_package_diffs(
+    base_dir: Path,
+    before_file: str = "packages.before.lock.json",
+    after_file: str = "packages.lock.json",
+    global_version_path: Path | None = None,
+    only_changes: bool = False,
+    project_filter: str | None = None,
+    include_transitive: bool = True,
+    cache: SummaryCache | None = None,
+    workers: int | None = None,
+    before_rev: str | None = None,
+    debounce: float = 0.2,
+    poll_interval: float = 0.5,
+    use_inotify: bool | None = None,
+    central: bool = False,
+    renderer: Renderer | None = None,
+    max_updates: int | None = None,
+) -> None:
+    """Print package diffs, then re-print them for the affected projects whenever lock files change.
+
+    Parsed summaries stay in memory between updates; only changed lock files are re-parsed.
+    A change to a version file (the global versions file, or with `central` each project's
+    nearest Directory.Packages.props, including the props files they import) re-diffs the
+    projects that use a package whose central version changed. Projects added after startup
+    are not picked up. Runs until interrupted, or for `max_updates` batches of changes.
+
+    Args:
+        base_dir: Base directory to search for projects
+        before_file: Name of the before lock file
+        after_file: Name of the after lock file
+        global_version_path: Path to global package versions file (.props or .packageset)
+        only_changes: Only show packages that changed
+        project_filter: Optional glob pattern to filter project paths
+        include_transitive: Include transitive dependencies
+        cache: Optional persistent cache of parsed lock files
+        workers: Parse lock files on a process pool of this size for the initial pass
+        before_rev: Git revision whose after_file is the before state (e.g. "HEAD")
+        debounce: Seconds without further writes before a burst of changes is rendered
+        poll_interval: Seconds between scans when inotify is not available
+        use_inotify: True to require inotify, False to always poll, None to pick automatically
+        central: Compare each project against its nearest Directory.Packages.props and watch those
+        renderer: Output backend (default: RichRenderer; PlainRenderer streams unstyled text)
+        max_updates: Return after this many batches of changes (default: run until interrupted)
+    """
+    renderer = renderer or RichRenderer()
+    workspace = Workspace(base_dir, project_filter=project_filter, cache=cache, workers=workers)
+    print_diffs = partial(
+        print_package_diffs,
+        base_dir,
+        before_file=before_file,
+        after_file=after_file,
+        global_version_path=global_version_path,
+        only_changes=only_changes,
+        include_transitive=include_transitive,
+        workspace=workspace,
+        before_rev=before_rev,
+        central=central,
+        renderer=renderer,
+    )
+    print_diffs()
+    # Updates touch a few files; starting a process pool would cost more than it saves.
+    workspace.workers = None
+
+    owners: dict[Path, Path] = {}
+    for project_path in workspace.project_paths:
+        owners[Path(os.path.abspath(project_path / after_file))] = project_path
+        if before_rev is None:
+            owners[Path(os.path.abspath(project_path / before_file))] = project_path
+    global_path = Path(os.path.abspath(global_version_path)) if global_version_path else None
+
+    def project_versions(project_path: Path) -> dict[str, str]:
+        return (
+            workspace.central_versions(project_path)
+            if central
+            else workspace.global_deps(global_version_path)
+        )
+
+    def version_files() -> dict[Path, set[Path] | None]:
+        """Version files (props files and their imports) -> projects they apply to (None: all)."""
+        if central:
+            users: dict[Path, set[Path]] = {}
+            for project_path in workspace.project_paths:
+                if props_path := workspace.central.find_props(project_path):
+                    for path in workspace.central.files(props_path):
+                        users.setdefault(path, set()).add(project_path)
+            return dict(users)
+        if global_path and global_path.suffix == ".props":
+            return dict.fromkeys(workspace.central.files(global_path))
+        return {global_path: None} if global_path else {}
+
+    versions = {
+        project_path: project_versions(project_path) for project_path in workspace.project_paths
+    }
+    sources = version_files()
+    watcher = create_watcher(
+        [*owners, *sources], poll_interval=poll_interval, use_inotify=use_inotify
+    )
+    renderer.message(
+        f"watching {len(owners)} lock files and {len(sources)} version files"
+        f" ({type(watcher).__name__}), Ctrl+C to stop",
+        style="dim",
+    )
+    updates = 0
+    try:
+        while max_updates is None or updates < max_updates:
+            changed = wait_for_changes(watcher, debounce)
+            started = time.perf_counter()
+            affected: set[Path] = set()
+            for path in changed:
+                workspace.invalidate(path)
+                if (owner := owners.get(path)) is not None:
+                    affected.add(owner)
+
+            if changed_sources := [path for path in changed if path in sources]:
+                candidates: Iterable[Path] = workspace.project_paths
+                if central:
+                    candidates = set().union(*(sources[path] or () for path in changed_sources))
+                elif global_path is not None:
+                    # An imported props file is not known to the workspace's global versions memo
+                    workspace.invalidate(global_path)
+                for project_path in candidates:
+                    old_versions, new_versions = (
+                        versions[project_path],
+                        project_versions(project_path),
+                    )
+                    versions[project_path] = new_versions
+                    if project_path in affected or old_versions == new_versions:
+                        continue
+                    changed_names = {
+                        name
+                        for name in old_versions.keys() | new_versions.keys()
+                        if old_versions.get(name) != new_versions.get(name)
+                    }
+                    packages_file_path = project_path / after_file
+                    if packages_file_path.exists():
+                        summary = workspace.summary(packages_file_path, include_transitive)
+                        if not changed_names.isdisjoint(summary.lookup):
+                            affected.add(project_path)
+
+                # Imports may have been added or removed
+                if (new_sources := version_files()).keys() != sources.keys():
+                    watcher.close()
+                    watcher = create_watcher(
+                        [*owners, *new_sources],
+                        poll_interval=poll_interval,
+                        use_inotify=use_inotify,
+                    )
+                sources = new_sources
+
+            renderer.message(
+                f"{time.strftime('%H:%M:%S')} {len(changed)} file(s) changed,"
+                f" re-diffing {len(affected)} project(s)",
+                style="dim",
+            )
+            if affected:
+                print_diffs(project_paths=sorted(affected))
+            renderer.message(f"updated in {time.perf_counter() - started:.2f}s", style="dim")
+            updates += 1
+    finally:
+        watcher.close()
@@ -0,0 +1,190 @@
+import os
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .cache import SummaryCache
+from .central import CentralPackageResolver
+from .query import PackageFilter, filter_summary, filtered_package_summary
+from .types import DependencyType, PackageStore, PackageSummary
+from .utils import _package_summary, find_project_paths, load_global_deps
+
+# Lock files submitted to the pool per worker ahead of the one being yielded
+_READ_AHEAD = 4
+
+
+class Workspace:
+    """Shared state for one run over a source tree.
+
+    Projects are discovered once and every parsed lock file is memoized per
+    (file, include_transitive), so commands that chain several print functions walk the tree
+    and decode each packages.lock.json only once.
+
+    Usage:
+        workspace = Workspace(base_dir, project_filter="!**/Tests/**")
+        print_projects(base_dir, workspace=workspace)
+        print_package_diffs(base_dir, workspace=workspace)
+    """
+
+    def __init__(
+        self,
+        base_dir: Path | str,
+        project_filter: str | None = None,
+        cache: SummaryCache | None = None,
+        workers: int | None = None,
+    ):
+        self.base_dir = Path(base_dir)
+        self.project_filter = project_filter
+        self.cache = cache
+        self.workers = workers
+        self._project_paths: list[Path] | None = None
+        self.store = PackageStore()
+        self._summaries: dict[tuple[str, bool], PackageSummary] = {}
+        self._global_deps: dict[Path, dict[str, str]] = {}
+        self.central = CentralPackageResolver()
+
+    @property
+    def project_paths(self) -> list[Path]:
+        """Sorted project directories, discovered on first access."""
+        if self._project_paths is None:
+            self._project_paths = find_project_paths(
+                self.base_dir, project_filter=self.project_filter, workers=self.workers
+            )
+        return self._project_paths
+
+    def _memoized(self, path: str, include_transitive: bool) -> PackageSummary | None:
+        if summary := self._summaries.get((path, include_transitive)):
+            return summary
+
+        # A summary with transitive dependencies is a superset of the one without.
+        if not include_transitive and (full := self._summaries.get((path, True))):
+            usages = self.store.adopt(full.usages)
+            transitive = DependencyType.TRANSITIVE
+            summary = PackageSummary(
+                project_path=full.project_path,
+                packages_file_path=full.packages_file_path,
+                usages=self.store.view(
+                    i for i, u in zip(usages.indices, usages) if u.type != transitive
+                ),
+            )
+            self._summaries[(path, include_transitive)] = summary
+        return summary
+
+    def summary(self, packages_file_path: Path, include_transitive: bool = False) -> PackageSummary:
+        """Parse a lock file, or return the summary already parsed during this run."""
+        path = os.path.abspath(packages_file_path)
+        if summary := self._memoized(path, include_transitive):
+            return summary
+
+        summary = _package_summary(
+            packages_file_path,
+            include_transitive=include_transitive,
+            cache=self.cache,
+            store=self.store,
+        )
+        self._summaries[(path, include_transitive)] = summary
+        return summary
+
+    def iter_summaries(
+        self, packages_file_paths: Iterable[Path], include_transitive: bool = False
+    ) -> Iterator[PackageSummary | None]:
+        """Yield a summary for each path in order, or None where the file does not exist.
+
+        With workers > 1, lock files that are neither memoized nor cached are parsed on a
+        process pool. Results are still yielded in input order as soon as each one is ready,
+        so callers can render earlier projects while later ones are being parsed.
+        `packages_file_paths` is consumed a few paths per worker ahead of the one yielded.
+        """
+        if not self.workers or self.workers <= 1:
+            for packages_file_path in packages_file_paths:
+                yield (
+                    self.summary(packages_file_path, include_transitive)
+                    if packages_file_path.exists()
+                    else None
+                )
+            return
+
+        # Imported here: loading multiprocessing is only worth it when a pool is used
+        from concurrent.futures import ProcessPoolExecutor
+
+        parse = partial(_package_summary, include_transitive=include_transitive)
+        paths = iter(packages_file_paths)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+
+            def submit(
+                packages_file_path: Path,
+            ) -> tuple[
+                str, Path, PackageSummary | Future[PackageSummary] | None, os.stat_result | None
+            ]:
+                path = os.path.abspath(packages_file_path)
+                result: PackageSummary | Future[PackageSummary] | None
+                st = None
+                if not packages_file_path.exists():
+                    result = None
+                elif not (result := self._memoized(path, include_transitive)):
+                    # Taken before the worker reads the file, so a cache entry matches what
+                    # was parsed
+                    st = os.stat(path)
+                    if self.cache is None or not (
+                        result := self.cache.get(
+                            packages_file_path, include_transitive, store=self.store, st=st
+                        )
+                    ):
+                        result = pool.submit(parse, packages_file_path)
+                return path, packages_file_path, result, st
+
+            # Paths are taken a window ahead of the one being yielded, so a lazily produced
+            # `packages_file_paths` is not drained up front
+            pending = deque(submit(p) for p in islice(paths, self.workers * _READ_AHEAD))
+            while pending:
+                path, packages_file_path, result, st = pending.popleft()
+                pending.extend(submit(p) for p in islice(paths, 1))
+                if isinstance(result, Future):
+                    # Re-intern rows that arrived from the worker into the shared store
+                    result = result.result()
+                    result = PackageSummary(
+                        project_path=result.project_path,
+                        packages_file_path=result.packages_file_path,
+                        usages=self.store.adopt(result.usages),
+                    )
+                    if self.cache is not None:
+                        self.cache.put(packages_file_path, include_transitive, result, st=st)
+                if result is not None:
+                    self._summaries[(path, include_transitive)] = result
+                yield result
+
+    def filtered_summary(
+        self, packages_file_path: Path, package_filter: PackageFilter
+    ) -> PackageSummary | None:
+        """Packages matching `package_filter` and those reaching them; None without a match.
+
+        Restricts the memoized full summary when there is one; otherwise the lock file is
+        prescanned and only decoded when it can contain a match. Not memoized itself.
+        """
+        if full := self._summaries.get((os.path.abspath(packages_file_path), True)):
+            return filter_summary(full, package_filter, self.store)
+        return filtered_package_summary(packages_file_path, package_filter, store=self.store)
+
+    def invalidate(self, path: Path) -> None:
+        """Forget everything memoized for a file that changed on disk."""
+        abspath = os.path.abspath(path)
+        for include_transitive in (False, True):
+            self._summaries.pop((abspath, include_transitive), None)
+        for global_version_path in [p for p in self._global_deps if os.path.abspath(p) == abspath]:
+            del self._global_deps[global_version_path]
+
+    def central_versions(self, project_path: Path) -> dict[str, str]:
+        """Central versions in effect for a project: its nearest Directory.Packages.props (with
+        imports and properties evaluated) plus the project's VersionOverride entries."""
+        return self.central.project_versions(project_path)
+
+    def global_deps(self, global_version_path: Path | None) -> dict[str, str]:
+        """Memoized load_global_deps."""
+        if not global_version_path:
+            return {}
+        if global_version_path not in self._global_deps:
+            self._global_deps[global_version_path] = load_global_deps(global_version_path)
+        return self._global_deps[global_version_path]
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from outback.dependencies.synthetic import SyntheticRepoSpec, generate_repo
+
+# Small enough to generate in well under a second, large enough to have multi-target
+# projects, project references, diamonds and drifted (changed) projects.
+SMALL_SPEC = SyntheticRepoSpec(
+    projects=12, packages=40, direct_per_project=4, drift_ratio=0.5, areas=3, seed=7
+)
+
+
+@pytest.fixture(scope="session")
+def synthetic_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Read-only synthetic monorepo shared by the whole session; copy it before modifying."""
+    root = tmp_path_factory.mktemp("synthetic")
+    generate_repo(root, SMALL_SPEC)
+    return root
+
+
+def _write_lock(path: Path, frameworks: dict[str, dict[str, str]]) -> None:
+    dependencies = {
+        framework: {
+            name: {"type": "Direct", "requested": f"[{version}, )", "resolved": version}
+            for name, version in packages.items()
+        }
+        for framework, packages in frameworks.items()
+    }
+    path.write_text(json.dumps({"version": 1, "dependencies": dependencies}, indent=2))
+
+
+@pytest.fixture
+def empty_framework_repo(tmp_path: Path) -> Path:
+    """A project whose lock files have an empty framework before the one that changed."""
+    project = tmp_path / "App"
+    project.mkdir()
+    (project / "App.csproj").write_text("<Project />")
+    before = {"net8.0": {"A": "1.0.0"}, "net472": {}, "net9.0": {"A": "1.0.0", "B": "1.0.0"}}
+    _write_lock(project / "packages.before.lock.json", before)
+    _write_lock(project / "packages.lock.json", {**before, "net9.0": {"A": "2.0.0", "B": "1.0.0"}})
+    return tmp_path
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from outback.dependencies.cache import SummaryCache
+from outback.dependencies.types import PackageStore
+from outback.dependencies.utils import _package_summary
+from outback.dependencies.workspace import Workspace
+
+
+def _lock(version: str) -> str:
+    return json.dumps(
+        {
+            "version": 1,
+            "dependencies": {
+                "net8.0": {"A": {"type": "Direct", "requested": "[1.0.0, )", "resolved": version}}
+            },
+        },
+        indent=2,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with SummaryCache(tmp_path / "cache") as cache:
+        yield cache
+
+
+def test_cached_summary_round_trips_until_the_file_changes(tmp_path, cache):
+    path = tmp_path / "packages.lock.json"
+    path.write_text(_lock("1.0.0"))
+    summary = _package_summary(path, include_transitive=True, cache=cache)
+    assert cache.stats.misses == 1 and cache.stats.writes == 1
+
+    store = PackageStore()
+    cached = _package_summary(path, include_transitive=True, cache=cache, store=store)
+    assert cache.stats.hits == 1
+    assert list(cached.usages) == list(summary.usages)
+    assert cached.usages.store is store
+    assert cache.get(path, include_transitive=False) is None
+
+    path.write_text(_lock("1.0.10"))
+    assert cache.get(path, include_transitive=True) is None
+    assert (
+        _package_summary(path, include_transitive=True, cache=cache).usages[0].resolved_version
+        == "1.0.10"
+    )
+
+
+def test_file_rewritten_while_parsed_is_not_cached_under_its_new_stat(tmp_path, cache):
+    path = tmp_path / "packages.lock.json"
+    path.write_text(_lock("1.0.0"))
+    st = os.stat(path)
+    summary = _package_summary(path, include_transitive=True)
+
+    # The file changes after it was read but before the summary is stored
+    path.write_text(_lock("2.0.10"))
+    cache.put(path, True, summary, st=st)
+    assert cache.get(path, include_transitive=True) is None
+
+
+def test_workspace_pool_reads_and_fills_the_cache(synthetic_repo, cache):
+    paths = sorted(synthetic_repo.rglob("packages.lock.json"))
+    first = list(
+        Workspace(synthetic_repo, cache=cache, workers=2).iter_summaries(
+            paths, include_transitive=True
+        )
+    )
+    assert cache.stats.writes == len(paths)
+    second = list(
+        Workspace(synthetic_repo, cache=cache, workers=2).iter_summaries(
+            paths, include_transitive=True
+        )
+    )
+    assert cache.stats.hits == len(paths)
+    assert [list(s.usages) for s in second] == [list(s.usages) for s in first]
+
+
+def test_eviction_trims_least_recently_used_entries(tmp_path, synthetic_repo):
+    paths = sorted(synthetic_repo.rglob("packages.lock.json"))[:4]
+    with SummaryCache(tmp_path / "cache", max_bytes=1) as cache:
+        for path in paths:
+            _package_summary(path, include_transitive=True, cache=cache)
+        cache.flush()
+        assert cache.stats.evictions == len(paths)
+        assert all(cache.get(path, include_transitive=True) is None for path in paths)
@@ -0,0 +1,117 @@
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from outback.dependencies.central import CentralPackageResolver
+
+
+def _write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_nested_props_import_update_remove_and_properties(tmp_path):
+    _write(
+        tmp_path / "Directory.Packages.props",
+        """<Project>
+  <PropertyGroup><JsonVersion>13.0.1</JsonVersion></PropertyGroup>
+  <Import Project="Versions.props" Condition="Exists('Versions.props')" />
+  <ItemGroup>
+    <PackageVersion Include="Newtonsoft.Json" Version="$(JsonVersion)" />
+    <PackageVersion Include="Serilog;Polly" Version="2.0.0" />
+    <PackageVersion Include="Ignored" Version="1.0.0" Condition="'$(Missing)' == 'yes'" />
+  </ItemGroup>
+</Project>""",
+    )
+    _write(
+        tmp_path / "Versions.props",
+        """<Project><ItemGroup>
+<PackageVersion Include="From.Import"><Version>4.5.6</Version></PackageVersion>
+</ItemGroup></Project>""",
+    )
+    _write(
+        tmp_path / "src" / "Directory.Packages.props",
+        """<Project xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <Import Project="$([MSBuild]::GetPathOfFileAbove(Directory.Packages.props, $(MSBuildThisFileDirectory)..))" />
+  <ItemGroup>
+    <PackageVersion Update="Serilog" Version="3.0.0" />
+    <PackageVersion Update="NotDefined" Version="9.9.9" />
+    <PackageVersion Remove="Polly" />
+  </ItemGroup>
+</Project>""",  # noqa: E501
+    )
+    _write(
+        tmp_path / "src" / "App" / "App.csproj",
+        """<Project Sdk="Microsoft.NET.Sdk"><ItemGroup>
+  <PackageReference Include="Newtonsoft.Json" VersionOverride="$(JsonVersion)-override" />
+  <PackageReference Include="Serilog" />
+</ItemGroup></Project>""",
+    )
+    _write(tmp_path / "Root" / "Root.csproj", "<Project />")
+
+    resolver = CentralPackageResolver()
+    assert (
+        resolver.find_props(tmp_path / "src" / "App")
+        == tmp_path / "src" / "Directory.Packages.props"
+    )
+    assert resolver.project_versions(tmp_path / "src" / "App") == {
+        "newtonsoft.json": "13.0.1-override",
+        "serilog": "3.0.0",
+        "from.import": "4.5.6",
+    }
+    assert resolver.project_versions(tmp_path / "Root") == {
+        "newtonsoft.json": "13.0.1",
+        "serilog": "2.0.0",
+        "polly": "2.0.0",
+        "from.import": "4.5.6",
+    }
+    assert resolver.files(tmp_path / "src" / "Directory.Packages.props") == [
+        tmp_path / "src" / "Directory.Packages.props",
+        tmp_path / "Directory.Packages.props",
+        tmp_path / "Versions.props",
+    ]
+
+
+def test_evaluation_is_refreshed_when_an_import_changes(tmp_path):
+    _write(
+        tmp_path / "Directory.Packages.props",
+        '<Project><Import Project="Versions.props" /></Project>',
+    )
+    versions = tmp_path / "Versions.props"
+    _write(
+        versions,
+        '<Project><ItemGroup><PackageVersion Include="A" Version="1.0.0" /></ItemGroup></Project>',
+    )
+
+    resolver = CentralPackageResolver()
+    assert resolver.versions(tmp_path / "Directory.Packages.props") == {"a": "1.0.0"}
+    time.sleep(0.01)
+    _write(
+        versions,
+        '<Project><ItemGroup><PackageVersion Include="A" Version="2.0.10" /></ItemGroup></Project>',
+    )
+    assert resolver.versions(tmp_path / "Directory.Packages.props") == {"a": "2.0.10"}
+
+
+def test_import_cycles_are_cut(tmp_path):
+    _write(
+        tmp_path / "Directory.Packages.props", '<Project><Import Project="Other.props" /></Project>'
+    )
+    _write(
+        tmp_path / "Other.props",
+        '<Project><Import Project="Directory.Packages.props" />'
+        '<ItemGroup><PackageVersion Include="B" Version="1.0.0" /></ItemGroup></Project>',
+    )
+    resolver = CentralPackageResolver()
+    assert resolver.versions(tmp_path / "Directory.Packages.props") == {"b": "1.0.0"}
+
+
+def test_malformed_props_file_is_reported(tmp_path):
+    _write(
+        tmp_path / "Directory.Packages.props",
+        '<Project><Import Project="Versions.props" /></Project>',
+    )
+    _write(tmp_path / "Versions.props", "<Project><ItemGroup></Project>")
+    with pytest.raises(ET.ParseError, match="Versions.props"):
+        CentralPackageResolver().versions(tmp_path / "Directory.Packages.props")
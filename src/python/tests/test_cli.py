@@ -0,0 +1,70 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import outback.dependencies
+from outback.dependencies.cli import main
+
+
+def test_import_does_not_load_commands_or_rich():
+    code = (
+        "import sys, outback.dependencies, outback.dependencies.cli\n"
+        "loaded = [m for m in ('rich', 'outback.dependencies.print', 'concurrent.futures.process')"
+        " if m in sys.modules]\n"
+        "assert not loaded, loaded"
+    )
+    root = Path(outback.dependencies.__file__).parents[2]
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_public_names_resolve_lazily():
+    assert set(outback.dependencies.__all__) <= set(dir(outback.dependencies))
+    for name in outback.dependencies.__all__:
+        assert getattr(outback.dependencies, name).__name__ == name
+    with pytest.raises(AttributeError):
+        outback.dependencies.not_a_name  # noqa: B018
+
+
+def test_generate_capture_diff_and_clean(tmp_path, capsys):
+    assert (
+        main(["generate", str(tmp_path), "--projects", "3", "--packages", "10", "--seed", "1"]) == 0
+    )
+    assert capsys.readouterr().out == f"generated 3 projects in {tmp_path}\n"
+    lock_files = sorted(tmp_path.rglob("packages.lock.json"))
+    before_files = sorted(tmp_path.rglob("packages.before.lock.json"))
+    assert len(lock_files) == 3
+
+    assert main(["clean", str(tmp_path)]) == 0
+    assert not list(tmp_path.rglob("packages.before.lock.json"))
+    assert capsys.readouterr().out.endswith(f"Total files removed: {len(before_files)}\n")
+
+    assert main(["capture", str(tmp_path)]) == 0
+    assert len(list(tmp_path.rglob("packages.before.lock.json"))) == 3
+    capsys.readouterr()
+
+    # Nothing changed since the capture
+    assert main(["diff", str(tmp_path), "--only-changes", "--format", "ndjson"]) == 0
+    assert capsys.readouterr().out == ""
+    assert main(["diff", str(tmp_path), "--format", "json"]) == 0
+    records = json.loads(capsys.readouterr().out)
+    assert records and {record["project"] for record in records} == {
+        str(p.parent) for p in lock_files
+    }
+
+
+def test_plain_output_and_profile(synthetic_repo, capsys):
+    assert main(["projects", str(synthetic_repo), "--plain", "--flat", "--profile", "json"]) == 0
+    captured = capsys.readouterr()
+    assert captured.out.startswith("Project Dependencies - ")
+    assert "\x1b[" not in captured.out
+    assert json.loads(captured.err)["counters"]["lock files read"] == 12
+
+
+def test_invalid_arguments_exit_with_usage_error(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["diff", "--format", "xml"])
+    assert exc_info.value.code == 2
+    assert "invalid choice" in capsys.readouterr().err
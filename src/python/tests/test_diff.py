@@ -0,0 +1,142 @@
+import asyncio
+import io
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from outback.dependencies import diff
+from outback.dependencies.diff import (
+    DiffKind,
+    DiffStats,
+    _unchanged_fast_path,
+    compute_package_diffs,
+    iter_project_pairs,
+    write_package_diffs,
+)
+from outback.dependencies.pipeline import analyze_projects
+from outback.dependencies.utils import _package_summary
+from outback.dependencies.workspace import Workspace
+
+GOLDEN = Path(__file__).parent / "data" / "synthetic_diff.ndjson"
+
+
+def _normalized_ndjson(root: Path, **kwargs) -> str:
+    """NDJSON diff of the repo with project paths made relative to it, so the output is portable."""
+    stream = io.StringIO()
+    write_package_diffs(compute_package_diffs(root, **kwargs), stream)
+    lines = []
+    for line in stream.getvalue().splitlines():
+        record = json.loads(line)
+        record["project"] = Path(record["project"]).relative_to(root).as_posix()
+        lines.append(json.dumps(record, separators=(",", ":")))
+    return "".join(f"{line}\n" for line in lines)
+
+
+def test_golden_ndjson_diff(synthetic_repo):
+    actual = _normalized_ndjson(
+        synthetic_repo,
+        only_changes=True,
+        global_version_path=synthetic_repo / "Directory.Packages.props",
+    )
+    assert actual == GOLDEN.read_text()
+
+
+@pytest.mark.parametrize("only_changes", [False, True])
+def test_changes_after_an_empty_framework_are_reported(empty_framework_repo, only_changes):
+    diffs = list(compute_package_diffs(empty_framework_repo, only_changes=only_changes))
+    upgrades = [(d.framework, d.name, d.kind) for d in diffs if d.changed]
+    assert upgrades == [("9.0", "A", DiffKind.UPGRADED)]
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_only_changes_fast_path_agrees_with_full_diff(synthetic_repo, workers):
+    stats = DiffStats()
+    fast = list(
+        compute_package_diffs(synthetic_repo, only_changes=True, workers=workers, stats=stats)
+    )
+    full = [
+        d
+        for d in compute_package_diffs(synthetic_repo, workers=workers)
+        if d.kind != DiffKind.UNCHANGED
+    ]
+    assert fast == full
+    assert stats.projects_compared == 12
+    assert stats.projects_skipped > 0
+
+
+def test_skip_unchanged_checks_projects_as_they_are_consumed(synthetic_repo, monkeypatch):
+    checked = []
+
+    def fast_path(before_path, *args):
+        checked.append(before_path.parent)
+        return _unchanged_fast_path(before_path, *args)
+
+    monkeypatch.setattr(diff, "_unchanged_fast_path", fast_path)
+    workspace = Workspace(synthetic_repo)
+    yielded = []
+    for project_path, _, _ in iter_project_pairs(workspace, skip_unchanged=True):
+        # Nothing past the project being yielded has been read yet
+        assert checked[-1] == project_path
+        yielded.append(project_path)
+    assert yielded and len(checked) == 12
+
+
+def test_package_filter_restricts_diffs(synthetic_repo):
+    diffs = list(compute_package_diffs(synthetic_repo))
+    name = next(d.name for d in diffs if d.changed)
+    filtered = list(compute_package_diffs(synthetic_repo, package_filter=name.upper()))
+    assert filtered == [d for d in diffs if d.name_lower == name.lower()]
+
+
+def test_analyze_projects_reports_changes_after_an_empty_framework(empty_framework_repo):
+    async def collect() -> list:
+        return [r async for r in analyze_projects(empty_framework_repo, only_changes=True)]
+
+    (result,) = asyncio.run(collect())
+    assert [(d.framework, d.name, d.kind) for d in result.diffs] == [
+        ("9.0", "A", DiffKind.UPGRADED)
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"only_changes": True}, {"central": True, "only_changes": True}]
+)
+def test_analyze_projects_matches_compute_package_diffs(synthetic_repo, kwargs):
+    async def collect() -> list:
+        return [r async for r in analyze_projects(synthetic_repo, max_pending=2, **kwargs)]
+
+    results = asyncio.run(collect())
+    diffs = [d for r in sorted(results, key=lambda r: r.project_path) for d in r.diffs]
+    assert diffs == list(compute_package_diffs(synthetic_repo, **kwargs))
+
+
+def test_analyze_projects_early_exit_cancels_stages(synthetic_repo):
+    async def first():
+        results = analyze_projects(synthetic_repo, max_pending=1)
+        result = await results.__anext__()
+        await results.aclose()
+        return result, len(asyncio.all_tasks())
+
+    result, tasks = asyncio.run(first())
+    assert result.project_path.exists()
+    assert tasks == 1
+
+
+def test_summary_pickles_compactly(synthetic_repo):
+    path = sorted(synthetic_repo.rglob("packages.lock.json"))[0]
+    summary = _package_summary(path, include_transitive=True)
+
+    restored = pickle.loads(pickle.dumps(summary))
+    usage = pickle.loads(pickle.dumps(summary.usages[0]))
+    assert restored.usages == summary.usages
+    assert restored.framework_lookup.keys() == summary.framework_lookup.keys()
+    assert usage == summary.usages[0]
+    assert len(pickle.dumps(summary)) < 1.2 * len(pickle.dumps(summary.usages))
+    assert "lookup" not in vars(restored)
+
+    workspace = Workspace(synthetic_repo, workers=2)
+    paths = [p / "packages.lock.json" for p in workspace.project_paths]
+    summaries = list(workspace.iter_summaries(paths, include_transitive=True))
+    assert all(s is not None and s.usages.store is workspace.store for s in summaries)
@@ -0,0 +1,112 @@
+import re
+
+import pytest
+
+from outback.dependencies.discovery import PathFilter, _GitIgnore, _translate_glob, walk_files
+from outback.dependencies.utils import capture_before_deps, find_project_paths, remove_before_deps
+
+
+def _matches(pattern: str, path: str) -> bool:
+    return re.search(_translate_glob(pattern), path) is not None
+
+
+@pytest.mark.parametrize(
+    "pattern, path, expected",
+    [
+        ("*.csproj", "src/App/App.csproj", True),
+        ("*.csproj", "src/App/App.csproj.user", False),
+        ("App/*", "src/App/App.csproj", True),
+        ("App/*", "src/App/sub/App.csproj", False),
+        ("src/**/App", "src/App", True),
+        ("src/**/App", "src/a/b/App", True),
+        ("src/**/App", "other/src/a/App", True),
+        ("/src/**/App", "other/src/a/App", False),
+        ("/src/**/App", "src/a/App", True),
+        ("**/Tests/**", "src/Tests", True),
+        ("**/Tests/**", "src/Tests/Unit/Unit.csproj", True),
+        ("**/Tests/**", "src/UnitTests/Unit.csproj", False),
+        ("Proj?", "src/Proj1", True),
+        ("Proj?", "src/Proj10", False),
+        ("Proj[0-2]", "src/Proj2", True),
+        ("Proj[!0-2]", "src/Proj2", False),
+        ("Proj[!0-2]", "src/Proj3", True),
+        ("a[b", "x/a[b", True),
+    ],
+)
+def test_translate_glob(pattern: str, path: str, expected: bool):
+    assert _matches(pattern, path) is expected
+
+
+def test_path_filter_includes_excludes_and_pruning():
+    path_filter = PathFilter.compile("**/Area0*/**;!**/Tests/**")
+    assert path_filter.matches("src/Area01/App")
+    assert not path_filter.matches("src/Area01/Tests/App")
+    assert not path_filter.matches("src/Area10/App")
+    assert path_filter.prunes("src/Area01/Tests")
+    assert not path_filter.prunes("src/Area01")
+    assert not PathFilter.compile(None)
+    assert PathFilter.compile(None).matches("anything")
+
+
+def _gitignore(tmp_path, text: str) -> _GitIgnore:
+    (tmp_path / ".gitignore").write_text(text)
+    gitignore = _GitIgnore.load(str(tmp_path))
+    assert gitignore is not None
+    return gitignore
+
+
+def test_gitignore_rules(tmp_path):
+    gitignore = _gitignore(tmp_path, "# comment\n\n*.log\nbuild/\n/rooted\ndocs/*.md\n!keep.log\n")
+    assert gitignore.ignored(str(tmp_path / "a" / "x.log"), False) is True
+    assert gitignore.ignored(str(tmp_path / "keep.log"), False) is False
+    assert gitignore.ignored(str(tmp_path / "a" / "build"), True) is True
+    # Directory-only rules do not apply to files
+    assert gitignore.ignored(str(tmp_path / "a" / "build"), False) is None
+    assert gitignore.ignored(str(tmp_path / "rooted"), True) is True
+    assert gitignore.ignored(str(tmp_path / "a" / "rooted"), True) is None
+    assert gitignore.ignored(str(tmp_path / "docs" / "x.md"), False) is True
+    assert gitignore.ignored(str(tmp_path / "a" / "docs" / "x.md"), False) is None
+
+
+def test_gitignore_without_rules_is_not_loaded(tmp_path):
+    (tmp_path / ".gitignore").write_text("# nothing\n\n")
+    assert _GitIgnore.load(str(tmp_path)) is None
+    assert _GitIgnore.load(str(tmp_path / "missing")) is None
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_walk_files_honors_ignore_dirs_and_gitignore(tmp_path, workers):
+    for rel in ["a/A.csproj", "a/obj/Noise.csproj", "b/ignored/B.csproj", "c/C.csproj"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+    (tmp_path / "b" / ".gitignore").write_text("ignored/\n")
+
+    found = walk_files(tmp_path, lambda name: name.endswith(".csproj"), workers=workers)
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in found) == ["a/A.csproj", "c/C.csproj"]
+
+    found = walk_files(
+        tmp_path, lambda name: name.endswith(".csproj"), use_gitignore=False, workers=workers
+    )
+    assert len(found) == 3
+
+
+def test_find_project_paths_skips_obj_noise(synthetic_repo):
+    project_paths = find_project_paths(synthetic_repo)
+    assert len(project_paths) == 12
+    assert all("obj" not in p.parts for p in project_paths)
+    assert find_project_paths(synthetic_repo, workers=4) == project_paths
+
+
+def test_capture_and_remove_ignore_gitignored_before_files(tmp_path, capsys):
+    for name in ("A", "B"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f"{name}.csproj").write_text("")
+        (tmp_path / name / "packages.lock.json").write_text("{}")
+    (tmp_path / ".gitignore").write_text("packages.before.lock.json\n")
+
+    capture_before_deps(tmp_path)
+    assert len(list(tmp_path.rglob("packages.before.lock.json"))) == 2
+
+    remove_before_deps(tmp_path)
+    assert not list(tmp_path.rglob("packages.before.lock.json"))
+    assert "Total files removed: 2" in capsys.readouterr().out
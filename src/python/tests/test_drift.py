@@ -0,0 +1,74 @@
+import io
+import json
+
+import pytest
+
+from outback.dependencies.drift import compute_version_drift, write_version_drift
+
+
+def _project(root, name: str, packages: dict[str, tuple[str, str]]) -> None:
+    project = root / name
+    project.mkdir()
+    (project / f"{name}.csproj").write_text("<Project />")
+    deps = {
+        package: {"type": dep_type, "requested": f"[{version}, )", "resolved": version}
+        for package, (dep_type, version) in packages.items()
+    }
+    lock = {"version": 1, "dependencies": {"net8.0": deps}}
+    (project / "packages.lock.json").write_text(json.dumps(lock, indent=2))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _project(
+        tmp_path,
+        "App",
+        {"A": ("Direct", "1.10.0"), "B": ("Direct", "1.0.0"), "Lib": ("Project", "")},
+    )
+    _project(tmp_path, "Lib", {"A": ("Transitive", "1.9.0"), "B": ("Direct", "1.0.0")})
+    _project(tmp_path, "Tool", {"A": ("Direct", "1.9.0")})
+    (tmp_path / "Directory.Packages.props").write_text(
+        '<Project><ItemGroup><PackageVersion Include="A" Version="1.9.0" />'
+        '<PackageVersion Include="B" Version="2.0.0" /></ItemGroup></Project>'
+    )
+    return tmp_path
+
+
+def test_drift_lists_conflicting_and_deviating_packages(repo):
+    drifts = compute_version_drift(repo, global_version_path=repo / "Directory.Packages.props")
+    assert [d.name for d in drifts] == ["A", "B"]
+    a, b = drifts
+    assert list(a.versions) == ["1.9.0", "1.10.0"]
+    assert a.projects("1.9.0") == [repo / "Lib", repo / "Tool"]
+    assert a.conflict and a.global_version == "1.9.0"
+    assert a.deviating == [(repo / "App", "8.0")]
+    # B is on one version, but not the central one
+    assert not b.conflict and len(b.deviating) == 2
+
+
+def test_drift_without_central_versions_or_transitive_dependencies(repo):
+    assert [d.name for d in compute_version_drift(repo)] == ["A"]
+    assert compute_version_drift(repo, include_transitive=False)[0].projects("1.9.0") == [
+        repo / "Tool"
+    ]
+    assert [d.name for d in compute_version_drift(repo, all_packages=True)] == ["A", "B"]
+
+
+def test_drift_as_json(repo):
+    stream = io.StringIO()
+    assert write_version_drift(compute_version_drift(repo, central=True), stream) == 2
+    records = json.loads(stream.getvalue())
+    assert records[0]["package"] == "A" and records[0]["conflict"] is True
+    assert records[0]["versions"]["1.10.0"] == [{"project": str(repo / "App"), "framework": "8.0"}]
+    assert records[1] == {
+        "package": "B",
+        "global": "2.0.0",
+        "conflict": False,
+        "versions": {
+            "1.0.0": [
+                {"project": str(repo / "App"), "framework": "8.0"},
+                {"project": str(repo / "Lib"), "framework": "8.0"},
+            ]
+        },
+        "deviating": 2,
+    }
@@ -0,0 +1,53 @@
+import shutil
+import subprocess
+
+import pytest
+
+from outback.dependencies.git import read_git_blobs
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(cwd, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "packages.lock.json").write_bytes(b'{\n  "version": 1\n}\n')
+    # Content with a header-like first line, no trailing newline and binary bytes
+    (tmp_path / "with space.json").write_bytes(b"blob 12\nmissing\n\x00\xff")
+    (tmp_path / "empty.json").write_bytes(b"")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    (tmp_path / "a" / "packages.lock.json").write_bytes(b"changed")
+    return tmp_path
+
+
+def test_read_git_blobs_returns_content_at_revision(repo):
+    paths = [repo / "a" / "packages.lock.json", repo / "with space.json", repo / "empty.json"]
+    blobs = read_git_blobs(repo, "HEAD", paths)
+    assert blobs == {
+        paths[0]: b'{\n  "version": 1\n}\n',
+        paths[1]: b"blob 12\nmissing\n\x00\xff",
+        paths[2]: b"",
+    }
+
+
+def test_read_git_blobs_missing_and_non_blob_paths(repo):
+    missing, tree, present = repo / "nope.json", repo / "a", repo / "empty.json"
+    blobs = read_git_blobs(repo / "a", "HEAD", [missing, tree, present])
+    assert blobs == {missing: None, tree: None, present: b""}
+    assert read_git_blobs(repo, "HEAD", []) == {}
+
+
+def test_read_git_blobs_bad_revision(repo):
+    with pytest.raises(RuntimeError):
+        read_git_blobs(repo, "no-such-rev", [repo / "empty.json"])
@@ -0,0 +1,51 @@
+import pytest
+
+from outback.dependencies.cli import main
+from outback.dependencies.graph import SolutionGraph
+from outback.dependencies.print import print_dependents, print_why
+from outback.dependencies.types import DependencyType
+
+
+@pytest.fixture(scope="module")
+def graph(synthetic_repo):
+    return SolutionGraph.build(synthetic_repo)
+
+
+def test_why_chains_run_from_a_top_level_reference_to_the_package(graph):
+    package = graph.packages()[0]
+    paths = graph.why(package)
+    assert {p.project_path for p in paths} == set(graph.projects_using(package))
+    for path in paths:
+        assert path.usage.name_lower == package
+        assert (
+            path.chain[0].type in (DependencyType.DIRECT, DependencyType.PROJECT)
+            or len(path.chain) == 1
+        )
+        assert path.resolved_version in graph.versions(package)
+
+
+def test_dependents_follow_project_references(graph):
+    name = "Contoso.Area00.Project00000"
+    direct = [p.name for p in graph.dependents(name, transitive=False)]
+    assert direct == ["Contoso.Area00.Project00006", "Contoso.Area02.Project00002"]
+    assert [p.name for p in graph.dependents(name)] == [*direct, "Contoso.Area02.Project00011"]
+    assert graph.project(name.lower()) == graph.project(graph.project(name))
+    assert graph.references("Contoso.Area02.Project00011") == [
+        graph.project("Contoso.Area02.Project00002")
+    ]
+
+
+def test_unknown_project_is_reported(graph, synthetic_repo, capsys):
+    with pytest.raises(KeyError):
+        graph.project("NoSuchProject")
+    print_why(synthetic_repo, graph.packages()[0], project="NoSuchProject", graph=graph)
+    print_dependents(synthetic_repo, "NoSuchProject", graph=graph)
+    assert capsys.readouterr().out.splitlines() == ["project not found: NoSuchProject"] * 2
+
+
+def test_dependents_command(synthetic_repo, capsys):
+    assert main(["dependents", "Contoso.Area02.Project00002", str(synthetic_repo)]) == 0
+    out = "".join(capsys.readouterr().out.split())  # rich wraps long paths
+    assert out.startswith("Dependentsof") and "Contoso.Area02.Project00011" in out
+    assert main(["dependents", "Contoso.Area02.Project00011", str(synthetic_repo), "--direct"]) == 0
+    assert "No project references" in capsys.readouterr().out
@@ -0,0 +1,53 @@
+import io
+import json
+import threading
+import time
+
+from outback.dependencies import instrumentation
+from outback.dependencies.instrumentation import count, phase, print_profile, profiling
+from outback.dependencies.utils import _package_summary
+
+
+def test_phases_are_exclusive_and_counters_add_up():
+    with profiling() as profiler:
+        with phase("outer"):
+            time.sleep(0.02)
+            with phase("inner"):
+                time.sleep(0.05)
+        count("things", 2)
+        count("things")
+    assert profiler.calls == {"outer": 1, "inner": 1}
+    assert profiler.wall["inner"] >= 0.05
+    assert 0.02 <= profiler.wall["outer"] < profiler.wall["inner"]
+    assert profiler.counters == {"things": 3}
+    assert profiler.total_wall >= profiler.wall["outer"] + profiler.wall["inner"]
+
+
+def test_worker_threads_are_recorded_and_profiling_off_is_a_no_op():
+    with profiling() as profiler:
+        workers = [threading.Thread(target=count, args=("hits",)) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    assert profiler.counters == {"hits": 8}
+
+    with profiling(False) as disabled:
+        assert disabled is None
+        assert phase("ignored") is instrumentation._DISABLED
+        count("ignored")
+    assert instrumentation._active is None
+
+
+def test_profile_of_a_parse_prints_as_json_and_table(synthetic_repo):
+    with profiling() as profiler:
+        _package_summary(next(synthetic_repo.rglob("packages.lock.json")), include_transitive=True)
+    stream = io.StringIO()
+    print_profile(profiler, "json", stream)
+    data = json.loads(stream.getvalue())
+    assert {"read", "decode", "build"} <= data["phases"].keys()
+    assert data["counters"]["lock files read"] == 1
+
+    stream = io.StringIO()
+    print_profile(profiler, stream=stream)
+    assert "Profile (" in stream.getvalue() and "lock files read" in stream.getvalue()
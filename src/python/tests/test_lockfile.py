@@ -0,0 +1,150 @@
+import io
+import json
+
+import pytest
+
+from outback.dependencies import utils
+from outback.dependencies.lockfile import _JsonStream, iter_lock_entries
+from outback.dependencies.utils import _framework_sections, _package_summary
+
+LOCK = {
+    "version": 1,
+    "dependencies": {
+        "net8.0": {
+            "Newtonsoft.Json": {
+                "type": "Direct",
+                "requested": "[13.0.1, )",
+                "resolved": "13.0.1",
+                "contentHash": "ppPFpBcvxdsfUonNcvITKqLl3bqxWbDCZIzDWHzjpdAHRFfZe0Dw9HmA0+z"
+                "a13Idyrg==",
+            },
+            "Ünïcode.Pkg": {
+                "type": "Transitive",
+                "resolved": "1.0.0",
+                "dependencies": {"Newtonsoft.Json": "13.0.1"},
+            },
+            'Escaped"Name': {"type": "Transitive", "resolved": "0.1.0-beta.12345678901234567890"},
+        },
+        "net6.0": {},
+        ".NETFramework,Version=v4.7.2": {
+            "App.Core": {"type": "Project", "dependencies": {"Newtonsoft.Json": "[13.0.1, )"}},
+        },
+    },
+    "trailing": [1, 2.5e10, True, None, {"nested": {}}],
+}
+
+
+def _entries(text: str, chunk_size: int) -> list:
+    stream = _JsonStream(io.BytesIO(text.encode("utf-8-sig")), chunk_size=chunk_size)
+    out = []
+    for key in stream.members():
+        if key != "dependencies":
+            out.append((key, stream.value()))
+            continue
+        for framework in stream.members():
+            for name in stream.members():
+                out.append((framework, name, stream.value()))
+    return out
+
+
+def _expected(data: dict) -> list:
+    out = []
+    for key, value in data.items():
+        if key != "dependencies":
+            out.append((key, value))
+            continue
+        for framework, deps in value.items():
+            out.extend((framework, name, entry) for name, entry in deps.items())
+    return out
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_json_stream_matches_json_loads_at_every_chunk_edge(indent, chunk_size):
+    text = json.dumps(LOCK, indent=indent, ensure_ascii=False)
+    assert _entries(text, chunk_size) == _expected(LOCK)
+
+
+def test_json_stream_number_split_across_chunks():
+    # A number ending exactly at a chunk boundary must not be cut short
+    stream = _JsonStream(io.BytesIO(b'{"a": 12345678, "b": 1}'), chunk_size=14)
+    assert [(key, stream.value()) for key in stream.members()] == [("a", 12345678), ("b", 1)]
+
+
+def test_json_stream_skip_and_errors():
+    stream = _JsonStream(io.BytesIO(b'{"skip": {"x": [1, {"y": 2}]}, "keep": 3}'), chunk_size=4)
+    keys = []
+    for key in stream.members():
+        keys.append(key)
+        if key == "skip":
+            stream.skip()
+        else:
+            assert stream.value() == 3
+    assert keys == ["skip", "keep"]
+
+    with pytest.raises(json.JSONDecodeError):
+        list(_JsonStream(io.BytesIO(b'{"a": 1'), chunk_size=2).members())
+    with pytest.raises(json.JSONDecodeError):
+        list(_JsonStream(io.BytesIO(b"[1]")).members())
+
+
+@pytest.mark.parametrize("stream_threshold", [0, 1 << 30])
+def test_iter_lock_entries_filters_frameworks_and_entries(tmp_path, stream_threshold):
+    path = tmp_path / "packages.lock.json"
+    path.write_text(json.dumps(LOCK, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    everything = list(iter_lock_entries(path, stream_threshold=stream_threshold))
+    assert [(f, n) for f, n, _ in everything] == [(f, n) for f, n, _ in _expected(LOCK)[1:-1]]
+
+    direct = list(
+        iter_lock_entries(
+            path,
+            frameworks=("net8.0",),
+            keep=lambda name, entry: entry["type"] != "Transitive",
+            stream_threshold=stream_threshold,
+        )
+    )
+    assert [(f, n) for f, n, _ in direct] == [("net8.0", "Newtonsoft.Json")]
+
+
+@pytest.mark.parametrize("include_transitive", [False, True])
+def test_streamed_summary_equals_json_loads_summary(
+    synthetic_repo, monkeypatch, include_transitive
+):
+    for path in sorted(synthetic_repo.rglob("packages.lock.json")):
+        decoded = _package_summary(path, include_transitive=include_transitive)
+        monkeypatch.setattr(utils, "STREAM_THRESHOLD", 0)
+        streamed = _package_summary(path, include_transitive=include_transitive)
+        monkeypatch.undo()
+        assert list(streamed.usages) == list(decoded.usages)
+
+
+def test_framework_sections_split_nuget_layout(synthetic_repo):
+    for path in sorted(synthetic_repo.rglob("packages.lock.json")):
+        data = path.read_bytes()
+        sections = _framework_sections(data)
+        assert sections is not None
+        assert {k: json.loads(v) for k, v in sections.items()} == json.loads(data)["dependencies"]
+
+
+def test_framework_sections_reject_other_layouts():
+    assert _framework_sections(json.dumps(LOCK).encode()) is None
+    assert _framework_sections(b'{\n  "version": 1\n}') is None
+    escaped = json.dumps({"version": 1, "dependencies": {'a"b': {"X": {}}}}, indent=2).encode()
+    assert list(_framework_sections(escaped)) == ['a"b']
+
+
+def test_framework_sections_accept_empty_frameworks():
+    data = json.dumps(
+        {
+            "version": 1,
+            "dependencies": {"net8.0": {"A": {}}, "net472": {}, "net9.0": {"B": {}}, "net6.0": {}},
+        },
+        indent=2,
+    ).encode()
+    assert b'"net472": {},' in data
+    sections = _framework_sections(data)
+    assert sections is not None
+    assert {k: json.loads(v) for k, v in sections.items()} == json.loads(data)["dependencies"]
+    # A split that stops before the closing brace of "dependencies" is rejected, not truncated
+    assert _framework_sections(data.replace(b'"net472": {},', b'"net472": [],')) is None
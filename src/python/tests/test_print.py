@@ -0,0 +1,85 @@
+import io
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from outback.dependencies.print import print_package_diffs, print_projects
+from outback.dependencies.render import PlainRenderer
+
+# Direct A and B both depend on C; C's only dependency is transitive
+LOCK = {
+    "version": 1,
+    "dependencies": {
+        "net8.0": {
+            "A": {
+                "type": "Direct",
+                "requested": "[1.0.0, )",
+                "resolved": "1.0.0",
+                "dependencies": {"C": "1.0.0"},
+            },
+            "B": {
+                "type": "Direct",
+                "requested": "[1.0.0, )",
+                "resolved": "1.0.0",
+                "dependencies": {"C": "1.0.0"},
+            },
+            "C": {
+                "type": "CentralTransitive",
+                "requested": "[1.0.0, )",
+                "resolved": "1.0.0",
+                "dependencies": {"T": "2.0.0"},
+            },
+            "T": {"type": "Transitive", "resolved": "2.0.0"},
+        }
+    },
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "App").mkdir()
+    (tmp_path / "App" / "App.csproj").write_text("<Project />")
+    (tmp_path / "App" / "packages.lock.json").write_text(json.dumps(LOCK, indent=2))
+    return tmp_path
+
+
+def _render(base_dir, **kwargs) -> list[str]:
+    out = io.StringIO()
+    print_projects(base_dir, renderer=PlainRenderer(out), **kwargs)
+    return [line.strip() for line in out.getvalue().splitlines()]
+
+
+def test_see_above_only_refers_to_a_shown_subtree(project):
+    lines = _render(project)
+    assert not any("(see above)" in line for line in lines)
+    assert sum(line.startswith("[C] C ") for line in lines) == 2
+
+    lines = _render(project, include_transitive=True)
+    assert sum("(see above)" in line for line in lines) == 1
+
+    # A first expansion cut by max_depth is not referred to either
+    lines = _render(project, include_transitive=True, max_depth=1)
+    assert not any("(see above)" in line for line in lines)
+
+
+def test_flat_filtered_list_hides_transitive_matches(project):
+    assert not any(
+        line.startswith("[T]") for line in _render(project, nested=False, package_filter="t")
+    )
+    lines = _render(project, nested=False, package_filter="t", include_transitive=True)
+    assert [line for line in lines if line.startswith("[T]")] == ["[T] T 2.0.0"]
+    lines = _render(project, nested=False, package_filter="c")
+    assert [line for line in lines if line.startswith("[")] == ["[C] C 1.0.0"]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_missing_file_at_before_rev_is_named_by_its_git_path(project):
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run([*git, "init", "-q"], cwd=project, check=True)
+    subprocess.run([*git, "commit", "-q", "--allow-empty", "-m", "base"], cwd=project, check=True)
+
+    out = io.StringIO()
+    print_package_diffs(project / "App", before_rev="HEAD", renderer=PlainRenderer(out))
+    assert out.getvalue() == "before packages not found: HEAD:App/packages.lock.json\n"
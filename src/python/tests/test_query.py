@@ -0,0 +1,11 @@
+from outback.dependencies.query import PackageFilter, filtered_package_summary
+
+
+def test_filtered_summary_keeps_matches_after_an_empty_framework(empty_framework_repo):
+    package_filter = PackageFilter.compile("a")
+    summary = filtered_package_summary(
+        empty_framework_repo / "App" / "packages.lock.json", package_filter
+    )
+    assert summary is not None
+    usages = [(u.framework_version, u.name, u.resolved_version) for u in summary.usages]
+    assert usages == [("8.0", "A", "1.0.0"), ("9.0", "A", "2.0.0")]
@@ -0,0 +1,88 @@
+import io
+import json
+
+import pytest
+
+from outback.dependencies.print import print_package_diffs, print_projects
+from outback.dependencies.render import Budget, PlainRenderer, RichRenderer
+
+
+def _lock(frameworks: dict[str, dict[str, str]]) -> str:
+    dependencies = {
+        framework: {
+            name: {"type": "Direct", "requested": f"[{version}, )", "resolved": version}
+            for name, version in packages.items()
+        }
+        for framework, packages in frameworks.items()
+    }
+    return json.dumps({"version": 1, "dependencies": dependencies}, indent=2)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Two frameworks of three packages each, all of which changed."""
+    project = tmp_path / "App"
+    project.mkdir()
+    (project / "App.csproj").write_text("<Project />")
+    before = {framework: dict.fromkeys("ABC", "1.0.0") for framework in ("net8.0", "net9.0")}
+    after = {framework: dict.fromkeys("ABC", "2.0.0") for framework in ("net8.0", "net9.0")}
+    (project / "packages.before.lock.json").write_text(_lock(before))
+    (project / "packages.lock.json").write_text(_lock(after))
+    return tmp_path
+
+
+def _lines(print_function, base_dir, **kwargs) -> list[str]:
+    out = io.StringIO()
+    print_function(base_dir, renderer=PlainRenderer(out), **kwargs)
+    return [" ".join(line.split()) for line in out.getvalue().splitlines()]
+
+
+def test_budget():
+    budget = Budget(2)
+    assert budget.remaining == 2
+    assert budget.take() and budget.take()
+    assert not budget.take()
+    assert budget.used == 2 and budget.remaining == 0
+
+    unlimited = Budget()
+    assert all(unlimited.take() for _ in range(100))
+    assert unlimited.remaining is None
+
+
+def test_max_nodes_truncates_each_framework(project):
+    lines = _lines(print_projects, project, max_nodes=2)
+    assert [line for line in lines if line.startswith("[D]")] == ["[D] A 2.0.0", "[D] B 2.0.0"] * 2
+    assert lines.count("… truncated after 2 nodes") == 2
+
+
+def test_max_project_nodes_spans_frameworks(project):
+    for nested in (True, False):
+        lines = _lines(print_projects, project, nested=nested, max_project_nodes=4)
+        packages = [line for line in lines if line.startswith("[D]")]
+        assert packages == ["[D] A 2.0.0", "[D] B 2.0.0", "[D] C 2.0.0", "[D] A 2.0.0"]
+        assert lines[-1] == "… project truncated after 4 nodes"
+
+
+def test_max_rows_counts_hidden_rows(project):
+    lines = _lines(print_package_diffs, project, max_rows=4)
+    rows = [line for line in lines if "->" in line and not line.startswith("packages")]
+    assert len(rows) == 4
+    assert lines.count("… 2 more not shown") == 1
+    # The first framework is complete, so its table has no marker
+    assert lines.index("… 2 more not shown") > lines.index("Dependency diff (9.0)")
+
+    lines = _lines(print_package_diffs, project, max_rows=0)
+    assert lines.count("… 3 more not shown") == 2
+
+
+def test_rich_diff_tables_are_printed_in_chunks(project, capsys):
+    print_package_diffs(project, renderer=RichRenderer(chunk_rows=2))
+    output = capsys.readouterr().out
+    # Three rows per framework: a full chunk, then one continued table
+    assert output.count("(continued)") == 2
+    assert output.count("Package   (3)") == 4
+
+    print_package_diffs(project, renderer=RichRenderer(chunk_rows=2), max_rows=1)
+    output = capsys.readouterr().out
+    assert "(continued)" not in output
+    assert output.count("more not shown") == 2
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+from outback.dependencies.types import DependencyType, PackageStore, PackageSummary, PackageUsage
+
+ROW = (
+    "Newtonsoft.Json",
+    DependencyType.DIRECT,
+    "net8.0",
+    "[13.0.1, )",
+    "13.0.1",
+    {"A": "1.0.0"},
+    "newtonsoft.json",
+)
+
+
+def _usage(**changes) -> PackageUsage:
+    fields = {
+        "name": "Newtonsoft.Json",
+        "name_lower": "newtonsoft.json",
+        "type": DependencyType.DIRECT,
+        "framework_version": "net8.0",
+        "requested_version": "[13.0.1, )",
+        "resolved_version": "13.0.1",
+        "dependencies": {"A": "1.0.0"},
+    }
+    return PackageUsage(**{**fields, **changes})
+
+
+def test_usages_compare_and_hash_by_value_across_stores():
+    store = PackageStore()
+    stored = store.usage(store.add(*ROW))
+    same_store = store.usage(store.add(*ROW))
+    standalone = _usage()
+
+    assert stored == same_store == standalone
+    assert len({stored, same_store, standalone}) == 1
+    assert standalone != _usage(resolved_version="13.0.2")
+    assert standalone != _usage(dependencies=None)
+    assert standalone != _usage(type=DependencyType.TRANSITIVE)
+    assert store.usage(store.add(*ROW[:-2], None, ROW[-1])) != stored
+
+
+def test_standalone_usages_do_not_share_a_store():
+    first, second = _usage(), _usage(name="Serilog", name_lower="serilog")
+    assert first._store is not second._store
+    assert len(first._store) == len(second._store) == 1
+
+    store = PackageStore()
+    adopted = store.adopt([first, second])
+    assert list(adopted) == [first, second]
+    assert len(store) == 2 and len(first._store) == 1
+
+
+def test_summary_indexes_are_built_on_first_use():
+    usages = [
+        _usage(),
+        _usage(name="A", name_lower="a", type=DependencyType.TRANSITIVE, dependencies=None),
+        _usage(framework_version="net6.0"),
+    ]
+    summary = PackageSummary(Path("App"), Path("App/packages.lock.json"), usages)
+    assert (
+        not {"lookup", "by_framework", "framework_lookup", "by_type", "dependents"}
+        & vars(summary).keys()
+    )
+
+    assert summary.by_framework == {"net8.0": usages[:2], "net6.0": usages[2:]}
+    assert summary.lookup["newtonsoft.json"] == [usages[0], usages[2]]
+    assert summary.by_type[DependencyType.TRANSITIVE] == [usages[1]]
+    assert summary.dependents == {("net8.0", "a"): [usages[0]], ("net6.0", "a"): [usages[2]]}
+    assert (
+        summary.resolve("net6.0", "newtonsoft.json")
+        is summary.framework_lookup["net6.0"]["newtonsoft.json"]
+    )
+    assert summary.resolve("net472", "a") == usages[1]
+    assert summary.lookup is summary.lookup
@@ -0,0 +1,85 @@
+import pytest
+
+from outback.dependencies.versions import (
+    VersionChange,
+    classify_change,
+    parse_range,
+    parse_version,
+    version_key,
+)
+
+
+def test_version_ordering_follows_nuget():
+    ordered = [
+        "not-a-version",
+        "1.0.0-alpha",
+        "1.0.0-alpha.1",
+        "1.0.0-alpha.beta",
+        "1.0.0-beta.2",
+        "1.0.0-beta.11",
+        "1.0.0-rc.1",
+        "1.0.0",
+        "1.0.0.1",
+        "1.0.1",
+        "1.2",
+        "1.10.0",
+        "2.0.0",
+    ]
+    descending = ordered[::-1]
+    assert sorted(descending, key=version_key) == ordered
+
+
+def test_version_parts_and_metadata():
+    version = parse_version("2.1-Preview.3+build.7")
+    assert (version.major, version.minor, version.patch, version.revision) == (2, 1, 0, 0)
+    assert version.prerelease == ("Preview", "3")
+    assert version.metadata == "build.7"
+    assert version.is_prerelease and version.valid
+    # Build metadata and missing parts do not affect ordering; labels compare case-insensitively
+    assert version_key("1.0.0+abc") == version_key("1.0")
+    assert version_key("1.0.0-RC") == version_key("1.0.0-rc")
+    assert not parse_version("x.y").valid
+    assert parse_version("1.2.3") is parse_version("1.2.3")
+
+
+@pytest.mark.parametrize(
+    "text, inside, outside",
+    [
+        ("1.2.3", ["1.2.3", "9.0.0"], ["1.2.2", "1.2.3-rc"]),
+        ("[1.2.3, )", ["1.2.3", "2.0.0"], ["1.2.2"]),
+        ("(1.2.3, )", ["1.2.4"], ["1.2.3"]),
+        ("(, 2.0)", ["1.9.9", "2.0.0-rc"], ["2.0.0"]),
+        ("[1.0, 2.0]", ["1.0.0", "2.0.0"], ["2.0.1", "0.9"]),
+        ("[1.0]", ["1.0.0"], ["1.0.1"]),
+    ],
+)
+def test_range_membership(text: str, inside: list[str], outside: list[str]):
+    version_range = parse_range(text)
+    assert version_range.valid
+    assert all(v in version_range for v in inside)
+    assert not any(v in version_range for v in outside)
+
+
+@pytest.mark.parametrize("text", ["", "(1.0)", "[1.0", "[x, y]"])
+def test_invalid_ranges_allow_anything(text: str):
+    version_range = parse_range(text)
+    assert not version_range.valid
+    assert "0.0.1" in version_range
+
+
+@pytest.mark.parametrize(
+    "before, after, expected",
+    [
+        ("1.2.3", "1.2.3", VersionChange.NONE),
+        ("1.2.3", "1.2.3+meta", VersionChange.NONE),
+        ("1.2.3", "2.0.0", VersionChange.MAJOR),
+        ("2.0.0", "1.2.3", VersionChange.MAJOR),
+        ("1.2.3", "1.3.0", VersionChange.MINOR),
+        ("1.2.3", "1.2.4", VersionChange.PATCH),
+        ("1.2.3.4", "1.2.3.5", VersionChange.REVISION),
+        ("1.2.3-rc.1", "1.2.3", VersionChange.PRERELEASE),
+        ("1.2.3", "garbage", VersionChange.MAJOR),
+    ],
+)
+def test_classify_change(before: str, after: str, expected: VersionChange):
+    assert classify_change(before, after) is expected
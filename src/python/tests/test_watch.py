@@ -0,0 +1,57 @@
+import io
+import json
+import threading
+import time
+
+from outback.dependencies.render import PlainRenderer
+from outback.dependencies.watch import (
+    PollingWatcher,
+    create_watcher,
+    wait_for_changes,
+    watch_package_diffs,
+)
+
+
+def test_polling_watcher_reports_writes_creations_and_deletions(tmp_path):
+    existing, created = tmp_path / "a.json", tmp_path / "b.json"
+    existing.write_text("1")
+    watcher = PollingWatcher([existing, created], interval=0.01)
+    assert watcher.wait(timeout=0.05) == set()
+
+    existing.write_text("22")
+    created.write_text("")
+    assert wait_for_changes(watcher, debounce=0.05) == {existing, created}
+    existing.unlink()
+    assert watcher.wait(timeout=1) == {existing}
+    assert isinstance(create_watcher([existing], use_inotify=False), PollingWatcher)
+
+
+def test_watch_re_diffs_a_project_when_its_lock_file_changes(empty_framework_repo):
+    out = io.StringIO()
+    watch = threading.Thread(
+        target=watch_package_diffs,
+        args=(empty_framework_repo,),
+        kwargs={
+            "only_changes": True,
+            "renderer": PlainRenderer(out),
+            "use_inotify": False,
+            "poll_interval": 0.01,
+            "debounce": 0.05,
+            "max_updates": 1,
+        },
+    )
+    watch.start()
+    deadline = time.monotonic() + 10
+    while "watching 2 lock files" not in out.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    initial = out.getvalue()
+    assert "2.0.0" in initial and "PollingWatcher" in initial
+
+    entry = {"type": "Direct", "requested": "[3.0.10, )", "resolved": "3.0.10"}
+    lock = {"version": 1, "dependencies": {"net9.0": {"A": entry}}}
+    (empty_framework_repo / "App" / "packages.lock.json").write_text(json.dumps(lock, indent=2))
+    watch.join(timeout=10)
+    assert not watch.is_alive()
+    update = out.getvalue()[len(initial) :]
+    assert "1 file(s) changed, re-diffing 1 project(s)" in update
+    assert "3.0.10" in update and "removed" in update
@@ -0,0 +1,63 @@
+import shutil
+
+from outback.dependencies.query import PackageFilter, filtered_package_summary
+from outback.dependencies.types import DependencyType
+from outback.dependencies.utils import _package_summary
+from outback.dependencies.workspace import Workspace
+
+
+def test_discovery_and_summaries_are_memoized(synthetic_repo):
+    workspace = Workspace(synthetic_repo)
+    assert workspace.project_paths is workspace.project_paths
+    path = workspace.project_paths[0] / "packages.lock.json"
+
+    full = workspace.summary(path, include_transitive=True)
+    assert workspace.summary(path, include_transitive=True) is full
+    direct = workspace.summary(path)
+    assert list(direct.usages) == list(_package_summary(path, include_transitive=False).usages)
+    assert all(u.type != DependencyType.TRANSITIVE for u in direct.usages)
+    assert direct.usages.store is full.usages.store is workspace.store
+
+
+def test_iter_summaries_is_ordered_with_and_without_a_pool(synthetic_repo):
+    paths = [p / "packages.lock.json" for p in Workspace(synthetic_repo).project_paths]
+    paths.insert(3, synthetic_repo / "missing" / "packages.lock.json")
+    serial = list(Workspace(synthetic_repo).iter_summaries(paths, include_transitive=True))
+    pooled = list(
+        Workspace(synthetic_repo, workers=2).iter_summaries(iter(paths), include_transitive=True)
+    )
+    assert serial[3] is None and pooled[3] is None
+    assert [s and s.packages_file_path for s in pooled] == [
+        s and s.packages_file_path for s in serial
+    ]
+    assert [s and list(s.usages) for s in pooled] == [s and list(s.usages) for s in serial]
+
+
+def test_filtered_summary_matches_a_direct_filtered_parse(synthetic_repo):
+    workspace = Workspace(synthetic_repo)
+    path = workspace.project_paths[0] / "packages.lock.json"
+    name = workspace.summary(path, include_transitive=True).usages[-1].name
+    package_filter = PackageFilter.compile(name)
+    expected = filtered_package_summary(path, package_filter)
+    assert list(Workspace(synthetic_repo).filtered_summary(path, package_filter).usages) == list(
+        expected.usages
+    )
+    # Restricted from the memoized full summary
+    assert list(workspace.filtered_summary(path, package_filter).usages) == list(expected.usages)
+
+
+def test_invalidate_forgets_a_changed_file(synthetic_repo, tmp_path):
+    repo = tmp_path / "repo"
+    shutil.copytree(synthetic_repo, repo)
+    workspace = Workspace(repo)
+    path = workspace.project_paths[0] / "packages.lock.json"
+    props = repo / "Directory.Packages.props"
+    before = workspace.summary(path)
+    versions = workspace.global_deps(props)
+    assert workspace.global_deps(props) is versions
+
+    workspace.invalidate(path)
+    workspace.invalidate(props)
+    assert workspace.summary(path) is not before
+    assert workspace.global_deps(props) is not versions
+    assert workspace.global_deps(props) == versions